@@ -1,10 +1,234 @@
+import calendar
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
 from django.contrib import admin
-from .models import Appointment
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Min
+from django.http import JsonResponse
+from django.urls import path
+from django.utils import timezone
+from django.utils.functional import cached_property
+from users.models import User
+from .models import Appointment, AppointmentOccurrenceException, normalize_text
+from .phones import normalize_phone
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that uses the planner's row estimate for unfiltered tables.
+
+    ``COUNT(*)`` over millions of rows is a full scan on most databases.
+    When nothing filters the queryset and the estimate is large, the exact
+    figure is not worth that, so the PostgreSQL statistics are used instead.
+    """
+
+    estimate_threshold = 100_000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is not None and not query.where:
+            estimate = self.estimated_count(self.object_list)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+        return super().count
+
+    @staticmethod
+    def estimated_count(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row and row[0] > 0 else None
+
+
+class UserAutocompleteFilter(admin.SimpleListFilter):
+    """Filter by user without listing every user as a choice.
+
+    The filter is a search box backed by the admin's user autocomplete
+    endpoint; only the selected user is ever loaded.
+    """
+
+    title = "created by"
+    parameter_name = "created_by"
+    template = "admin/p_totschool_appointment_tracker/user_autocomplete_filter.html"
+
+    def lookups(self, request, model_admin):
+        value = self.value()
+        if value and value.isdigit():
+            user = User.objects.filter(pk=value).only("pk", "name").first()
+            if user is not None:
+                return [(str(user.pk), user.name)]
+        return []
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        self.query_parts = [
+            (key, value)
+            for key, values in changelist.get_filters_params().items()
+            if key != self.parameter_name
+            for value in (values if isinstance(values, list) else [values])
+        ]
+        yield {
+            "selected": self.value() is None,
+            "query_string": changelist.get_query_string(remove=[self.parameter_name]),
+            "display": "All",
+        }
+        for lookup, title in self.lookup_choices:
+            yield {
+                "selected": self.value() == lookup,
+                "query_string": changelist.get_query_string(
+                    {self.parameter_name: lookup}
+                ),
+                "display": title,
+            }
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value and value.isdigit():
+            return queryset.filter(created_by_id=value)
+        return queryset
+
+
+def _local_date(value):
+    return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+
+
+class DateDrillDownFilter(admin.SimpleListFilter):
+    """Year, month and day drill-down over ``datetime``.
+
+    Replaces ``date_hierarchy``, whose ``DISTINCT`` date queries scan the
+    whole table: the choices are derived from the first and last datetime,
+    two lookups at the ends of the datetime index. Selections become plain
+    range filters on that index.
+    """
+
+    title = "date"
+    parameter_name = "period"
+
+    def value_range(self):
+        value = self.value() or ""
+        parts = value.split("-")
+        try:
+            if len(parts) == 1 and value:
+                start, end = date(int(parts[0]), 1, 1), date(int(parts[0]) + 1, 1, 1)
+            elif len(parts) == 2:
+                year, month = int(parts[0]), int(parts[1])
+                start = date(year, month, 1)
+                end = start + timedelta(days=calendar.monthrange(year, month)[1])
+            elif len(parts) == 3:
+                start = date.fromisoformat(value)
+                end = start + timedelta(days=1)
+            else:
+                return None
+        except ValueError:
+            return None
+        return parts, start, end
+
+    def lookups(self, request, model_admin):
+        bounds = model_admin.get_queryset(request).aggregate(
+            low=Min("datetime"), high=Max("datetime")
+        )
+        if bounds["low"] is None:
+            return []
+        low, high = _local_date(bounds["low"]), _local_date(bounds["high"])
+
+        selected = self.value_range()
+        if selected is None:
+            return [(str(year), str(year)) for year in range(high.year, low.year - 1, -1)]
+        parts, start, end = selected
+        if len(parts) == 1:
+            return [
+                (f"{start.year}-{month:02d}", f"{calendar.month_name[month]} {start.year}")
+                for month in range(1, 13)
+                if (start.year, month) >= (low.year, low.month)
+                and (start.year, month) <= (high.year, high.month)
+            ]
+        if len(parts) == 3:
+            start = start.replace(day=1)
+            end = start + timedelta(days=calendar.monthrange(start.year, start.month)[1])
+        days = [start + timedelta(days=i) for i in range((end - start).days)]
+        return [
+            (day.isoformat(), day.strftime("%d %b %Y"))
+            for day in days
+            if low <= day <= high
+        ]
+
+    def queryset(self, request, queryset):
+        selected = self.value_range()
+        if selected is None:
+            return queryset
+        _, start, end = selected
+        start = datetime.combine(start, time.min)
+        end = datetime.combine(end, time.min)
+        if settings.USE_TZ:
+            start, end = timezone.make_aware(start), timezone.make_aware(end)
+        return queryset.filter(datetime__gte=start, datetime__lt=end)
+
+
+class AppointmentOccurrenceExceptionInline(admin.TabularInline):
+    model = AppointmentOccurrenceException
+    extra = 0
 
 
 @admin.register(Appointment)
 class AppointmentAdmin(admin.ModelAdmin):
-    list_display = ("name", "location", "datetime", "created_by", "phone")
-    search_fields = ("name", "location", "created_by__name")
-    list_filter = ("created_by", "datetime")
-    date_hierarchy = "datetime"
+    list_display = ("name", "location", "datetime", "created_by", "phone_display")
+    list_select_related = ("created_by",)
+    list_filter = (UserAutocompleteFilter, DateDrillDownFilter)
+    # Searching is done by get_search_results; this only enables the box.
+    search_fields = ("name_normalized",)
+    search_help_text = "Name prefix, or an exact phone number."
+    raw_id_fields = ("created_by",)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    inlines = [AppointmentOccurrenceExceptionInline]
+
+    @admin.display(description="Phone", ordering="phone_e164")
+    def phone_display(self, obj):
+        # The stored value is formatted without parsing a phone number
+        # object for every row of the change list.
+        return obj.phone_display
+
+    def get_search_results(self, request, queryset, search_term):
+        # Phone numbers match their E.164 key and names a case-sensitive
+        # prefix of the normalized column, served by its pattern-ops index.
+        # The default "^" lookup would be istartswith, i.e. UPPER(col) LIKE,
+        # which no index serves. Neither joins the users table.
+        if not search_term.strip():
+            return queryset, False
+        phone = normalize_phone(search_term)
+        if phone:
+            return queryset.filter(phone_e164=phone), False
+        return queryset.filter(name_normalized__startswith=normalize_text(search_term)), False
+
+    def get_urls(self):
+        return [
+            path(
+                "user-autocomplete/",
+                self.admin_site.admin_view(self.user_autocomplete),
+                name="p_totschool_appointment_tracker_appointment_user_autocomplete",
+            ),
+        ] + super().get_urls()
+
+    def user_autocomplete(self, request):
+        term = request.GET.get("term", "").strip()
+        users = User.objects.order_by("name")
+        if term:
+            users = users.filter(name__istartswith=term)
+        return JsonResponse(
+            {
+                "results": [
+                    {"id": pk, "text": name}
+                    for pk, name in users.values_list("pk", "name")[:20]
+                ]
+            }
+        )
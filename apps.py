@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class TotschoolAppointmentTrackerConfig(AppConfig):
@@ -8,5 +9,33 @@ class TotschoolAppointmentTrackerConfig(AppConfig):
     url_prefix = "appointments"
     icon = "calendar"
 
+    # Declared here and imported on first use; see lazy.py.
+    ui_components = [
+        "appointments.AppointmentMenu",
+        "appointments.AppointmentDetailMenu",
+        "appointments.AppointmentFilter",
+        "appointments.AppointmentFormFields",
+        "appointments.AppointmentCreateForm",
+        "appointments.AppointmentUpdateForm",
+        "appointments.AppointmentTable",
+        "appointments.AppointmentDetail",
+        "appointments.AppointmentDeleteForm",
+        "appointments.AppointmentSelectionTable",
+        "appointments.AppointmentCardTimelineFilter",
+        "appointments.AppointmentCardTimeline",
+        "appointments.AppointmentTimeline",
+    ]
+    generators = ["appointments.AppointmentGenerator"]
+
     def ready(self):
-        from . import ui, generator  # noqa: F401
+        from . import signals  # noqa: F401
+
+        if getattr(settings, "APPOINTMENTS_EAGER_REGISTRY", False):
+            from . import ui, generator  # noqa: F401
+            return
+
+        from lariv.registry import GeneratorRegistry, UIRegistry
+        from .lazy import declare
+
+        declare(UIRegistry, f"{self.name}.ui", self.ui_components)
+        declare(GeneratorRegistry, f"{self.name}.generator", self.generators)
@@ -0,0 +1,47 @@
+"""Async entry points for the read-heavy appointment views."""
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import Paginator
+
+
+async def apaginate(queryset, per_page, number):
+    """Async counterpart of ``Paginator(queryset, per_page).page(number)``."""
+    paginator = Paginator(queryset, per_page)
+    # ``count`` is a cached_property, so seeding it avoids a sync COUNT().
+    paginator.count = await queryset.acount()
+    number = paginator.validate_number(number)
+    bottom = (number - 1) * paginator.per_page
+    top = bottom + paginator.per_page
+    if top + paginator.orphans >= paginator.count:
+        top = paginator.count
+    object_list = [obj async for obj in queryset[bottom:top].aiterator()]
+    return paginator._get_page(object_list, number, paginator)
+
+
+class AsyncDataMixin:
+    """Serve GET by awaiting the view's async data method.
+
+    The data is fetched with the async ORM on the event loop and handed to
+    the regular synchronous ``get`` for rendering, so only the component
+    render runs in a worker thread.
+    """
+
+    http_method_names = ["get", "options"]
+    async_data_method = "aprepare_data"
+
+    async def get(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        self._async_data = await getattr(self, self.async_data_method)(
+            request, **kwargs
+        )
+        return await sync_to_async(super().get)(request, *args, **kwargs)
+
+    def prepare_data(self, request, **kwargs):
+        if getattr(self, "_async_data", None) is not None:
+            return self._async_data
+        return super().prepare_data(request, **kwargs)
+
+    def get_chart_data(self, request, **kwargs):
+        if getattr(self, "_async_data", None) is not None:
+            return self._async_data
+        return super().get_chart_data(request, **kwargs)
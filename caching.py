@@ -0,0 +1,55 @@
+"""Generation counters used to invalidate cached appointment data.
+
+Cache entries embed the current generation of the data they were built
+from. Writes bump the relevant generations instead of deleting keys, so
+stale entries simply stop being addressed and expire on their own.
+"""
+
+import hashlib
+import time
+
+from django.core.cache import cache
+
+GENERATION_PREFIX = "appointments:gen"
+
+
+def _generation_key(*parts):
+    return ":".join([GENERATION_PREFIX, *map(str, parts)])
+
+
+def get_generation(*parts):
+    key = _generation_key(*parts)
+    # Seed with a timestamp so an evicted counter never comes back at a value
+    # that older cache entries were keyed with.
+    cache.add(key, time.time_ns(), timeout=None)
+    return cache.get(key)
+
+
+async def aget_generation(*parts):
+    """``get_generation`` for async code, without blocking the event loop."""
+    key = _generation_key(*parts)
+    await cache.aadd(key, time.time_ns(), timeout=None)
+    return await cache.aget(key)
+
+
+def bump_generation(*parts):
+    key = _generation_key(*parts)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def params_hash(params, exclude=()):
+    """Stable short hash of a QueryDict or dict of query parameters."""
+    if hasattr(params, "lists"):
+        items = [(k, sorted(v)) for k, v in params.lists()]
+    else:
+        items = [(k, [v]) for k, v in params.items()]
+    normalized = sorted(
+        (k, [x for x in v if x not in ("", None)])
+        for k, v in items
+        if k not in exclude
+    )
+    normalized = [(k, v) for k, v in normalized if v]
+    return hashlib.sha1(repr(normalized).encode()).hexdigest()[:16]
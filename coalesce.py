@@ -0,0 +1,196 @@
+"""Single-flight coalescing and short-lived caching of identical reads.
+
+Dashboards shown on several screens, or a chart that is being dragged,
+send bursts of identical timeline and card requests. Requests are keyed on
+their scope and normalized filter set. The first one computes the result,
+concurrent identical requests wait for it instead of running the same
+queries, and the result is then kept for a few seconds.
+
+Keys embed the scope's generation. Every appointment write bumps it for
+the users it touches and for the admin scope, so a write is visible to the
+next request and never waits for the TTL to run out.
+"""
+
+import asyncio
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .caching import aget_generation, get_generation, params_hash
+from .models import is_admin
+
+MISSING = object()
+
+
+def coalesce_timeout():
+    return getattr(settings, "APPOINTMENTS_COALESCE_TIMEOUT", 5)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, compute):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = compute()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+_flight = SingleFlight()
+_async_calls = {}
+
+
+def coalesced(key, compute, timeout=None):
+    """``compute()``, shared by concurrent callers and cached under ``key``."""
+    result = cache.get(key, MISSING)
+    if result is not MISSING:
+        return result
+
+    def fill():
+        value = compute()
+        cache.set(key, value, coalesce_timeout() if timeout is None else timeout)
+        return value
+
+    return _flight.do(key, fill)
+
+
+async def acoalesced(key, compute, timeout=None):
+    """Async ``coalesced``: ``compute`` is a coroutine function.
+
+    The computation runs as its own task that every caller, the first one
+    included, awaits through ``asyncio.shield``. A caller whose client goes
+    away is cancelled alone; the others still get the result.
+    """
+    result = await cache.aget(key, MISSING)
+    if result is not MISSING:
+        return result
+
+    task = _async_calls.get(key)
+    if task is None:
+
+        async def fill():
+            value = await compute()
+            await cache.aset(
+                key, value, coalesce_timeout() if timeout is None else timeout
+            )
+            return value
+
+        task = _async_calls[key] = asyncio.ensure_future(fill())
+        task.add_done_callback(_forget(key))
+    return await asyncio.shield(task)
+
+
+def _forget(key):
+    def done(task):
+        if _async_calls.get(key) is task:
+            del _async_calls[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved, so a failure nobody awaited is not logged.
+
+    return done
+
+
+def scope_for(user):
+    """Cache scope of ``user``: ``all`` for admins, ``user-<pk>`` otherwise."""
+    if is_admin(user):
+        return "all"
+    return f"user-{user.pk}"
+
+
+def _format_key(kind, scope, params, parts, exclude, generation, series):
+    return "appointments:coalesce:{}:{}:{}:{}:{}.{}".format(
+        kind,
+        scope,
+        params_hash(params, exclude=exclude),
+        ":".join(map(str, parts)),
+        generation,
+        series,
+    )
+
+
+def coalesce_key(kind, scope, params, *parts, exclude=(), generation=None):
+    """Key for a ``kind`` of read in ``scope`` with query ``params``.
+
+    ``generation`` names the counter whose bump invalidates the entry; it
+    defaults to the whole scope's.
+    """
+    return _format_key(
+        kind,
+        scope,
+        params,
+        parts,
+        exclude,
+        get_generation(*(generation or ("scope", scope))),
+        get_generation("series"),
+    )
+
+
+async def acoalesce_key(kind, scope, params, *parts, exclude=(), generation=None):
+    """``coalesce_key`` for async views, using the async cache API."""
+    return _format_key(
+        kind,
+        scope,
+        params,
+        parts,
+        exclude,
+        await aget_generation(*(generation or ("scope", scope))),
+        await aget_generation("series"),
+    )
+
+
+class CoalescedReadMixin:
+    """Helpers for views whose reads go through ``coalesced``."""
+
+    def get_cache_scope(self):
+        return scope_for(self.request.user)
+
+    def get_coalesce_key(self, kind, *parts, exclude=(), generation=None):
+        return coalesce_key(
+            kind,
+            self.get_cache_scope(),
+            self.request.GET,
+            *parts,
+            exclude=exclude,
+            generation=generation,
+        )
+
+    async def aget_coalesce_key(self, kind, *parts, exclude=(), generation=None):
+        return await acoalesce_key(
+            kind,
+            self.get_cache_scope(),
+            self.request.GET,
+            *parts,
+            exclude=exclude,
+            generation=generation,
+        )
@@ -126,6 +126,45 @@ class AppointmentGenerator(BaseGenerator):
 
         print(f"Generated {total_created} total appointments")
 
+    def generate_dataset(
+        self, users, size, heavy_users=3, heavy_share=0.6, days=90, seed=0
+    ):
+        """Bulk-create a reproducible, skewed dataset of ``size`` appointments.
+
+        The first ``heavy_users`` users receive ``heavy_share`` of the rows and
+        the rest are spread evenly over the remaining users. Overlaps are not
+        avoided, so heavy users naturally end up with conflicting slots.
+        """
+        users = list(users)
+        if not users:
+            return []
+
+        rng = random.Random(seed)
+        heavy = users[:heavy_users]
+        light = users[heavy_users:] or heavy
+        start = timezone.now().replace(
+            hour=8, minute=0, second=0, microsecond=0
+        ) - timedelta(days=days // 3)
+
+        appointments = []
+        for _ in range(size):
+            pool = heavy if heavy and rng.random() < heavy_share else light
+            dt = start + timedelta(
+                days=rng.randrange(days),
+                hours=rng.randint(0, 8),
+                minutes=rng.choice([0, 15, 30, 45]),
+            )
+            appointment = Appointment(
+                created_by=rng.choice(pool),
+                name=rng.choice(APPOINTMENT_NAMES),
+                location=rng.choice(LOCATIONS),
+                datetime=dt,
+            )
+            appointment.populate_derived_fields()
+            appointments.append(appointment)
+
+        return Appointment.objects.bulk_create(appointments, batch_size=1000)
+
 
 def run():
     AppointmentGenerator().run()
@@ -0,0 +1,192 @@
+"""Per-view query instrumentation and query budgets for the appointment views."""
+
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+INSTRUMENTED_METHODS = ("prepare_data", "get_chart_data")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a view runs more queries than its declared budget."""
+
+
+class QueryStats:
+    """Collects query count, total DB time and the slowest statement.
+
+    Instances are installed as a database ``execute_wrapper`` on every
+    configured connection while the tracked block runs.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_sql = None
+        self.slowest_duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if self.slowest_sql is None or elapsed > self.slowest_duration:
+                self.slowest_sql = sql
+                self.slowest_duration = elapsed
+
+    @property
+    def duration_ms(self):
+        return round(self.duration * 1000, 3)
+
+    def as_dict(self):
+        return {
+            "label": self.label,
+            "queries": self.count,
+            "db_ms": self.duration_ms,
+            "slowest_ms": round(self.slowest_duration * 1000, 3),
+            "slowest_sql": (self.slowest_sql or "")[:500],
+        }
+
+    def server_timing(self, name):
+        return f'{name};dur={self.duration_ms};desc="{self.count} queries"'
+
+
+@contextmanager
+def capture_queries(label):
+    """Record every query run on any configured connection inside the block."""
+    stats = QueryStats(label)
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(stats))
+        yield stats
+
+
+def ensure_rendered(response):
+    """Render a lazy (template) response now so its queries are attributed."""
+    if callable(getattr(response, "render", None)) and not getattr(
+        response, "is_rendered", True
+    ):
+        response.render()
+    return response
+
+
+def track_queries(method):
+    """Record query stats for a view data method onto ``view.query_stats``."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if getattr(self, "_tracking_method", False):
+            return method(self, *args, **kwargs)
+        self._tracking_method = True
+        try:
+            with capture_queries(
+                f"{type(self).__name__}.{method.__name__}"
+            ) as stats:
+                return method(self, *args, **kwargs)
+        finally:
+            self._tracking_method = False
+            self.__dict__.setdefault("query_stats", []).append(stats)
+            logger.debug("appointment view data queries", extra=stats.as_dict())
+
+    wrapper._tracks_queries = True
+    return wrapper
+
+
+class QueryBudgetMixin:
+    """Instrument a view and hold it to ``query_budget`` queries per request.
+
+    The whole dispatch (including lazy template rendering) is measured, and
+    ``prepare_data``/``get_chart_data`` are measured on their own. Totals are
+    exposed through a ``Server-Timing`` header, a structured log record and
+    ``response.query_stats``. Exceeding the budget logs a warning, or raises
+    ``QueryBudgetExceeded`` when ``APPOINTMENTS_ENFORCE_QUERY_BUDGETS`` is set,
+    so tests can assert against the declared budget.
+
+    ``query_budget`` is what every request of the view may run. Views whose
+    code paths differ by request (e.g. a windowed day that may hold recurring
+    series) override ``get_query_budget`` to add a fixed allowance per path.
+    """
+
+    query_budget = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in INSTRUMENTED_METHODS:
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(method, "_tracks_queries", False):
+                setattr(cls, name, track_queries(method))
+
+    def dispatch(self, request, *args, **kwargs):
+        if getattr(self, "view_is_async", False):
+            return self.async_dispatch(request, *args, **kwargs)
+
+        self.query_stats = []
+        with capture_queries(type(self).__name__) as total:
+            response = ensure_rendered(super().dispatch(request, *args, **kwargs))
+
+        self.report_query_stats(request, response, total)
+        return response
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        # Async ORM queries run on executor threads whose connections the
+        # execute_wrapper cannot see, so only wall time is reported here.
+        start = time.perf_counter()
+        response = await super().dispatch(request, *args, **kwargs)
+        elapsed = round((time.perf_counter() - start) * 1000, 3)
+
+        if getattr(settings, "APPOINTMENTS_SERVER_TIMING", True):
+            response["Server-Timing"] = f"total;dur={elapsed}"
+        logger.info(
+            "appointment view timing",
+            extra={
+                "label": type(self).__name__,
+                "method": request.method,
+                "path": request.path,
+                "total_ms": elapsed,
+            },
+        )
+        return response
+
+    def get_query_budget(self):
+        return self.query_budget
+
+    def report_query_stats(self, request, response, total):
+        budget = self.get_query_budget()
+        response.query_stats = total
+        response.query_budget = budget
+
+        if getattr(settings, "APPOINTMENTS_SERVER_TIMING", True):
+            timings = [total.server_timing("db")]
+            timings += [
+                stats.server_timing(stats.label.rsplit(".", 1)[-1])
+                for stats in self.query_stats
+            ]
+            response["Server-Timing"] = ", ".join(timings)
+
+        record = dict(
+            total.as_dict(),
+            method=request.method,
+            path=request.path,
+            budget=budget,
+            phases=[stats.as_dict() for stats in self.query_stats],
+        )
+        over_budget = budget is not None and total.count > budget
+        if not over_budget:
+            logger.info("appointment view queries", extra=record)
+            return
+
+        logger.warning("appointment view exceeded its query budget", extra=record)
+        if getattr(settings, "APPOINTMENTS_ENFORCE_QUERY_BUDGETS", False):
+            raise QueryBudgetExceeded(
+                f"{type(self).__name__} ran {total.count} queries, "
+                f"budget is {budget}"
+            )
@@ -0,0 +1,57 @@
+"""Registry entries that are declared by name and imported on first use.
+
+Registering a component or generator normally means importing its module
+at startup. ``ui.py`` pulls in the whole components library and
+``generator.py`` is only needed by management commands, yet both used to
+load in every web worker and every ``manage.py`` run. ``declare`` puts a
+``LazyEntry`` in the registry instead. The module is imported when the
+entry is first called or inspected, and its own ``register`` decorators
+then replace the placeholders.
+"""
+
+import importlib
+
+
+class LazyEntry:
+    """Stands in for a registered class until its module is imported."""
+
+    def __init__(self, name, module):
+        self.name = name
+        self.module = module
+        self._target = None
+
+    def resolve(self):
+        if self._target is None:
+            module = importlib.import_module(self.module)
+            self._target = getattr(module, self.name.rpartition(".")[2])
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        # Dunder probes (copy, pickle, inspect, registries checking for
+        # ``__wrapped__``) must not import the module, and the entry's own
+        # attributes are missing only on an instance built without
+        # ``__init__`` (e.g. by ``copy``), where resolving would recurse.
+        if (attr.startswith("__") and attr.endswith("__")) or attr in (
+            "name",
+            "module",
+            "_target",
+        ):
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self):
+        state = "resolved" if self._target is not None else "unresolved"
+        return f"<LazyEntry {self.name} from {self.module} ({state})>"
+
+
+def declare(registry, module, names):
+    """Register ``names`` (``app.ClassName``) as lazily imported from ``module``.
+
+    The class name after the last dot must match the attribute in
+    ``module``, as it does for every entry of this app.
+    """
+    for name in names:
+        registry.register(name)(LazyEntry(name, module))
@@ -0,0 +1,245 @@
+"""Live card updates: a pluggable publish/subscribe broker for SSE streams."""
+
+import asyncio
+import threading
+from datetime import timedelta
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+DEFAULT_BROKER = "p_totschool_appointment_tracker.live.LocalBroker"
+SUBSCRIPTION_BACKLOG = 100
+
+
+def channel_name(day, scope):
+    """Channel for the cards of one day (``YYYY-MM-DD``) in one scope."""
+    return f"appointments:cards:{day}:{scope}"
+
+
+def local_day(dt):
+    if timezone.is_aware(dt):
+        dt = timezone.localtime(dt)
+    return dt.date()
+
+
+def day_channels(user_id, day):
+    return [channel_name(day.isoformat(), "all"), channel_name(day.isoformat(), f"user-{user_id}")]
+
+
+class Subscription:
+    """A subscriber's bounded event queue bound to its event loop."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=SUBSCRIPTION_BACKLOG)
+
+    def offer(self, event):
+        # Runs on the subscriber's loop. A subscriber that falls this far
+        # behind is told to reload instead of buffering without bound.
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"op": "resync"})
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class BaseBroker:
+    """Interface for live-update brokers.
+
+    ``publish`` may be called from any thread; ``subscribe`` and
+    ``unsubscribe`` are called from the event loop serving the stream.
+    """
+
+    def subscribe(self, channel):
+        raise NotImplementedError
+
+    def unsubscribe(self, channel, subscription):
+        raise NotImplementedError
+
+    def publish(self, channel, event):
+        raise NotImplementedError
+
+
+class LocalBroker(BaseBroker):
+    """In-process fan-out; each change is delivered once to every subscriber.
+
+    Only streams served by the same process receive events, so multi-process
+    deployments should plug in a shared backend via APPOINTMENTS_LIVE_BROKER.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, channel):
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, channel, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down without unsubscribing.
+                self.unsubscribe(channel, subscription)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, "APPOINTMENTS_LIVE_BROKER", DEFAULT_BROKER)
+                _broker = import_string(path)()
+    return _broker
+
+
+def card_payload(appointment):
+    return {
+        "pk": appointment.pk,
+        "name": appointment.name,
+        "location": appointment.location,
+        "datetime": appointment.datetime.isoformat(),
+        "phone": appointment.phone_display or None,
+        "remarks": appointment.remarks,
+        "url": appointment.get_absolute_url(),
+    }
+
+
+def card_events(appointment, previous=None, removed=False):
+    """``(channel, event)`` pairs describing a change to one appointment's card.
+
+    ``previous`` is the ``(created_by_id, datetime)`` it was stored with; if
+    the card moved, it is removed from the channels it left. Events are built
+    eagerly so they can be published after commit.
+    """
+    current = set(day_channels(appointment.created_by_id, local_day(appointment.datetime)))
+    if removed:
+        event = {"op": "remove", "pk": appointment.pk}
+    else:
+        event = {"op": "upsert", "pk": appointment.pk, "card": card_payload(appointment)}
+    events = [(channel, event) for channel in current]
+
+    if previous is not None and previous[1] is not None:
+        for channel in set(day_channels(previous[0], local_day(previous[1]))) - current:
+            events.append((channel, {"op": "remove", "pk": appointment.pk}))
+    return events
+
+
+def resync_events(spans):
+    """Ask every stream overlapping the ``(created_by_id, low, high)`` spans to reload."""
+    events = []
+    for user_id, low, high in spans:
+        day, last = local_day(low), local_day(high)
+        while day <= last:
+            events += [(channel, {"op": "resync"}) for channel in day_channels(user_id, day)]
+            day += timedelta(days=1)
+    return events
+
+
+def series_horizon():
+    """How far ahead series edits reach open card streams, as a timedelta."""
+    return timedelta(days=getattr(settings, "APPOINTMENTS_LIVE_SERIES_DAYS", 62))
+
+
+def series_events(versions, moved=()):
+    """Resync events for the days a series has, or had, occurrences on.
+
+    ``versions`` are ``(created_by_id, datetime, recurrence)`` states of the
+    series, e.g. before and after an edit; ``moved`` are ``(created_by_id,
+    datetime)`` of exception occurrences. A series is open-ended, so only
+    days from today to ``series_horizon`` are covered; later days are read
+    fresh when they are opened. Events are built eagerly so they can be
+    published after commit.
+    """
+    from .recurrence import day_window, occurrences_between, parse_rule
+
+    window_start = day_window(timezone.localdate())[0]
+    window_end = window_start + series_horizon()
+    days = set()
+    for user_id, start, recurrence in versions:
+        if user_id is None or start is None or not recurrence:
+            continue
+        for occurrence in occurrences_between(
+            start, parse_rule(recurrence), window_start, window_end
+        ):
+            days.add((user_id, local_day(occurrence)))
+    for user_id, dt in moved:
+        if dt is not None and window_start <= dt < window_end:
+            days.add((user_id, local_day(dt)))
+
+    return [
+        (channel, {"op": "resync"})
+        for user_id, day in sorted(days)
+        for channel in day_channels(user_id, day)
+    ]
+
+
+def publish(events):
+    broker = get_broker()
+    for channel, event in events:
+        broker.publish(channel, event)
+
+
+def streams_enabled():
+    """Whether the card stream is routed and pages subscribe to it.
+
+    ``APPOINTMENTS_CARD_STREAMS`` decides; it defaults to
+    ``APPOINTMENTS_ASYNC_VIEWS``. Under WSGI each open stream holds a worker
+    thread for up to ``APPOINTMENTS_CARD_STREAM_MAX_AGE`` seconds, so a
+    sync deployment that turns streams on needs threads to spare for every
+    open cards page; without the setting, those pages refresh on navigation
+    as before.
+    """
+    return getattr(
+        settings,
+        "APPOINTMENTS_CARD_STREAMS",
+        getattr(settings, "APPOINTMENTS_ASYNC_VIEWS", False),
+    )
+
+
+def append_stream_script(request, response, day):
+    """Append the live-update script for ``day`` to an HTML cards response."""
+    from django.template.loader import render_to_string
+    from django.urls import reverse
+
+    if (
+        not streams_enabled()
+        or response.status_code != 200
+        or response.streaming
+        or not response.get("Content-Type", "").startswith("text/html")
+    ):
+        return response
+    response.content += render_to_string(
+        "p_totschool_appointment_tracker/cards_live.html",
+        {
+            "stream_url": reverse("appointments:cards_stream"),
+            "date": day,
+            "refresh_url": request.get_full_path(),
+        },
+    ).encode(response.charset)
+    if response.has_header("Content-Length"):
+        response["Content-Length"] = str(len(response.content))
+    return response
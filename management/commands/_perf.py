@@ -0,0 +1,101 @@
+"""Shared helpers for the appointment benchmark and load-test commands."""
+
+import json
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from users.models import User
+
+
+@contextmanager
+def scratch_database(verbosity=0, keepdb=False):
+    """Run the block against a throwaway test database."""
+    setup_test_environment()
+    old_config = setup_databases(
+        verbosity, interactive=False, keepdb=keepdb, aliases={DEFAULT_DB_ALIAS}
+    )
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity, keepdb=keepdb)
+        teardown_test_environment()
+
+
+def create_users(count, prefix="bench", **extra):
+    """Create ``count`` active users with predictable usernames."""
+    users = []
+    for i in range(count):
+        users.append(
+            User.objects.create(
+                **{User.USERNAME_FIELD: f"{prefix}-{i}@example.com"},
+                name=f"{prefix.title()} User {i}",
+                is_active=True,
+                **extra,
+            )
+        )
+    return users
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values`` (``pct`` in 0-100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def measure(fn, repeat=5, warmup=1):
+    """Time ``fn`` and record its query count and peak traced memory.
+
+    Wall times come from untraced runs; queries and memory are taken from a
+    separate run so tracemalloc overhead does not skew the timings.
+    """
+    result = None
+    for _ in range(warmup):
+        result = fn()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    with CaptureQueriesContext(connection) as ctx:
+        tracemalloc.start()
+        try:
+            result = fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "wall_ms": {
+            "min": round(min(timings), 3),
+            "median": round(statistics.median(timings), 3),
+            "mean": round(statistics.fmean(timings), 3),
+            "max": round(max(timings), 3),
+        },
+        "queries": len(ctx.captured_queries),
+        "peak_kib": round(peak / 1024, 1),
+        "status": getattr(result, "status_code", None),
+        "bytes": _payload_size(result),
+    }
+
+
+def _payload_size(result):
+    if hasattr(result, "content"):
+        return len(result.content)
+    if isinstance(result, dict):
+        return len(json.dumps(result, default=str))
+    return None
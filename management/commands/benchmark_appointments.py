@@ -0,0 +1,217 @@
+import contextlib
+import io
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from ...generator import AppointmentGenerator
+from ...models import Appointment
+from ...views import AppointmentList, AppointmentTimeline
+from ._perf import create_users, measure, scratch_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a reproducible appointment dataset in a scratch database and "
+        "benchmark the appointment views, writing a JSON report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=5000)
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--heavy-users", type=int, default=3)
+        parser.add_argument("--heavy-share", type=float, default=0.6)
+        parser.add_argument("--days", type=int, default=90)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--output", default="bench_output.json")
+        parser.add_argument(
+            "--compare",
+            help="Previous JSON report to compare the results against.",
+        )
+        parser.add_argument(
+            "--fail-threshold",
+            type=float,
+            default=None,
+            help="Fail if any median wall time regresses by more than this percent.",
+        )
+        parser.add_argument("--keepdb", action="store_true")
+
+    def handle(self, *args, **options):
+        with scratch_database(options["verbosity"] - 1, options["keepdb"]):
+            report = self.run_benchmarks(options)
+
+        with open(options["output"], "w") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+        self.stdout.write(f"Wrote report to {options['output']}")
+
+        for name, result in sorted(report["cases"].items()):
+            self.stdout.write(
+                f"{name:<24} {result['wall_ms']['median']:>10.2f} ms "
+                f"{result['queries']:>5} queries {result['peak_kib']:>10.1f} KiB"
+            )
+
+        if options["compare"]:
+            self.compare(report, options["compare"], options["fail_threshold"])
+
+    def run_benchmarks(self, options):
+        users = create_users(options["users"])
+        admin = create_users(1, prefix="bench-admin", is_superuser=True)[0]
+        generator = AppointmentGenerator()
+        generator.generate_dataset(
+            users,
+            options["size"],
+            heavy_users=options["heavy_users"],
+            heavy_share=options["heavy_share"],
+            days=options["days"],
+            seed=options["seed"],
+        )
+        heavy_user = users[0]
+
+        overlapping = (
+            Appointment.objects.filter(created_by=heavy_user)
+            .annotate(
+                has_overlap=Exists(
+                    Appointment.objects.filter(
+                        created_by=OuterRef("created_by"),
+                        datetime__gt=OuterRef("datetime") - timedelta(minutes=30),
+                        datetime__lt=OuterRef("datetime") + timedelta(minutes=30),
+                    ).exclude(pk=OuterRef("pk"))
+                )
+            )
+            .filter(has_overlap=True)
+            .first()
+        ) or Appointment.objects.filter(created_by=heavy_user).first()
+        busy_date = timezone.localtime(overlapping.datetime).date().isoformat()
+        span = Appointment.objects.order_by("datetime")
+        first, last = span.first().datetime, span.last().datetime
+
+        admin_client = Client()
+        admin_client.force_login(admin)
+        user_client = Client()
+        user_client.force_login(heavy_user)
+
+        list_url = reverse("appointments:default")
+        deep_page = max(1, Appointment.objects.count() // self.per_page(admin))
+
+        repeat = options["repeat"]
+        cases = {
+            "list_plain": lambda: admin_client.get(list_url),
+            "list_scoped": lambda: user_client.get(list_url),
+            "list_sorted": lambda: admin_client.get(list_url, {"sort": "name"}),
+            "list_overlapping": lambda: admin_client.get(
+                list_url, {"overlapping": "true"}
+            ),
+            "list_deep_page": lambda: admin_client.get(list_url, {"page": deep_page}),
+            "cards": lambda: admin_client.get(
+                reverse("appointments:cards"), {"date": busy_date}
+            ),
+            "timeline_wide": lambda: self.chart_data(
+                admin, first.isoformat(), last.isoformat()
+            ),
+            "timeline_columnar": lambda: admin_client.get(
+                reverse("appointments:timeline"),
+                {
+                    "format": "columnar",
+                    "range_min": first.isoformat(),
+                    "range_max": last.isoformat(),
+                },
+                HTTP_ACCEPT_ENCODING="gzip",
+            ),
+            "timeline_narrow": lambda: self.chart_data(
+                admin,
+                overlapping.datetime.isoformat(),
+                (overlapping.datetime + timedelta(days=1)).isoformat(),
+            ),
+            "detail_overlaps": lambda: admin_client.get(
+                reverse("appointments:detail", kwargs={"pk": overlapping.pk})
+            ),
+        }
+        results = {name: measure(fn, repeat) for name, fn in cases.items()}
+
+        # Write paths mutate the dataset, so they run after the read cases.
+        create_data = {
+            "name": "Benchmark Meeting",
+            "location": "Conference Room A",
+            "phone": "+14155550123",
+            "datetime": (last + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M"),
+            "remarks": "",
+        }
+        results["create"] = measure(
+            lambda: user_client.post(reverse("appointments:create"), create_data),
+            repeat,
+        )
+        results["generator"] = measure(
+            lambda: self.quiet(generator.generate_appointments_for_user, users[-1], 10),
+            repeat,
+        )
+
+        return {
+            "meta": {
+                "size": options["size"],
+                "users": options["users"],
+                "heavy_users": options["heavy_users"],
+                "heavy_share": options["heavy_share"],
+                "days": options["days"],
+                "seed": options["seed"],
+                "repeat": repeat,
+                "vendor": connection.vendor,
+                "created_at": timezone.now().isoformat(),
+            },
+            "cases": results,
+        }
+
+    def chart_data(self, user, range_min, range_max):
+        request = RequestFactory().get(
+            reverse("appointments:timeline"),
+            {"range_min": range_min, "range_max": range_max},
+        )
+        request.user = user
+        view = AppointmentTimeline()
+        view.setup(request)
+        return view.get_chart_data(request)
+
+    @staticmethod
+    def quiet(fn, *args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args)
+
+    def per_page(self, user):
+        request = RequestFactory().get(reverse("appointments:default"))
+        request.user = user
+        view = AppointmentList()
+        view.setup(request)
+        return view.get_paginate_by(request) or 1
+
+    def compare(self, report, path, threshold):
+        with open(path) as fh:
+            baseline = json.load(fh)
+
+        regressions = []
+        self.stdout.write(f"\nComparison against {path}:")
+        for name, result in sorted(report["cases"].items()):
+            previous = baseline.get("cases", {}).get(name)
+            if previous is None:
+                self.stdout.write(f"{name:<24} (new)")
+                continue
+            before = previous["wall_ms"]["median"]
+            after = result["wall_ms"]["median"]
+            change = (after - before) / before * 100 if before else 0.0
+            self.stdout.write(
+                f"{name:<24} {before:>10.2f} -> {after:>10.2f} ms ({change:+.1f}%) "
+                f"queries {previous['queries']} -> {result['queries']}"
+            )
+            if threshold is not None and change > threshold:
+                regressions.append(name)
+
+        if regressions:
+            raise CommandError(
+                f"Median wall time regressed beyond {threshold}% for: "
+                + ", ".join(regressions)
+            )
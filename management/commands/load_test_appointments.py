@@ -0,0 +1,290 @@
+import json
+import random
+import threading
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from ...generator import AppointmentGenerator
+from ...models import Appointment
+from ._perf import create_users, percentile, scratch_database
+
+DEFAULT_MIX = {
+    "list": 25,
+    "cards": 20,
+    "timeline_pan": 20,
+    "detail": 20,
+    "create": 5,
+    "update": 10,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch database with the generator and drive a mix of "
+        "concurrent requests against the appointment views in-process, "
+        "reporting throughput and p50/p95/p99 latency per endpoint for each "
+        "worker count."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=5000)
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--days", type=int, default=90)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--workers",
+            default="1,2,4,8",
+            help="Comma-separated worker counts; each runs for --duration seconds.",
+        )
+        parser.add_argument("--duration", type=float, default=10.0)
+        parser.add_argument(
+            "--mix",
+            default=None,
+            help="Endpoint weights, e.g. list=5,cards=3,detail=2 "
+            f"(endpoints: {', '.join(DEFAULT_MIX)}).",
+        )
+        parser.add_argument("--output", default="load_test_output.json")
+        parser.add_argument("--keepdb", action="store_true")
+
+    def handle(self, *args, **options):
+        worker_counts = self.parse_workers(options["workers"])
+        mix = self.parse_mix(options["mix"])
+
+        with scratch_database(options["verbosity"] - 1, options["keepdb"]):
+            context = self.seed(options)
+            levels = {}
+            for workers in worker_counts:
+                levels[str(workers)] = self.run_level(
+                    context, mix, workers, options["duration"], options["seed"]
+                )
+                self.print_level(workers, levels[str(workers)])
+
+        report = {
+            "meta": {
+                "size": options["size"],
+                "users": options["users"],
+                "days": options["days"],
+                "seed": options["seed"],
+                "duration": options["duration"],
+                "mix": mix,
+                "vendor": connection.vendor,
+                "created_at": timezone.now().isoformat(),
+            },
+            "levels": levels,
+        }
+        with open(options["output"], "w") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+        self.stdout.write(f"Wrote report to {options['output']}")
+
+    @staticmethod
+    def parse_workers(value):
+        try:
+            counts = [int(part) for part in value.split(",") if part.strip()]
+        except ValueError:
+            raise CommandError("--workers must be comma-separated integers") from None
+        if not counts or min(counts) < 1:
+            raise CommandError("--workers must be positive")
+        return counts
+
+    @staticmethod
+    def parse_mix(value):
+        if not value:
+            return dict(DEFAULT_MIX)
+        mix = {}
+        for part in value.split(","):
+            name, _, weight = part.partition("=")
+            name = name.strip()
+            if name not in DEFAULT_MIX:
+                raise CommandError(f"Unknown endpoint {name!r} in --mix")
+            try:
+                mix[name] = float(weight or 1)
+            except ValueError:
+                raise CommandError(f"Invalid weight for {name!r} in --mix") from None
+        return mix
+
+    def seed(self, options):
+        users = create_users(options["users"], prefix="load")
+        admin = create_users(1, prefix="load-admin", is_superuser=True)[0]
+        AppointmentGenerator().generate_dataset(
+            users, options["size"], days=options["days"], seed=options["seed"]
+        )
+        span = Appointment.objects.order_by("datetime")
+        return {
+            "users": users,
+            "admin": admin,
+            "first": span.first().datetime,
+            "last": span.last().datetime,
+            "pks": list(Appointment.objects.values_list("pk", flat=True)),
+            "owned": {
+                user_id: pk
+                for pk, user_id in Appointment.objects.values_list("pk", "created_by_id")
+            },
+        }
+
+    def run_level(self, context, mix, workers, duration, seed):
+        samples = []
+        lock = threading.Lock()
+        start_barrier = threading.Barrier(workers + 1)
+        deadline = [None]
+
+        def worker(index):
+            rng = random.Random(f"{seed}-{workers}-{index}")
+            # One in four workers browses as an admin, the rest as users.
+            user = context["admin"] if index % 4 == 3 else rng.choice(context["users"])
+            # Server errors come back as 500 responses and are counted,
+            # instead of killing the worker.
+            client = Client(raise_request_exception=False)
+            client.force_login(user)
+            names, weights = zip(*mix.items())
+            local = []
+            try:
+                start_barrier.wait()
+                while time.perf_counter() < deadline[0]:
+                    name = rng.choices(names, weights)[0]
+                    started = time.perf_counter()
+                    response = getattr(self, f"hit_{name}")(client, user, rng, context)
+                    local.append(
+                        (
+                            name,
+                            (time.perf_counter() - started) * 1000,
+                            response.status_code,
+                            self.failed(name, response),
+                        )
+                    )
+            finally:
+                with lock:
+                    samples.extend(local)
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=worker, args=(i,), daemon=True) for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        started = time.perf_counter()
+        deadline[0] = started + duration
+        start_barrier.wait(timeout=120)
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        close_old_connections()
+        return self.summarize(samples, elapsed)
+
+    @staticmethod
+    def failed(name, response):
+        if response.status_code >= 400:
+            return True
+        # A saved form redirects to the appointment; one re-rendered with
+        # validation errors comes back as a plain 200.
+        return (
+            name in ("create", "update")
+            and response.status_code == 200
+            and not response.has_header("HX-Redirect")
+        )
+
+    @staticmethod
+    def summarize(samples, elapsed):
+        def stats(rows):
+            latencies = [ms for _, ms, _, _ in rows]
+            return {
+                "requests": len(rows),
+                "errors": sum(1 for *_, failed in rows if failed),
+                "server_errors": sum(1 for _, _, status, _ in rows if status >= 500),
+                "rps": round(len(rows) / elapsed, 2),
+                "p50_ms": round(percentile(latencies, 50) or 0, 2),
+                "p95_ms": round(percentile(latencies, 95) or 0, 2),
+                "p99_ms": round(percentile(latencies, 99) or 0, 2),
+            }
+
+        by_endpoint = {}
+        for row in samples:
+            by_endpoint.setdefault(row[0], []).append(row)
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "total": stats(samples),
+            "endpoints": {name: stats(rows) for name, rows in sorted(by_endpoint.items())},
+        }
+
+    def print_level(self, workers, level):
+        total = level["total"]
+        self.stdout.write(
+            f"\n{workers} worker(s): {total['requests']} requests, "
+            f"{total['rps']:.1f} req/s, {total['errors']} errors "
+            f"({total['server_errors']} server errors)"
+        )
+        self.stdout.write(
+            f"{'endpoint':<14} {'req':>6} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}"
+        )
+        for name, result in [*level["endpoints"].items(), ("all", total)]:
+            self.stdout.write(
+                f"{name:<14} {result['requests']:>6} {result['rps']:>8.1f} "
+                f"{result['p50_ms']:>7.1f}ms {result['p95_ms']:>7.1f}ms "
+                f"{result['p99_ms']:>7.1f}ms"
+            )
+
+    # Traffic mix. Each returns the response.
+
+    def hit_list(self, client, user, rng, context):
+        params = rng.choice(
+            [
+                {},
+                {"sort": rng.choice(["name", "-datetime", "location"])},
+                {"overlapping": "true"},
+                {"date": self.random_day(rng, context)},
+                {"page": rng.randint(1, 5)},
+            ]
+        )
+        return client.get(reverse("appointments:default"), params)
+
+    def hit_cards(self, client, user, rng, context):
+        params = rng.choice([{}, {"date": self.random_day(rng, context)}])
+        return client.get(reverse("appointments:cards"), params)
+
+    def hit_timeline_pan(self, client, user, rng, context):
+        span = (context["last"] - context["first"]).total_seconds()
+        low = context["first"] + timedelta(seconds=rng.uniform(0, span))
+        high = low + timedelta(days=rng.choice([1, 7, 30]))
+        params = {"range_min": low.isoformat(), "range_max": high.isoformat()}
+        if rng.random() < 0.5:
+            params["format"] = "columnar"
+        return client.get(reverse("appointments:timeline"), params)
+
+    def hit_detail(self, client, user, rng, context):
+        pk = context["owned"].get(user.pk) if not user.is_superuser else None
+        pk = pk or rng.choice(context["pks"])
+        return client.get(reverse("appointments:detail", kwargs={"pk": pk}))
+
+    def hit_create(self, client, user, rng, context):
+        return client.post(reverse("appointments:create"), self.form_data(rng, context))
+
+    def hit_update(self, client, user, rng, context):
+        pk = context["owned"].get(user.pk) or rng.choice(context["pks"])
+        return client.post(
+            reverse("appointments:update", kwargs={"pk": pk}),
+            self.form_data(rng, context),
+        )
+
+    @staticmethod
+    def random_day(rng, context):
+        days = max((context["last"] - context["first"]).days, 1)
+        day = context["first"] + timedelta(days=rng.randrange(days))
+        return timezone.localtime(day).date().isoformat()
+
+    @staticmethod
+    def form_data(rng, context):
+        when = context["last"] + timedelta(
+            days=rng.randint(1, 30), hours=rng.randint(0, 8)
+        )
+        return {
+            "name": "Load Test Meeting",
+            "location": rng.choice(["Conference Room A", "Conference Room B", "Library"]),
+            "phone": "+14155550123",
+            "datetime": timezone.localtime(when).strftime("%Y-%m-%dT%H:%M"),
+            "remarks": "",
+        }
@@ -0,0 +1,116 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter so nothing is imported yet. ``mode`` decides
+# what is loaded after ``django.setup()``: nothing (a management command),
+# the URLconf (a web worker's boot), and optionally the modules this app
+# defers, imported eagerly as ``ready()`` used to.
+CHILD = """
+import importlib, json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+mode, deferred = sys.argv[1], sys.argv[2:]
+if mode == "worker":
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+for module in deferred:
+    importlib.import_module(module)
+print(json.dumps({
+    "wall_ms": (time.perf_counter() - start) * 1000,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure interpreter startup for web workers and management commands "
+        "with this app's UI components and generators imported lazily (as "
+        "now) and eagerly, in fresh processes. Wall times come from plain "
+        "runs; a separate python -X importtime pass breaks down the deferred "
+        "modules, since its tracing slows every import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--output", default=None, help="Also write a JSON report.")
+
+    def handle(self, *args, **options):
+        app = apps.get_containing_app_config(__name__)
+        deferred = [f"{app.name}.ui", f"{app.name}.generator"]
+
+        report = {}
+        for mode in ("worker", "command"):
+            for variant, modules in (("lazy", []), ("eager", deferred)):
+                report[f"{mode}/{variant}"] = self.measure(mode, modules, options["repeat"])
+
+        for mode in ("worker", "command"):
+            lazy, eager = report[f"{mode}/lazy"], report[f"{mode}/eager"]
+            saved = eager["wall_ms"] - lazy["wall_ms"]
+            self.stdout.write(
+                f"{mode:<8} lazy {lazy['wall_ms']:>8.1f} ms {lazy['modules']:>5} modules | "
+                f"eager {eager['wall_ms']:>8.1f} ms {eager['modules']:>5} modules | "
+                f"saved {saved:>7.1f} ms ({100 * saved / eager['wall_ms']:.0f}%)"
+            )
+        self.stdout.write(
+            "import time of deferred modules: "
+            + ", ".join(
+                f"{name} {ms:.1f} ms"
+                for name, ms in report["command/eager"]["deferred_import_ms"].items()
+            )
+        )
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+            self.stdout.write(f"Wrote report to {options['output']}")
+
+    def measure(self, mode, modules, repeat):
+        walls, counts, imports = [], [], {}
+        for _ in range(repeat):
+            child = json.loads(self.run_child(mode, modules).stdout.strip().splitlines()[-1])
+            walls.append(child["wall_ms"])
+            counts.append(child["modules"])
+        for _ in range(repeat if modules else 0):
+            result = self.run_child(mode, modules, "-X", "importtime")
+            cumulative = parse_importtime(result.stderr)
+            for module in modules:
+                imports.setdefault(module, []).append(cumulative.get(module, 0) / 1000)
+        return {
+            "wall_ms": round(statistics.median(walls), 2),
+            "modules": max(counts),
+            "deferred_import_ms": {
+                module: round(statistics.median(values), 2)
+                for module, values in imports.items()
+            },
+        }
+
+    def run_child(self, mode, modules, *flags):
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in sys.path if p)}
+        return subprocess.run(
+            [sys.executable, *flags, "-c", CHILD, mode, *modules],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+
+
+def parse_importtime(stderr):
+    """``{module: cumulative microseconds}`` from ``-X importtime`` output."""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative[parts[2].strip()] = int(parts[1])
+    return cumulative
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from ... import reminders
+
+
+class Command(BaseCommand):
+    help = (
+        "Send appointment reminders as they fall due. Runs until interrupted, "
+        "or once with --once (e.g. from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true")
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        scheduler = reminders.ReminderScheduler(batch_size=options["batch_size"])
+        if options["once"]:
+            sent = scheduler.run_pending()
+            self.stdout.write(f"Sent {sent} reminders")
+            return
+
+        if not reminders.cache_is_shared():
+            self.stderr.write(
+                "The default cache is local to each process, so bookings made "
+                "elsewhere are only picked up at the next lookahead refill. "
+                "Configure a shared cache for prompt reminders."
+            )
+        reminders.set_scheduler(scheduler)
+        self.stdout.write("Sending appointment reminders; press Ctrl-C to stop")
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            scheduler.stop()
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from ... import warming
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the card timeline cache for today and the following days for "
+        "every active user and the admin scope. Meant to run off-hours, "
+        "e.g. nightly from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=2, help="Days to warm, starting today."
+        )
+
+    def handle(self, *args, **options):
+        days = warming.warm_days(options["days"])
+        warmed = warming.warm_cards(days)
+        self.stdout.write(f"Warmed {warmed} card timelines for {', '.join(days)}")
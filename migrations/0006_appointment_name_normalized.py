@@ -0,0 +1,45 @@
+import unicodedata
+
+from django.db import migrations, models
+
+
+def normalize_text(value):
+    value = unicodedata.normalize("NFKD", value or "")
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    return " ".join(value.casefold().split())
+
+
+def populate_name_normalized(apps, schema_editor):
+    Appointment = apps.get_model("p_totschool_appointment_tracker", "Appointment")
+    batch = []
+    for appointment in Appointment.objects.only("pk", "name").iterator(chunk_size=2000):
+        appointment.name_normalized = normalize_text(appointment.name)
+        batch.append(appointment)
+        if len(batch) >= 2000:
+            Appointment.objects.bulk_update(batch, ["name_normalized"])
+            batch = []
+    if batch:
+        Appointment.objects.bulk_update(batch, ["name_normalized"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("p_totschool_appointment_tracker", "0005_alter_appointment_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="appointment",
+            name="name_normalized",
+            field=models.CharField(blank=True, editable=False, max_length=250),
+        ),
+        migrations.RunPython(populate_name_normalized, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["name_normalized", "-datetime"],
+                name="appointment_name_recent_idx",
+            ),
+        ),
+    ]
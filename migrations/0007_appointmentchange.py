@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("p_totschool_appointment_tracker", "0006_appointment_name_normalized"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AppointmentChange",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("appointment_id", models.BigIntegerField()),
+                ("owner_id", models.BigIntegerField()),
+                (
+                    "operation",
+                    models.CharField(
+                        choices=[("c", "Create"), ("u", "Update"), ("d", "Delete")],
+                        max_length=1,
+                    ),
+                ),
+                ("data", models.JSONField(blank=True, null=True)),
+                ("changed_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        fields=["owner_id", "id"], name="appointment_change_owner_idx"
+                    )
+                ],
+            },
+        ),
+    ]
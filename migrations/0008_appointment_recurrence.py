@@ -0,0 +1,67 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("p_totschool_appointment_tracker", "0007_appointmentchange"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="appointment",
+            name="recurrence",
+            field=models.CharField(
+                blank=True,
+                help_text="Repeat rule, e.g. FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10",
+                max_length=250,
+            ),
+        ),
+        migrations.AddField(
+            model_name="appointment",
+            name="recurrence_end",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                condition=models.Q(("recurrence", ""), _negated=True),
+                fields=["created_by", "datetime", "recurrence_end"],
+                name="appointment_series_idx",
+            ),
+        ),
+        migrations.CreateModel(
+            name="AppointmentOccurrenceException",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("original_datetime", models.DateTimeField()),
+                ("cancelled", models.BooleanField(default=False)),
+                ("datetime", models.DateTimeField(blank=True, null=True)),
+                (
+                    "appointment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="occurrence_exceptions",
+                        to="p_totschool_appointment_tracker.appointment",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("appointment", "original_datetime"),
+                        name="appointment_occurrence_exception_unique",
+                    )
+                ],
+            },
+        ),
+    ]
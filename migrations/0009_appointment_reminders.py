@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Q
+from django.utils import timezone
+
+
+def schedule_upcoming_reminders(apps, schema_editor):
+    Appointment = apps.get_model("p_totschool_appointment_tracker", "Appointment")
+    lead = timedelta(minutes=getattr(settings, "APPOINTMENTS_REMINDER_LEAD_MINUTES", 60))
+    (
+        Appointment.objects.filter(datetime__gt=timezone.now(), recurrence="")
+        .exclude(Q(phone__isnull=True) | Q(phone=""))
+        .update(reminder_due_at=F("datetime") - lead)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("p_totschool_appointment_tracker", "0008_appointment_recurrence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="appointment",
+            name="reminder_due_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="appointment",
+            name="reminder_sent_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                condition=models.Q(("reminder_due_at__isnull", False)),
+                fields=["reminder_due_at"],
+                name="appointment_reminder_due_idx",
+            ),
+        ),
+        migrations.RunPython(schedule_upcoming_reminders, migrations.RunPython.noop),
+    ]
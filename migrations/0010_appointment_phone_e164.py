@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+def backfill_phone_e164(apps, schema_editor):
+    Appointment = apps.get_model("p_totschool_appointment_tracker", "Appointment")
+    batch = []
+    rows = (
+        Appointment.objects.exclude(phone__isnull=True)
+        .exclude(phone="")
+        .only("pk", "phone")
+        .iterator(chunk_size=1000)
+    )
+    for appointment in rows:
+        phone = appointment.phone
+        if phone and phone.is_valid():
+            appointment.phone_e164 = phone.as_e164
+            batch.append(appointment)
+        if len(batch) >= 1000:
+            Appointment.objects.bulk_update(batch, ["phone_e164"])
+            batch = []
+    Appointment.objects.bulk_update(batch, ["phone_e164"])
+    # Reminders need a number they can actually be sent to.
+    Appointment.objects.filter(phone_e164="").update(reminder_due_at=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("p_totschool_appointment_tracker", "0009_appointment_reminders"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="appointment",
+            name="phone_e164",
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+        migrations.RunPython(backfill_phone_e164, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["phone_e164", "-datetime"],
+                name="appointment_phone_recent_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,73 @@
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def move_letters(apps, schema_editor):
+    Appointment = apps.get_model("p_totschool_appointment_tracker", "Appointment")
+    AppointmentLetter = apps.get_model(
+        "p_totschool_appointment_tracker", "AppointmentLetter"
+    )
+    rows = (
+        Appointment.objects.exclude(generated_letter__isnull=True)
+        .values_list("pk", "generated_letter")
+        .iterator(chunk_size=500)
+    )
+    batch = []
+    for pk, text in rows:
+        batch.append(
+            AppointmentLetter(
+                appointment_id=pk, body=zlib.compress(text.encode(), 6), size=len(text)
+            )
+        )
+        if len(batch) >= 500:
+            AppointmentLetter.objects.bulk_create(batch)
+            batch = []
+    AppointmentLetter.objects.bulk_create(batch)
+
+
+def restore_letters(apps, schema_editor):
+    Appointment = apps.get_model("p_totschool_appointment_tracker", "Appointment")
+    AppointmentLetter = apps.get_model(
+        "p_totschool_appointment_tracker", "AppointmentLetter"
+    )
+    for pk, body in AppointmentLetter.objects.values_list(
+        "appointment_id", "body"
+    ).iterator(chunk_size=500):
+        Appointment.objects.filter(pk=pk).update(
+            generated_letter=zlib.decompress(bytes(body)).decode()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("p_totschool_appointment_tracker", "0010_appointment_phone_e164"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AppointmentLetter",
+            fields=[
+                (
+                    "appointment",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="letter",
+                        serialize=False,
+                        to="p_totschool_appointment_tracker.appointment",
+                    ),
+                ),
+                ("body", models.BinaryField()),
+                ("size", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(move_letters, restore_letters),
+        migrations.RemoveField(
+            model_name="appointment",
+            name="generated_letter",
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("p_totschool_appointment_tracker", "0012_appointment_datetime_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(fields=["name_normalized", "id"], name="appointment_sort_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(fields=["created_by", "name_normalized", "id"], name="appointment_user_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(fields=["location", "id"], name="appointment_sort_location_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(fields=["created_by", "location", "id"], name="appointment_user_location_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(fields=["phone_e164", "id"], name="appointment_sort_phone_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(fields=["created_by", "phone_e164", "id"], name="appointment_user_phone_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(fields=["created_at", "id"], name="appointment_sort_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(fields=["created_by", "created_at", "id"], name="appointment_user_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["created_by", "datetime", "id"],
+                name="appointment_user_datetime_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+import unicodedata
+
+from django.db import migrations, models
+
+
+def room_key_for(location):
+    value = unicodedata.normalize("NFKD", location or "")
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    value = " ".join(value.casefold().split())
+    return " ".join("".join(c if c.isalnum() else " " for c in value).split())
+
+
+def backfill_room_key(apps, schema_editor):
+    Appointment = apps.get_model("p_totschool_appointment_tracker", "Appointment")
+    locations = Appointment.objects.values_list("location", flat=True).distinct()
+    for location in locations.iterator():
+        Appointment.objects.filter(location=location).update(
+            room_key=room_key_for(location)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("p_totschool_appointment_tracker", "0013_appointment_sort_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="appointment",
+            name="room_key",
+            field=models.CharField(blank=True, editable=False, max_length=250),
+        ),
+        migrations.RunPython(backfill_room_key, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["room_key", "datetime"], name="appointment_room_idx"
+            ),
+        ),
+    ]
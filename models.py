@@ -1,8 +1,85 @@
-from django.db import models
+import unicodedata
+import zlib
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
 from django.urls import reverse
 from users.models import User
 from datetime import timedelta
-from phonenumber_field.modelfields import PhoneNumberField
+from .phones import LazyPhoneNumberField, display_phone, normalize_phone
+
+# Appointments are 30 minutes long, so two starts closer than this overlap.
+OVERLAP_WINDOW = timedelta(minutes=30)
+
+# Sort keys offered by the appointment table, mapped to the column they
+# order by. Each column has a (column, id) index for unscoped listings and
+# a (created_by, column, id) index for per-user listings.
+SORTABLE_FIELDS = {
+    "name": "name_normalized",
+    "location": "location",
+    "phone": "phone_e164",
+    "datetime": "datetime",
+    "created_at": "created_at",
+}
+DEFAULT_SORT = "-datetime"
+
+
+# Spaces that routinely host several appointments at once.
+DEFAULT_SHARED_ROOMS = ("Staff Room", "Main Hall", "Auditorium")
+
+
+def shared_rooms():
+    """Room keys that may hold several appointments at once (e.g. halls)."""
+    return {
+        room_key_for(room)
+        for room in getattr(settings, "APPOINTMENTS_SHARED_ROOMS", DEFAULT_SHARED_ROOMS)
+    }
+
+
+def normalize_text(value):
+    """Case- and accent-insensitive form of ``value`` with collapsed spaces."""
+    value = unicodedata.normalize("NFKD", value or "")
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    return " ".join(value.casefold().split())
+
+
+def is_admin(user):
+    """Whether ``user`` sees every user's appointments.
+
+    The answer is cached on the user object, which for ``request.user``
+    lives exactly as long as the request.
+    """
+    cached = getattr(user, "_appointments_is_admin", None)
+    if cached is None:
+        cached = bool(user.is_superuser or user.role in ["totschool_admin"])
+        user._appointments_is_admin = cached
+    return cached
+
+
+class AppointmentQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """Rows ``user`` may see: all for admins, otherwise their own.
+
+        The ``created_by`` filter comes first so every per-user query starts
+        from the ``created_by``-leading indexes.
+        """
+        if is_admin(user):
+            return self
+        return self.filter(created_by=user)
+
+
+class AppointmentChangeQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """Change-feed rows ``user`` may read."""
+        if is_admin(user):
+            return self
+        return self.filter(owner_id=user.pk)
+
+
+def room_key_for(location):
+    """Canonical room of a free-text location, e.g. ``admin block room 101``."""
+    value = normalize_text(location)
+    return " ".join("".join(c if c.isalnum() else " " for c in value).split())
 
 
 class Appointment(models.Model):
@@ -14,34 +91,403 @@ class Appointment(models.Model):
     name = models.CharField(max_length=250)
     location = models.TextField(max_length=250)
     datetime = models.DateTimeField()
-    phone = PhoneNumberField(blank=True, null=True)
+    phone = LazyPhoneNumberField(blank=True, null=True)
     remarks = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    name_normalized = models.CharField(max_length=250, blank=True, editable=False)
+    recurrence = models.CharField(
+        max_length=250,
+        blank=True,
+        help_text="Repeat rule, e.g. FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10",
+    )
+    recurrence_end = models.DateTimeField(null=True, blank=True, editable=False)
+    phone_e164 = models.CharField(max_length=20, blank=True, editable=False)
+    room_key = models.CharField(max_length=250, blank=True, editable=False)
+    reminder_due_at = models.DateTimeField(null=True, blank=True, editable=False)
+    reminder_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = AppointmentQuerySet.as_manager()
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values so write hooks can invalidate the slots
+        # an appointment is moving out of, not just the ones it moves into.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    @property
+    def phone_display(self):
+        """Formatted phone number, without parsing it for every loaded row."""
+        return display_phone(
+            self._meta.get_field("phone").raw_value(self),
+            self._meta.get_field("phone").region,
+        )
+
+    def get_letter(self):
+        """The generated letter text, loaded from its side table, or None."""
+        letter = AppointmentLetter.objects.filter(appointment_id=self.pk).first()
+        return letter.text if letter is not None else None
+
+    def set_letter(self, text):
+        """Store (or with None, remove) the generated letter for this appointment."""
+        if text is None:
+            AppointmentLetter.objects.filter(appointment_id=self.pk).delete()
+            return
+        AppointmentLetter.objects.update_or_create(
+            appointment_id=self.pk,
+            defaults={"body": AppointmentLetter.compress(text), "size": len(text)},
+        )
+
     def get_absolute_url(self):
         return reverse("appointments:detail", kwargs={"pk": self.pk})
 
 
     def get_overlapping_appointments(self):
-        """Return appointments that overlap with this one for the same user."""
+        """Return appointments that overlap with this one for the same user.
+
+        Recurring series are left out; see ``get_overlapping_occurrences``.
+        """
         if not self.created_by or not self.datetime:
             return Appointment.objects.none()
         return Appointment.objects.filter(
             created_by=self.created_by,
-            datetime__gte=self.datetime - timedelta(minutes=30),
-            datetime__lte=self.datetime + timedelta(minutes=30)
+            datetime__gte=self.datetime - OVERLAP_WINDOW,
+            datetime__lte=self.datetime + OVERLAP_WINDOW,
+            recurrence="",
         ).exclude(pk=self.pk)
 
     def has_overlaps(self):
         """Check if this appointment overlaps with any other."""
-        return self.get_overlapping_appointments().exists()
+        return self.get_overlapping_appointments().exists() or bool(
+            self.get_overlapping_occurrences()
+        )
+
+    def get_overlapping_occurrences(self, loaded=None):
+        """Occurrences of the user's recurring series overlapping this one.
+
+        ``loaded`` are already fetched rows that include every such series
+        master, with exceptions loaded for the window; by default the masters
+        are queried.
+        """
+        from .recurrence import expand_series, reaches_window, series_in_window
+
+        if not self.created_by_id or not self.datetime:
+            return []
+        window_start = self.datetime - OVERLAP_WINDOW
+        window_end = self.datetime + OVERLAP_WINDOW + timedelta(microseconds=1)
+        if loaded is None:
+            masters = series_in_window(
+                Appointment.objects.filter(created_by_id=self.created_by_id),
+                window_start,
+                window_end,
+            )
+        else:
+            masters = [
+                row
+                for row in loaded
+                if row.created_by_id == self.created_by_id
+                and reaches_window(row, window_start, window_end)
+            ]
+        return [
+            occurrence
+            for occurrence in expand_series(masters, window_start, window_end)
+            if not (occurrence.pk == self.pk and occurrence.datetime == self.datetime)
+        ]
+
+    def get_room_conflicts(self, loaded=None):
+        """Appointments of any user booked in the same room inside the window.
+
+        Starts strictly less than ``OVERLAP_WINDOW`` apart conflict, as in
+        ``overlaps.sweep_overlaps``; recurring series are expanded.
+        ``loaded`` are already fetched, datetime-ordered rows that include
+        every row and series master of the room that can conflict, with
+        exceptions loaded for the window; by default they are queried.
+        """
+        from .recurrence import (
+            expand_series,
+            merge_by_datetime,
+            reaches_window,
+            series_in_window,
+        )
+
+        room_key = room_key_for(self.location)
+        if not room_key or not self.datetime or room_key in shared_rooms():
+            return []
+        window_start = self.datetime - OVERLAP_WINDOW + timedelta(microseconds=1)
+        window_end = self.datetime + OVERLAP_WINDOW
+        if loaded is None:
+            in_room = Appointment.objects.select_related("created_by").filter(
+                room_key=room_key
+            )
+            concrete = (
+                in_room.filter(
+                    recurrence="", datetime__gte=window_start, datetime__lt=window_end
+                )
+                .exclude(pk=self.pk)
+                .order_by("datetime")
+            )
+            masters = series_in_window(in_room, window_start, window_end)
+        else:
+            in_room = [row for row in loaded if row.room_key == room_key]
+            concrete = [
+                row
+                for row in in_room
+                if not row.recurrence
+                and window_start <= row.datetime < window_end
+                and row.pk != self.pk
+            ]
+            masters = [
+                row for row in in_room if reaches_window(row, window_start, window_end)
+            ]
+        occurrences = [
+            occurrence
+            for occurrence in expand_series(masters, window_start, window_end)
+            if occurrence.pk != self.pk
+        ]
+        return merge_by_datetime(concrete, occurrences)
+
+    def clean(self):
+        from .recurrence import parse_rule
+
+        super().clean()
+        if self.recurrence:
+            try:
+                parse_rule(self.recurrence)
+            except ValueError as exc:
+                raise ValidationError({"recurrence": str(exc)})
+
+    def populate_derived_fields(self):
+        """Fill the denormalized lookup columns; bulk writes must call this."""
+        from .recurrence import last_occurrence, parse_rule
+        from .reminders import reminder_due
+
+        self.name_normalized = normalize_text(self.name)
+        self.room_key = room_key_for(self.location)
+        self.phone_e164 = normalize_phone(self.phone)
+        loaded = getattr(self, "_loaded_values", {})
+        if loaded.get("datetime", self.datetime) != self.datetime:
+            self.reminder_sent_at = None  # Rescheduled, so remind again.
+        self.reminder_due_at = reminder_due(self)
+        self.recurrence_end = None
+        if self.recurrence and self.datetime:
+            try:
+                self.recurrence_end = last_occurrence(
+                    self.datetime, parse_rule(self.recurrence)
+                )
+            except ValueError:
+                pass  # Reported by clean().
 
     class Meta:
         ordering = ["-datetime"]
+        indexes = [
+            models.Index(
+                fields=["name_normalized", "-datetime"],
+                name="appointment_name_recent_idx",
+            ),
+            # On PostgreSQL with a non-C collation a plain btree cannot serve
+            # LIKE 'prefix%'; this one backs the typeahead and admin search.
+            models.Index(
+                fields=["name_normalized"],
+                name="appointment_name_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            models.Index(
+                fields=["created_by", "datetime", "recurrence_end"],
+                name="appointment_series_idx",
+                condition=~models.Q(recurrence=""),
+            ),
+            models.Index(
+                fields=["datetime", "id"],
+                name="appointment_datetime_idx",
+            ),
+            models.Index(
+                fields=["phone_e164", "-datetime"],
+                name="appointment_phone_recent_idx",
+            ),
+            models.Index(
+                fields=["name_normalized", "id"],
+                name="appointment_sort_name_idx",
+            ),
+            models.Index(
+                fields=["created_by", "name_normalized", "id"],
+                name="appointment_user_name_idx",
+            ),
+            models.Index(
+                fields=["location", "id"],
+                name="appointment_sort_location_idx",
+            ),
+            models.Index(
+                fields=["created_by", "location", "id"],
+                name="appointment_user_location_idx",
+            ),
+            models.Index(
+                fields=["phone_e164", "id"],
+                name="appointment_sort_phone_idx",
+            ),
+            models.Index(
+                fields=["created_by", "phone_e164", "id"],
+                name="appointment_user_phone_idx",
+            ),
+            models.Index(
+                fields=["created_at", "id"],
+                name="appointment_sort_created_idx",
+            ),
+            models.Index(
+                fields=["created_by", "created_at", "id"],
+                name="appointment_user_created_idx",
+            ),
+            models.Index(
+                fields=["created_by", "datetime", "id"],
+                name="appointment_user_datetime_idx",
+            ),
+            models.Index(
+                fields=["room_key", "datetime"],
+                name="appointment_room_idx",
+            ),
+            models.Index(
+                fields=["reminder_due_at"],
+                name="appointment_reminder_due_idx",
+                condition=models.Q(reminder_due_at__isnull=False),
+            ),
+        ]
+
+    def change_record(self):
+        """Compact representation written to the change feed."""
+        return {
+            "name": self.name,
+            "location": self.location,
+            "datetime": self.datetime.isoformat() if self.datetime else None,
+            "phone": self.phone_display or None,
+            "remarks": self.remarks,
+            "recurrence": self.recurrence,
+            "created_by": self.created_by_id,
+        }
 
     def save(self, *args, **kwargs):
+        if getattr(self, "is_occurrence", False):
+            raise ValueError(
+                "Occurrences of a recurring appointment cannot be saved; "
+                "edit the series or add an AppointmentOccurrenceException."
+            )
+        self.populate_derived_fields()
         self.full_clean()
-        super().save(*args, **kwargs)
+        adding = self._state.adding
+        previous_owner = getattr(self, "_loaded_values", {}).get("created_by_id")
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+            AppointmentChange.objects.bulk_create(
+                AppointmentChange.for_save(self, adding, previous_owner)
+            )
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+
+class AppointmentChange(models.Model):
+    """Append-only change log of appointments, read by the delta-sync API.
+
+    Rows are written in the same transaction as the change they describe;
+    ``id`` doubles as the consumers' cursor. ``owner_id`` is the user whose
+    feed the row belongs to, so a reassignment writes a delete for the old
+    owner and an update for the new one.
+    """
+
+    CREATE = "c"
+    UPDATE = "u"
+    DELETE = "d"
+    OPERATIONS = [(CREATE, "Create"), (UPDATE, "Update"), (DELETE, "Delete")]
+
+    id = models.BigAutoField(primary_key=True)
+    appointment_id = models.BigIntegerField()
+    owner_id = models.BigIntegerField()
+    operation = models.CharField(max_length=1, choices=OPERATIONS)
+    data = models.JSONField(null=True, blank=True)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    objects = AppointmentChangeQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["owner_id", "id"], name="appointment_change_owner_idx"),
+        ]
+
+    @classmethod
+    def for_save(cls, appointment, adding, previous_owner=None):
+        changes = []
+        if previous_owner is not None and previous_owner != appointment.created_by_id:
+            changes.append(cls.for_delete(appointment, owner_id=previous_owner))
+        changes.append(
+            cls(
+                appointment_id=appointment.pk,
+                owner_id=appointment.created_by_id,
+                operation=cls.CREATE if adding else cls.UPDATE,
+                data=appointment.change_record(),
+            )
+        )
+        return changes
+
+    @classmethod
+    def for_delete(cls, appointment, owner_id=None):
+        return cls(
+            appointment_id=appointment.pk,
+            owner_id=owner_id if owner_id is not None else appointment.created_by_id,
+            operation=cls.DELETE,
+        )
+
+
+class AppointmentOccurrenceException(models.Model):
+    """A cancelled or moved occurrence of a recurring appointment.
+
+    Only occurrences that differ from the rule are stored; everything else
+    is generated from the series master.
+    """
+
+    appointment = models.ForeignKey(
+        Appointment,
+        on_delete=models.CASCADE,
+        related_name="occurrence_exceptions",
+    )
+    original_datetime = models.DateTimeField()
+    cancelled = models.BooleanField(default=False)
+    datetime = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["appointment", "original_datetime"],
+                name="appointment_occurrence_exception_unique",
+            ),
+        ]
+
+
+class AppointmentLetter(models.Model):
+    """Generated letter for an appointment, kept out of the hot appointment row.
+
+    Bodies are zlib-compressed and only read when a letter is asked for, so
+    list, overlap and timeline scans never carry them.
+    """
+
+    appointment = models.OneToOneField(
+        Appointment,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="letter",
+    )
+    body = models.BinaryField()
+    size = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @staticmethod
+    def compress(text):
+        return zlib.compress(text.encode(), 6)
+
+    @property
+    def text(self):
+        return zlib.decompress(bytes(self.body)).decode()
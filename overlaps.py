@@ -0,0 +1,27 @@
+"""Single-pass overlap detection over appointments ordered by group and time."""
+
+from collections import deque
+
+from .models import OVERLAP_WINDOW
+
+
+def sweep_overlaps(rows, window=OVERLAP_WINDOW):
+    """Yield ``(pk, other_pk)`` for every overlapping pair in ``rows``.
+
+    ``rows`` are ``(group, datetime, pk)`` tuples sorted by group then
+    datetime, e.g. straight from ``values_list(...).order_by(...)``. Two
+    appointments in the same group overlap when their starts are less than
+    ``window`` apart. Only the rows still inside the window are kept, so the
+    scan is linear in the number of rows plus the number of pairs.
+    """
+    active = deque()
+    current_group = object()
+    for group, dt, pk in rows:
+        if group != current_group:
+            active.clear()
+            current_group = group
+        while active and dt - active[0][0] >= window:
+            active.popleft()
+        for _, other_pk in active:
+            yield other_pk, pk
+        active.append((dt, pk))
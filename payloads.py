@@ -0,0 +1,119 @@
+"""Compact, columnar encoding of timeline chart data."""
+
+import gzip
+import json
+
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from users.models import User
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+APPOINTMENT_DURATION_MS = 30 * 60 * 1000
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+
+def detail_url_template():
+    url = reverse("appointments:detail", kwargs={"pk": 0})
+    head, _, tail = url.rpartition("/0/")
+    return f"{head}/{{pk}}/{tail}"
+
+
+class _Dictionary:
+    """Assigns small integer codes to repeated values."""
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def columnar_timeline(queryset):
+    """Encode a chart queryset as parallel arrays with dictionary-encoded text.
+
+    Only the needed columns are fetched, so no model instances are built.
+    A list of appointments (e.g. a window with recurring occurrences merged
+    in) is encoded from its instances instead. User labels are resolved with
+    one extra query over the distinct users.
+    """
+    if isinstance(queryset, list):
+        rows = [
+            (appt.pk, appt.datetime, appt.created_by_id, appt.name, appt.location)
+            for appt in queryset
+        ]
+    else:
+        rows = queryset.values_list(
+            "pk", "datetime", "created_by_id", "name", "location"
+        )
+
+    pks, starts, user_ids, names, locations = [], [], [], [], []
+    name_dict, location_dict, user_dict = _Dictionary(), _Dictionary(), _Dictionary()
+    for pk, dt, user_id, name, location in rows:
+        pks.append(pk)
+        starts.append(int(dt.timestamp() * 1000))
+        user_ids.append(user_dict.encode(user_id))
+        names.append(name_dict.encode(name))
+        locations.append(location_dict.encode(location))
+
+    users = User.objects.in_bulk(user_dict.values)
+    user_labels = [
+        str(users[user_id]) if user_id in users else "Unknown"
+        for user_id in user_dict.values
+    ]
+
+    return {
+        "format": "columnar",
+        "version": 1,
+        "duration": APPOINTMENT_DURATION_MS,
+        "url_template": detail_url_template(),
+        "users": user_labels,
+        "names": name_dict.values,
+        "locations": location_dict.values,
+        "pk": pks,
+        "start": starts,
+        "user": user_ids,
+        "name": names,
+        "location": locations,
+    }
+
+
+def encode_payload(request, payload):
+    """Serialize ``payload`` for the client, compressing when accepted.
+
+    MessagePack is used when requested and installed, JSON otherwise. The
+    body is brotli- or gzip-compressed according to ``Accept-Encoding``.
+    """
+    if msgpack is not None and MSGPACK_CONTENT_TYPE in request.headers.get("Accept", ""):
+        body = msgpack.packb(payload)
+        content_type = MSGPACK_CONTENT_TYPE
+    else:
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        content_type = "application/json"
+
+    response = HttpResponse(content_type=content_type)
+    accept_encoding = request.headers.get("Accept-Encoding", "")
+    if brotli is not None and "br" in accept_encoding:
+        body = brotli.compress(body)
+        response["Content-Encoding"] = "br"
+    elif "gzip" in accept_encoding:
+        body = gzip.compress(body, compresslevel=6)
+        response["Content-Encoding"] = "gzip"
+
+    response.content = body
+    patch_vary_headers(response, ["Accept", "Accept-Encoding"])
+    return response
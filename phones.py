@@ -0,0 +1,90 @@
+"""Phone numbers that are only parsed when they are actually used.
+
+``PhoneNumberField`` turns every loaded value into a ``PhoneNumber``, which
+means a full libphonenumber parse per row even on pages that only print
+the number. ``LazyPhoneNumberField`` keeps the stored string until the
+attribute is read, and parsing and display formatting are memoized per
+process, since the same few numbers repeat across many rows.
+"""
+
+import copy
+from functools import lru_cache
+
+from django.conf import settings
+from phonenumber_field.modelfields import PhoneNumberField
+from phonenumber_field.phonenumber import PhoneNumber, to_python
+
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse(value, region):
+    return to_python(value, region=region)
+
+
+def parse_phone(value, region=None):
+    """``PhoneNumber`` for a stored string; a copy, as instances are mutable."""
+    return copy.copy(_parse(value, region))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _display(value, region):
+    return str(_parse(value, region))
+
+
+def display_phone(value, region=None):
+    """The display form of a stored string or ``PhoneNumber``, or ``""``."""
+    if not value:
+        return ""
+    if isinstance(value, PhoneNumber):
+        return str(value)
+    return _display(value, region)
+
+
+def normalize_phone(value, region=None):
+    """E.164 key for ``value`` (e.g. ``+919876543210``), or ``""`` if invalid."""
+    if not value:
+        return ""
+    if not isinstance(value, PhoneNumber):
+        value = _parse(str(value), region or getattr(settings, "PHONENUMBER_DEFAULT_REGION", None))
+    if not isinstance(value, PhoneNumber) or not value.is_valid():
+        return ""
+    return value.as_e164
+
+
+class LazyPhoneNumberDescriptor:
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__.get(self.field.attname)
+        if isinstance(value, str) and value:
+            value = parse_phone(value, self.field.region)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        # Raw strings (as loaded from the database) stay unparsed until read.
+        if value is not None and not isinstance(value, (str, PhoneNumber)):
+            value = to_python(value, region=self.field.region)
+        instance.__dict__[self.field.attname] = value
+
+
+class LazyPhoneNumberField(PhoneNumberField):
+    """``PhoneNumberField`` that parses values on first access."""
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super().contribute_to_class(cls, name, *args, **kwargs)
+        setattr(cls, self.attname, LazyPhoneNumberDescriptor(self))
+
+    def deconstruct(self):
+        # Same column and behaviour as the parent, so migrations keep
+        # referring to PhoneNumberField.
+        name, _, args, kwargs = super().deconstruct()
+        return name, "phonenumber_field.modelfields.PhoneNumberField", args, kwargs
+
+    def raw_value(self, instance):
+        """The stored value without parsing it."""
+        return instance.__dict__.get(self.attname)
@@ -0,0 +1,401 @@
+"""Recurring appointments: an RRULE subset with lazy, window-bounded expansion.
+
+A recurring appointment is stored once, as a series master whose
+``datetime`` is the first occurrence and whose ``recurrence`` holds the
+rule. Occurrences are never stored; they are generated on demand and only
+inside the window a view is showing. Cancelled or moved occurrences are
+stored sparsely as ``AppointmentOccurrenceException`` rows.
+
+Supported rule parts: ``FREQ`` (DAILY, WEEKLY, MONTHLY), ``INTERVAL``,
+``COUNT``, ``UNTIL`` and, for weekly rules, ``BYDAY``.
+"""
+
+import copy
+import heapq
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Prefetch, Q, prefetch_related_objects
+from django.utils import timezone
+
+from .models import OVERLAP_WINDOW
+from .overlaps import sweep_overlaps
+
+DAILY, WEEKLY, MONTHLY = "DAILY", "WEEKLY", "MONTHLY"
+WEEKDAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+
+@dataclass(frozen=True)
+class Rule:
+    freq: str
+    interval: int = 1
+    count: int = None
+    until: datetime = None
+    byday: tuple = ()
+
+
+def parse_rule(value):
+    """Parse an RRULE string such as ``FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10``."""
+    parts = {}
+    for part in (value or "").upper().removeprefix("RRULE:").split(";"):
+        if not part:
+            continue
+        key, sep, val = part.partition("=")
+        if not sep or key in parts:
+            raise ValueError(f"Malformed rule part {part!r}")
+        parts[key] = val
+
+    freq = parts.pop("FREQ", None)
+    if freq not in (DAILY, WEEKLY, MONTHLY):
+        raise ValueError("FREQ must be DAILY, WEEKLY or MONTHLY")
+
+    interval = int(parts.pop("INTERVAL", 1))
+    count = parts.pop("COUNT", None)
+    count = int(count) if count is not None else None
+    until = parts.pop("UNTIL", None)
+    if until is not None:
+        until = _parse_until(until)
+    byday = parts.pop("BYDAY", None)
+    if byday is not None:
+        if freq != WEEKLY:
+            raise ValueError("BYDAY is only supported for WEEKLY rules")
+        try:
+            byday = tuple(sorted({WEEKDAYS.index(day) for day in byday.split(",")}))
+        except ValueError:
+            raise ValueError(f"Unknown weekday in BYDAY={byday}") from None
+    if parts:
+        raise ValueError(f"Unsupported rule parts: {', '.join(sorted(parts))}")
+    if interval < 1 or (count is not None and count < 1):
+        raise ValueError("INTERVAL and COUNT must be positive")
+    if count is not None and until is not None:
+        raise ValueError("COUNT and UNTIL cannot be combined")
+
+    return Rule(freq, interval, count, until, byday or ())
+
+
+def _parse_until(value):
+    for fmt in ("%Y%m%dT%H%M%SZ", "%Y%m%dT%H%M%S", "%Y%m%d"):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if fmt.endswith("Z"):
+            return parsed.replace(tzinfo=dt_timezone.utc)
+        if fmt == "%Y%m%d":
+            parsed = parsed.replace(hour=23, minute=59, second=59)
+        return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+    raise ValueError(f"Invalid UNTIL={value}")
+
+
+def _local(dt):
+    """Naive local wall time; rules repeat in wall time across DST changes."""
+    return timezone.make_naive(dt) if timezone.is_aware(dt) else dt
+
+
+def _period(rule, start, index):
+    """``(period_start, occurrences)`` of the ``index``-th rule period."""
+    if rule.freq == DAILY:
+        occurrence = start + timedelta(days=index * rule.interval)
+        return occurrence, [occurrence]
+    if rule.freq == WEEKLY:
+        week = start - timedelta(days=start.weekday()) + timedelta(weeks=index * rule.interval)
+        days = rule.byday or (start.weekday(),)
+        return week, [week + timedelta(days=day) for day in days if week + timedelta(days=day) >= start]
+    months = start.month - 1 + index * rule.interval
+    year, month = start.year + months // 12, months % 12 + 1
+    try:
+        occurrence = start.replace(year=year, month=month)
+    except ValueError:
+        # Months without this day (e.g. the 31st) are skipped.
+        return start.replace(year=year, month=month, day=1), []
+    return occurrence, [occurrence]
+
+
+def _first_period(rule, start, window_start):
+    """Index of the first period that can reach ``window_start``, with the
+    number of occurrences in the periods before it (for COUNT)."""
+    if window_start <= start or rule.freq == MONTHLY:
+        return 0, 0
+    if rule.freq == DAILY:
+        index = (window_start - start).days // rule.interval
+        return index, index
+    week = start - timedelta(days=start.weekday())
+    index = (window_start - week).days // (7 * rule.interval)
+    if index == 0:
+        return 0, 0
+    per_period = len(rule.byday or (start.weekday(),))
+    return index, len(_period(rule, start, 0)[1]) + (index - 1) * per_period
+
+
+def occurrences_between(start, rule, window_start, window_end):
+    """Aware occurrence datetimes of a series in ``[window_start, window_end)``."""
+    local_start = _local(start)
+    low, high = _local(window_start), _local(window_end)
+    until = _local(rule.until) if rule.until is not None else None
+
+    index, emitted = _first_period(rule, local_start, low)
+    while True:
+        period_start, occurrences = _period(rule, local_start, index)
+        if period_start >= high:
+            return
+        for occurrence in occurrences:
+            if rule.count is not None and emitted >= rule.count:
+                return
+            if (until is not None and occurrence > until) or occurrence >= high:
+                return
+            emitted += 1
+            if occurrence >= low:
+                yield timezone.make_aware(occurrence) if timezone.is_aware(start) else occurrence
+        index += 1
+
+
+def last_occurrence(start, rule):
+    """Datetime of the final occurrence, or None for open-ended series."""
+    if rule.count is None and rule.until is None:
+        return None
+    end = rule.until or start + timedelta(days=rule.count * rule.interval * 62)
+    last = None
+    for last in occurrences_between(start, rule, start, end + timedelta(seconds=1)):
+        pass
+    return last or start
+
+
+def make_occurrence(master, dt, original=None):
+    """An unsaved copy of ``master`` standing in for one occurrence."""
+    occurrence = copy.copy(master)
+    occurrence.datetime = dt
+    occurrence.is_occurrence = True
+    occurrence.original_datetime = original or dt
+    return occurrence
+
+
+def series_filter(window_start, window_end):
+    """Filter matching the series masters that may recur in the window."""
+    return (
+        ~Q(recurrence="")
+        & Q(datetime__lt=window_end)
+        & (Q(recurrence_end__isnull=True) | Q(recurrence_end__gte=window_start))
+    )
+
+
+def reaches_window(appointment, window_start, window_end):
+    """Whether a loaded ``appointment`` is matched by ``series_filter``."""
+    return (
+        bool(appointment.recurrence)
+        and appointment.datetime < window_end
+        and (
+            appointment.recurrence_end is None
+            or appointment.recurrence_end >= window_start
+        )
+    )
+
+
+def window_exceptions(window_start, window_end):
+    """Prefetch of the exceptions relevant to the window, as ``window_exceptions``."""
+    from .models import AppointmentOccurrenceException
+
+    return Prefetch(
+        "occurrence_exceptions",
+        queryset=AppointmentOccurrenceException.objects.filter(
+            Q(original_datetime__gte=window_start, original_datetime__lt=window_end)
+            | Q(datetime__gte=window_start, datetime__lt=window_end)
+        ),
+        to_attr="window_exceptions",
+    )
+
+
+def series_in_window(queryset, window_start, window_end):
+    """Series masters in ``queryset`` that may have occurrences in the window,
+    with the exceptions relevant to that window prefetched."""
+    return queryset.filter(series_filter(window_start, window_end)).prefetch_related(
+        window_exceptions(window_start, window_end)
+    )
+
+
+def split_series(appointments):
+    """``(rows, masters)``: concrete rows and series masters, order kept."""
+    rows, masters = [], []
+    for appointment in appointments:
+        (masters if appointment.recurrence else rows).append(appointment)
+    return rows, masters
+
+
+def load_exceptions(masters, window_start, window_end):
+    """Load the window's exceptions onto already fetched ``masters``.
+
+    Runs one query, or none without masters.
+    """
+    if masters:
+        prefetch_related_objects(masters, window_exceptions(window_start, window_end))
+
+
+def expand_series(masters, window_start, window_end):
+    """Occurrences of the series ``masters`` inside the window, by datetime.
+
+    ``masters`` must come from ``series_in_window``, or have been passed to
+    ``load_exceptions`` for a window covering this one, so their exceptions
+    are already loaded.
+    """
+    occurrences = []
+    for master in masters:
+        exceptions = getattr(master, "window_exceptions", [])
+        replaced = {exception.original_datetime for exception in exceptions}
+        for dt in occurrences_between(
+            master.datetime, parse_rule(master.recurrence), window_start, window_end
+        ):
+            if dt not in replaced:
+                occurrences.append(make_occurrence(master, dt))
+        for exception in exceptions:
+            moved = exception.datetime
+            if not exception.cancelled and moved and window_start <= moved < window_end:
+                occurrences.append(
+                    make_occurrence(master, moved, exception.original_datetime)
+                )
+    occurrences.sort(key=lambda occurrence: occurrence.datetime)
+    return occurrences
+
+
+def merge_by_datetime(*sequences):
+    """Merge already datetime-ordered sequences of appointments."""
+    return list(heapq.merge(*sequences, key=lambda appointment: appointment.datetime))
+
+
+def day_window(value):
+    """Aware ``(start, end)`` bounds of a local day given as ``YYYY-MM-DD``."""
+    day = date.fromisoformat(value) if isinstance(value, str) else value
+    start = datetime.combine(day, time.min)
+    end = datetime.combine(day + timedelta(days=1), time.min)
+    if settings.USE_TZ:
+        return timezone.make_aware(start), timezone.make_aware(end)
+    return start, end
+
+
+def conflict_candidates(queryset, window_start, window_end):
+    """Rows and series masters in ``queryset`` that may conflict with
+    something in the window, fetched in one query; see ``conflict_keys``.
+
+    ``queryset`` should only be scoped, not filtered further, so neighbours
+    hidden by other filters still count.
+    """
+    low, high = window_start - OVERLAP_WINDOW, window_end + OVERLAP_WINDOW
+    return split_series(
+        queryset.filter(
+            Q(recurrence="", datetime__gte=low, datetime__lt=high)
+            | series_filter(low, high)
+        )
+        .only("created_by", "datetime", "recurrence", "room_key")
+        .order_by()
+    )
+
+
+def conflict_keys(candidates, window_start, window_end, group="created_by_id"):
+    """``(pk, datetime)`` keys of the ``conflict_candidates`` rows and
+    occurrences that conflict with another one in the same ``group`` (user or
+    ``room_key``). Empty groups never conflict.
+
+    The masters' exceptions must be loaded for the window widened by
+    ``OVERLAP_WINDOW`` on each side.
+    """
+    rows, masters = candidates
+    low, high = window_start - OVERLAP_WINDOW, window_end + OVERLAP_WINDOW
+    entries = sorted(
+        (
+            (getattr(appointment, group), appointment.datetime, appointment.pk)
+            for appointment in rows + expand_series(masters, low, high)
+            if getattr(appointment, group)
+        ),
+        key=lambda entry: (entry[0], entry[1]),
+    )
+
+    keys = set()
+    for key, other in sweep_overlaps((key, dt, (pk, dt)) for key, dt, pk in entries):
+        keys.update((key, other))
+    return keys
+
+
+class OccurrenceWindowMixin:
+    """Adds the recurring series of a filtered queryset to a windowed view.
+
+    ``window_queryset`` restricts a filtered queryset to the concrete rows in
+    the window plus the series masters that may recur there, so one query
+    loads both; ``with_occurrences`` then replaces the masters by their
+    occurrences. The ``overlapping`` and ``room_conflicts`` filters are
+    applied to rows and occurrences alike with one query and sweep each.
+    """
+
+    occurrence_window = None
+
+    def window_queryset(
+        self, queryset, window_start, window_end, overlapping=False, room_conflicts=False
+    ):
+        self.occurrence_window = (window_start, window_end, overlapping, room_conflicts)
+        return queryset.filter(
+            Q(recurrence="", datetime__gte=window_start, datetime__lt=window_end)
+            | series_filter(window_start, window_end)
+        )
+
+    def get_scope_queryset(self):
+        raise NotImplementedError
+
+    def get_window_allowance(self):
+        """Queries a windowed request may run on top of an unwindowed one.
+
+        One for the exceptions of the series in the window, plus one per
+        conflict filter for its candidates. The allowance depends only on the
+        request, never on what the window turned out to hold.
+        """
+        if self.occurrence_window is None:
+            return 0
+        _, _, overlapping, room_conflicts = self.occurrence_window
+        return 1 + int(overlapping) + int(room_conflicts)
+
+    def with_occurrences(self, appointments):
+        """Expand the series masters among datetime-ordered ``appointments``
+        into the window's occurrences, merged in order."""
+        from .models import Appointment, shared_rooms
+
+        if self.occurrence_window is None:
+            return list(appointments)
+        window_start, window_end, overlapping, room_conflicts = self.occurrence_window
+        rows, masters = split_series(appointments)
+
+        sweeps = []
+        if overlapping:
+            sweeps.append(
+                (
+                    "created_by_id",
+                    conflict_candidates(
+                        self.get_scope_queryset(), window_start, window_end
+                    ),
+                )
+            )
+        if room_conflicts:
+            # Rooms are shared by everyone, so every user's bookings count.
+            sweeps.append(
+                (
+                    "room_key",
+                    conflict_candidates(
+                        Appointment.objects.exclude(room_key__in=shared_rooms()),
+                        window_start,
+                        window_end,
+                    ),
+                )
+            )
+        # The exceptions of every series involved load in one query, for the
+        # widest window any of them is expanded in.
+        all_masters = masters + [master for _, (_, more) in sweeps for master in more]
+        load_exceptions(
+            all_masters, window_start - OVERLAP_WINDOW, window_end + OVERLAP_WINDOW
+        )
+
+        items = merge_by_datetime(rows, expand_series(masters, window_start, window_end))
+        for group, candidates in sweeps:
+            keys = conflict_keys(candidates, window_start, window_end, group=group)
+            items = [item for item in items if (item.pk, item.datetime) in keys]
+        return items
+
+    async def awith_occurrences(self, appointments):
+        from asgiref.sync import sync_to_async
+
+        return await sync_to_async(self.with_occurrences)(appointments)
@@ -0,0 +1,296 @@
+"""Appointment reminders: an indexed due-time scan feeding an in-memory heap.
+
+Every appointment with a valid phone number carries ``reminder_due_at``, which
+is set on save and cleared once the reminder is sent. The worker keeps the
+reminders due before its *horizon* in a min-heap. It sleeps until the
+earliest one, and refills with a bounded range query on the partial due-time
+index when the horizon passes. It never polls the whole table.
+
+The worker usually runs in its own process (``run_reminders``). Writes in
+any process bump a ``reminders`` cache generation through ``notify`` and
+``wake``. The worker checks it at least every
+``APPOINTMENTS_REMINDER_POLL_SECONDS`` and refills when it changed, so a
+short-notice booking is picked up within that interval rather than one
+lookahead later. This needs a cache shared by the processes (Redis,
+Memcached, database); with a per-process cache such as ``LocMemCache`` the
+worker never sees the bumps and only refills once per lookahead, which
+``run_reminders`` warns about. A heap entry is only a hint: before sending,
+the due time is re-checked under a row lock, so moved and deleted
+appointments are dropped lazily, and reminders for appointments that have
+already started are cleared instead of sent.
+"""
+
+import heapq
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .caching import bump_generation, get_generation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRANSPORT = "p_totschool_appointment_tracker.reminders.LocalTransport"
+
+# Cache backends whose entries other processes cannot see.
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def reminder_lead():
+    return timedelta(minutes=getattr(settings, "APPOINTMENTS_REMINDER_LEAD_MINUTES", 60))
+
+
+def reminder_due(appointment, now=None):
+    """When ``appointment``'s reminder should go out, or None for no reminder.
+
+    Recurring series are not reminded; their occurrences are never stored.
+    """
+    if (
+        appointment.reminder_sent_at is not None
+        or not appointment.phone_e164
+        or not appointment.datetime
+        or appointment.recurrence
+        or appointment.datetime <= (now or timezone.now())
+    ):
+        return None
+    return appointment.datetime - reminder_lead()
+
+
+def shifted_due(delta, now=None):
+    """``reminder_due_at`` expression for rows whose datetime moves by ``delta``.
+
+    Used by set-based updates that bypass ``save()``; mirrors ``reminder_due``
+    for a rescheduled, not yet reminded appointment.
+    """
+    now = now or timezone.now()
+    return Case(
+        When(
+            Q(phone_e164="") | ~Q(recurrence="")
+            | Q(datetime__lte=now - delta),
+            then=Value(None),
+        ),
+        default=F("datetime") + delta - reminder_lead(),
+    )
+
+
+def reminder_payload(appointment):
+    when = timezone.localtime(appointment.datetime) if timezone.is_aware(
+        appointment.datetime
+    ) else appointment.datetime
+    return {
+        "pk": appointment.pk,
+        "to": appointment.phone_e164,
+        "name": appointment.name,
+        "location": appointment.location,
+        "datetime": appointment.datetime.isoformat(),
+        "message": f"Reminder: {appointment.name} at {when:%H:%M on %d %b}, "
+        f"{appointment.location}",
+    }
+
+
+class BaseTransport:
+    """Interface for reminder transports (SMS gateway, e-mail, ...).
+
+    ``send_batch`` receives a list of ``reminder_payload`` dicts and returns
+    the pks that were delivered; the rest stay due and are retried.
+    """
+
+    def send_batch(self, reminders):
+        raise NotImplementedError
+
+
+class LocalTransport(BaseTransport):
+    """Logs reminders and keeps them in ``sent`` instead of delivering them."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_batch(self, reminders):
+        for reminder in reminders:
+            logger.info("Reminder to %s: %s", reminder["to"], reminder["message"])
+        self.sent.extend(reminders)
+        return [reminder["pk"] for reminder in reminders]
+
+
+def cache_is_shared():
+    """Whether generation bumps made in one process reach the others."""
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    return backend not in PROCESS_LOCAL_CACHES
+
+
+def get_transport():
+    path = getattr(settings, "APPOINTMENTS_REMINDER_TRANSPORT", DEFAULT_TRANSPORT)
+    return import_string(path)()
+
+
+class ReminderScheduler:
+    def __init__(self, transport=None, batch_size=None, refill_size=None, lookahead=None):
+        self.transport = transport or get_transport()
+        self.batch_size = batch_size or getattr(
+            settings, "APPOINTMENTS_REMINDER_BATCH_SIZE", 100
+        )
+        self.refill_size = refill_size or getattr(
+            settings, "APPOINTMENTS_REMINDER_REFILL_SIZE", 1000
+        )
+        self.lookahead = lookahead or timedelta(
+            seconds=getattr(settings, "APPOINTMENTS_REMINDER_LOOKAHEAD_SECONDS", 900)
+        )
+        self.poll_interval = getattr(settings, "APPOINTMENTS_REMINDER_POLL_SECONDS", 10)
+        # Reminder generation the heap was filled at; writes elsewhere bump it.
+        self._generation = None
+        self._heap = []
+        # The heap holds every reminder due before the horizon; None until
+        # the first refill.
+        self._horizon = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+    def notify(self, pk, due):
+        """Schedule ``pk`` for ``due`` (None when it no longer needs one)."""
+        with self._lock:
+            if due is not None and self._horizon is not None and due < self._horizon:
+                heapq.heappush(self._heap, (due, pk))
+        self._wakeup.set()
+
+    def invalidate(self):
+        """Rebuild the heap from the database on the next run."""
+        with self._lock:
+            self._horizon = None
+        self._wakeup.set()
+
+    def refill(self, now):
+        from .models import Appointment
+
+        horizon = now + self.lookahead
+        generation = get_generation("reminders")
+        rows = list(
+            Appointment.objects.filter(
+                reminder_due_at__isnull=False, reminder_due_at__lt=horizon
+            )
+            .order_by("reminder_due_at", "pk")
+            .values_list("reminder_due_at", "pk")[: self.refill_size]
+        )
+        if len(rows) == self.refill_size:
+            # Truncated: the heap is only complete before the last due time.
+            horizon = rows[-1][0]
+            rows = [row for row in rows if row[0] < horizon] or rows
+        with self._lock:
+            self._heap = rows
+            heapq.heapify(self._heap)
+            self._horizon = horizon
+            self._generation = generation
+
+    def pop_due(self, now):
+        pks = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                pks.append(heapq.heappop(self._heap)[1])
+        return list(dict.fromkeys(pks))
+
+    def run_pending(self, now=None):
+        """Send every reminder due by ``now``; returns how many were sent."""
+        now = now or timezone.now()
+        if (
+            self._horizon is None
+            or now >= self._horizon
+            or get_generation("reminders") != self._generation
+        ):
+            self.refill(now)
+        pks = self.pop_due(now)
+        sent = 0
+        for start in range(0, len(pks), self.batch_size):
+            sent += self.send(pks[start : start + self.batch_size], now)
+        return sent
+
+    def send(self, pks, now):
+        from .models import Appointment
+
+        with transaction.atomic():
+            due = Appointment.objects.filter(pk__in=pks, reminder_due_at__lte=now)
+            # Appointments that started while their reminder waited (a worker
+            # outage, a backlog) are past reminding; drop them from the index.
+            due.filter(datetime__lte=now).update(reminder_due_at=None)
+            appointments = list(
+                due.select_for_update(skip_locked=True)
+                .filter(datetime__gt=now)
+                .only("pk", "name", "location", "datetime", "phone_e164")
+            )
+            if not appointments:
+                return 0
+            delivered = list(
+                self.transport.send_batch([reminder_payload(a) for a in appointments])
+            )
+            Appointment.objects.filter(pk__in=delivered).update(
+                reminder_due_at=None, reminder_sent_at=now
+            )
+        return len(delivered)
+
+    def seconds_until_next(self, now):
+        with self._lock:
+            candidates = [self._horizon] if self._horizon is not None else [now]
+            if self._heap:
+                candidates.append(self._heap[0][0])
+        # Wake at least every poll interval to notice writes from other processes.
+        return min(max((min(candidates) - now).total_seconds(), 0), self.poll_interval)
+
+    def run_forever(self):
+        while not self._stopped.is_set():
+            self._wakeup.clear()
+            try:
+                self.run_pending()
+            except Exception:
+                logger.exception("Sending appointment reminders failed")
+                self.invalidate()
+                self._stopped.wait(5)
+                continue
+            self._wakeup.wait(self.seconds_until_next(timezone.now()))
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+
+_scheduler = None
+
+
+def start(**kwargs):
+    """Run a scheduler in a daemon thread of this process and return it."""
+    global _scheduler
+    _scheduler = ReminderScheduler(**kwargs)
+    threading.Thread(
+        target=_scheduler.run_forever, name="appointment-reminders", daemon=True
+    ).start()
+    return _scheduler
+
+
+def set_scheduler(scheduler):
+    global _scheduler
+    _scheduler = scheduler
+
+
+def notify(pk, due):
+    """Tell the schedulers about a changed reminder.
+
+    This process's scheduler, if any, gets it directly; a worker in another
+    process refills when it sees the bumped generation.
+    """
+    if _scheduler is not None:
+        _scheduler.notify(pk, due)
+    if due is not None:
+        bump_generation("reminders")
+
+
+def wake():
+    """Make every scheduler refill after a set-based write."""
+    if _scheduler is not None:
+        _scheduler.invalidate()
+    bump_generation("reminders")
@@ -0,0 +1,232 @@
+"""Vectorized utilization and conflict reports over a date range.
+
+Everything is computed from three NumPy columns, user, room and start
+time, which one projected query fetches. No model instances are built for
+concrete rows; only the few recurring series are expanded, in memory.
+Occupancy and overlaps come from one sort plus ``diff`` per grouping, and
+the histograms from ``bincount``.
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import OVERLAP_WINDOW, shared_rooms
+from .recurrence import expand_series, series_in_window
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+DURATION = int(OVERLAP_WINDOW.total_seconds())  # Appointments last 30 minutes.
+WEEK = 7 * 24 * 3600
+OFFSET_STEP = 900  # UTC offsets only change on quarter hours.
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def school_year(today=None):
+    """``(start, end)`` dates of the school year containing ``today``."""
+    today = today or timezone.localdate()
+    month = getattr(settings, "APPOINTMENTS_SCHOOL_YEAR_START_MONTH", 6)
+    year = today.year if today.month >= month else today.year - 1
+    return date(year, month, 1), date(year + 1, month, 1)
+
+
+def available_seconds_per_week():
+    start, end = getattr(settings, "APPOINTMENTS_WORKING_HOURS", (8, 17))
+    days = getattr(settings, "APPOINTMENTS_WORKING_DAYS", 5)
+    return (end - start) * 3600 * days
+
+
+def utc_offsets(utc):
+    """UTC offsets, in seconds, of the current time zone at epoch seconds ``utc``.
+
+    Offsets only change on quarter hours, so each distinct quarter hour is
+    converted once and the result spread back over the rows.
+    """
+    if not settings.USE_TZ or not utc.size:
+        return np.zeros_like(utc)
+    steps, inverse = np.unique(utc // OFFSET_STEP, return_inverse=True)
+    zone = timezone.get_current_timezone()
+    offsets = np.fromiter(
+        (
+            datetime.fromtimestamp(int(step) * OFFSET_STEP, zone).utcoffset().total_seconds()
+            for step in steps
+        ),
+        dtype=np.float64,
+        count=steps.size,
+    ).astype(np.int64)
+    return offsets[inverse]
+
+
+def load_columns(queryset, window_start, window_end):
+    """``(user_ids, room_codes, room_keys, utc, local)`` arrays for ``queryset``.
+
+    Holds the concrete rows in the window and the occurrences of the series
+    recurring there. ``utc`` and ``local`` are epoch seconds; ``local`` is
+    shifted by the UTC offset at each start so hours and weekdays come out in
+    local time.
+    """
+    rows = (
+        queryset.filter(recurrence="", datetime__gte=window_start, datetime__lt=window_end)
+        .order_by()
+        .values_list("created_by_id", "room_key", "datetime")
+    )
+    users, rooms, starts = [], [], []
+    for user_id, room_key, dt in rows.iterator(chunk_size=5000):
+        users.append(user_id)
+        rooms.append(room_key)
+        starts.append(dt)
+
+    masters = series_in_window(
+        queryset.order_by().only(
+            "created_by", "room_key", "datetime", "recurrence", "recurrence_end"
+        ),
+        window_start,
+        window_end,
+    )
+    for occurrence in expand_series(masters, window_start, window_end):
+        users.append(occurrence.created_by_id)
+        rooms.append(occurrence.room_key)
+        starts.append(occurrence.datetime)
+
+    user_ids = np.asarray(users, dtype=np.int64)
+    room_keys, room_codes = np.unique(np.asarray(rooms, dtype=object), return_inverse=True)
+    utc = np.fromiter(
+        (dt.timestamp() for dt in starts), dtype=np.float64, count=len(starts)
+    ).astype(np.int64)
+    local = utc + utc_offsets(utc)
+    return user_ids, room_codes.astype(np.int64), room_keys, utc, local
+
+
+def _sorted_gaps(groups, starts):
+    """Sort by ``(group, start)`` and return ``(order, gap_to_next, gap_to_prev)``.
+
+    Gaps across group boundaries (and at the ends) are ``inf``.
+    """
+    order = np.lexsort((starts, groups))
+    g, s = groups[order], starts[order]
+    same = g[1:] == g[:-1]
+    diffs = np.where(same, np.diff(s), np.iinfo(np.int64).max)
+    gap_next = np.append(diffs, np.iinfo(np.int64).max)
+    gap_prev = np.insert(diffs, 0, np.iinfo(np.int64).max)
+    return order, gap_next, gap_prev
+
+
+def group_report(groups, starts, weeks, n_weeks):
+    """Per-group, per-week appointment counts, occupied seconds and conflicts.
+
+    Occupied time is the union of the 30-minute slots, so double bookings
+    are not counted twice: each slot contributes ``min(duration, gap to the
+    next start in its group)``. An appointment conflicts when its start is
+    less than a duration away from a neighbour in the same group.
+    """
+    n_groups = int(groups.max()) + 1 if groups.size else 0
+    order, gap_next, gap_prev = _sorted_gaps(groups, starts)
+    occupied = np.minimum(gap_next, DURATION)
+    conflicting = (gap_next < DURATION) | (gap_prev < DURATION)
+
+    cells = groups[order] * n_weeks + weeks[order]
+    size = n_groups * n_weeks
+    shape = (n_groups, n_weeks)
+    return {
+        "count": np.bincount(cells, minlength=size).reshape(shape),
+        "occupied": np.bincount(cells, weights=occupied, minlength=size).reshape(shape),
+        "conflicts": np.bincount(
+            cells, weights=conflicting.astype(np.float64), minlength=size
+        )
+        .reshape(shape)
+        .astype(np.int64),
+    }
+
+
+def build_report(queryset, start, end):
+    """Room and staff utilization, conflict density and histograms.
+
+    ``start`` and ``end`` are dates; weeks are counted from ``start``.
+    Recurring series count once per occurrence in the range. Bookings
+    without a room or in a shared room (see ``shared_rooms``) count
+    for staff but not for rooms, as in ``Appointment.get_room_conflicts``.
+    """
+    if np is None:
+        raise RuntimeError("The utilization report requires NumPy")
+
+    range_start = datetime.combine(start, time.min)
+    range_end = datetime.combine(end, time.min)
+    if settings.USE_TZ:
+        range_start = timezone.make_aware(range_start)
+        range_end = timezone.make_aware(range_end)
+    user_ids, room_codes, room_keys, utc, local = load_columns(
+        queryset, range_start, range_end
+    )
+    origin = int((range_start.replace(tzinfo=None) - datetime(1970, 1, 1)).total_seconds())
+    n_weeks = max((end - start).days // 7 + (1 if (end - start).days % 7 else 0), 1)
+    weeks = np.clip((local - origin) // WEEK, 0, n_weeks - 1)
+
+    user_keys, user_codes = np.unique(user_ids, return_inverse=True)
+    staff = group_report(user_codes.astype(np.int64), utc, weeks, n_weeks)
+    excluded = shared_rooms() | {""}
+    in_room = np.asarray([key not in excluded for key in room_keys], dtype=bool)[room_codes]
+    rooms = group_report(room_codes[in_room], utc[in_room], weeks[in_room], n_weeks)
+
+    from users.models import User
+
+    names = User.objects.in_bulk([int(pk) for pk in user_keys])
+    available = available_seconds_per_week()
+    week_starts = [start + timedelta(weeks=i) for i in range(n_weeks)]
+
+    def rows(kind, labels, report):
+        for index, label in enumerate(labels):
+            for week in range(n_weeks):
+                count = int(report["count"][index, week])
+                if not count:
+                    continue
+                occupied = float(report["occupied"][index, week])
+                yield {
+                    "kind": kind,
+                    "key": label,
+                    "week": week_starts[week].isoformat(),
+                    "appointments": count,
+                    "booked_hours": round(occupied / 3600, 2),
+                    "utilization_pct": round(100 * occupied / available, 1),
+                    "conflicts": int(report["conflicts"][index, week]),
+                    "conflict_density": round(
+                        int(report["conflicts"][index, week]) / count, 3
+                    ),
+                }
+
+    staff_labels = [
+        str(names[int(pk)]) if int(pk) in names else f"User {pk}" for pk in user_keys
+    ]
+    room_labels = list(room_keys)
+
+    hours = (local // 3600) % 24
+    weekdays = (local // 86400 + 3) % 7  # 1970-01-01 was a Thursday.
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "appointments": int(utc.size),
+        "weeks": [week.isoformat() for week in week_starts],
+        "rows": [
+            *rows("staff", staff_labels, staff),
+            *rows("room", [label.title() for label in room_labels], rooms),
+        ],
+        "hour_histogram": np.bincount(hours, minlength=24).tolist(),
+        "weekday_histogram": dict(
+            zip(WEEKDAYS, np.bincount(weekdays, minlength=7).tolist())
+        ),
+    }
+
+
+CSV_COLUMNS = [
+    "kind",
+    "key",
+    "week",
+    "appointments",
+    "booked_hours",
+    "utilization_pct",
+    "conflicts",
+    "conflict_density",
+]
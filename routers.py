@@ -0,0 +1,152 @@
+"""Read-replica routing for the heavy appointment read views.
+
+Views that opt in with ``ReplicaReadMixin`` run their reads against the
+``APPOINTMENTS_REPLICA_DB`` alias (default ``"replica"``) while all writes
+keep going to the primary. After a user writes through a view using
+``PrimaryStickyMixin``, their reads stay on the primary for
+``APPOINTMENTS_REPLICA_STICKY_SECONDS`` so they always see their own
+changes despite replication lag.
+
+Enable with ``DATABASE_ROUTERS = [
+"p_totschool_appointment_tracker.routers.AppointmentReplicaRouter"]``.
+Routing can be exercised locally with two SQLite databases pointing at the
+same file, e.g.::
+
+    DATABASES = {
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "db.sqlite3"},
+        "replica": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            "TEST": {"MIRROR": "default"},
+        },
+    }
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+from .instrumentation import ensure_rendered
+
+STICKY_SESSION_KEY = "appointments_primary_until"
+
+_read_alias = ContextVar("appointments_read_alias", default=None)
+
+
+def replica_alias():
+    """The configured replica alias, or None when no replica is set up."""
+    alias = getattr(settings, "APPOINTMENTS_REPLICA_DB", "replica")
+    return alias if alias in settings.DATABASES else None
+
+
+class AppointmentReplicaRouter:
+    """Send reads to the replica while a replica-reading view is running."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica and primary hold the same data, so mixing them is fine.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None if db != replica_alias() else False
+
+
+def _sticky(until):
+    return until is not None and until > time.time()
+
+
+class ReplicaReadMixin:
+    """Run a view's GET/HEAD reads (including lazy rendering) on the replica."""
+
+    use_replica = True
+
+    def dispatch(self, request, *args, **kwargs):
+        if getattr(self, "view_is_async", False):
+            return self.async_replica_dispatch(request, *args, **kwargs)
+
+        until = None
+        if hasattr(request, "session"):
+            until = request.session.get(STICKY_SESSION_KEY)
+        token = _read_alias.set(self.get_read_alias(request, until))
+        try:
+            return ensure_rendered(super().dispatch(request, *args, **kwargs))
+        finally:
+            _read_alias.reset(token)
+
+    async def async_replica_dispatch(self, request, *args, **kwargs):
+        until = None
+        if hasattr(request, "session"):
+            until = await request.session.aget(STICKY_SESSION_KEY)
+        token = _read_alias.set(self.get_read_alias(request, until))
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    def get_read_alias(self, request, sticky_until):
+        if not self.use_replica or request.method not in ("GET", "HEAD"):
+            return None
+        if _sticky(sticky_until):
+            return None
+        return replica_alias()
+
+
+@contextmanager
+def primary_reads():
+    """Send the reads inside the block to the primary, even in a replica view."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def on_primary(compute):
+    """``compute`` with its reads on the primary, for long-lived cache fills.
+
+    Cache keys embed generations that writes bump on commit. A fill read from
+    a lagging replica can miss a write whose bump it already sees, and would
+    then keep the old rows under the new generation until its TTL runs out.
+    Reading the fill from the primary closes that window.
+    """
+
+    @wraps(compute)
+    def wrapper(*args, **kwargs):
+        with primary_reads():
+            return compute(*args, **kwargs)
+
+    return wrapper
+
+
+def aon_primary(compute):
+    """Async ``on_primary`` for a coroutine function ``compute``.
+
+    The async ORM runs queries in threads that copy the caller's context, so
+    they see the alias set here.
+    """
+
+    @wraps(compute)
+    async def wrapper(*args, **kwargs):
+        with primary_reads():
+            return await compute(*args, **kwargs)
+
+    return wrapper
+
+
+class PrimaryStickyMixin:
+    """Pin the user's reads to the primary for a while after a write."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD", "OPTIONS") and hasattr(request, "session"):
+            request.session[STICKY_SESSION_KEY] = time.time() + getattr(
+                settings, "APPOINTMENTS_REPLICA_STICKY_SECONDS", 10
+            )
+        return super().dispatch(request, *args, **kwargs)
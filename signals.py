@@ -0,0 +1,288 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import live, reminders
+from .caching import bump_generation
+from .models import (
+    OVERLAP_WINDOW,
+    Appointment,
+    AppointmentChange,
+    AppointmentOccurrenceException,
+)
+from .tiles import tile_for
+
+_bulk_write = ContextVar("appointments_bulk_write", default=False)
+
+
+@contextmanager
+def bulk_write():
+    """Skip per-row signal work during a bulk write.
+
+    The caller is then responsible for calling ``invalidate_spans`` once and
+    for writing the change-feed rows itself.
+    """
+    token = _bulk_write.set(True)
+    try:
+        yield
+    finally:
+        _bulk_write.reset(token)
+
+
+def _touched_spans(instance):
+    """``(created_by_id, low, high)`` spans an appointment occupies or vacated."""
+    spans = [(instance.created_by_id, instance.datetime, instance.datetime)]
+    loaded = getattr(instance, "_loaded_values", {})
+    previous_user = loaded.get("created_by_id", instance.created_by_id)
+    previous_dt = loaded.get("datetime", instance.datetime)
+    if (previous_user, previous_dt, previous_dt) not in spans:
+        spans.append((previous_user, previous_dt, previous_dt))
+    return [span for span in spans if span[1] is not None]
+
+
+def _touched_room_spans(instance):
+    """``(room_key, low, high)`` spans an appointment occupies or vacated."""
+    spans = {(instance.room_key, instance.datetime, instance.datetime)}
+    loaded = getattr(instance, "_loaded_values", {})
+    previous_dt = loaded.get("datetime", instance.datetime)
+    spans.add((loaded.get("room_key", instance.room_key), previous_dt, previous_dt))
+    return [span for span in spans if span[0] and span[1] is not None]
+
+
+def _tiles_between(low, high):
+    tiles = {tile_for(high)}
+    current = low
+    while current <= high:
+        tiles.add(tile_for(current))
+        current += timedelta(days=7)
+    return tiles
+
+
+def _days_between(low, high):
+    """Local ``YYYY-MM-DD`` days from ``low`` to ``high`` inclusive."""
+    day, last = live.local_day(low), live.local_day(high)
+    while day <= last:
+        yield day.isoformat()
+        day += timedelta(days=1)
+
+
+def invalidate_spans(spans, pks=()):
+    """Bump the cache generations covering ``(created_by_id, low, high)`` spans."""
+    spans = list(spans)
+    tiles = set()
+    for _, low, high in spans:
+        tiles |= _tiles_between(low, high)
+    for tile in tiles:
+        bump_generation("tile", tile)
+
+    # Coalesced timeline reads are keyed per scope, card data per scope and
+    # day; the admin scope sees every user's changes.
+    users = {user_id for user_id, _, _ in spans if user_id is not None}
+    for user_id in users:
+        bump_generation("scope", f"user-{user_id}")
+    if users:
+        bump_generation("scope", "all")
+    days = set()
+    for user_id, low, high in spans:
+        for day in _days_between(low, high):
+            days.add(day)
+            if user_id is not None:
+                bump_generation("cards", f"user-{user_id}", day)
+    for day in days:
+        bump_generation("cards", "all", day)
+
+    # Detail fragments list overlaps, so neighbours in the window go stale too.
+    affected = set(pks)
+    if spans:
+        neighbours = Q()
+        for user_id, low, high in spans:
+            neighbours |= Q(
+                created_by_id=user_id,
+                datetime__gte=low - OVERLAP_WINDOW,
+                datetime__lte=high + OVERLAP_WINDOW,
+            )
+        affected.update(
+            Appointment.objects.filter(neighbours).values_list("pk", flat=True)
+        )
+    for pk in affected:
+        bump_generation("detail", pk)
+
+
+def invalidate_room_spans(spans):
+    """Bump the detail generations of appointments whose room conflicts may
+    have changed, i.e. those near the ``(room_key, low, high)`` spans."""
+    neighbours = Q()
+    for room_key, low, high in spans:
+        if room_key:
+            neighbours |= Q(
+                room_key=room_key,
+                datetime__gt=low - OVERLAP_WINDOW,
+                datetime__lt=high + OVERLAP_WINDOW,
+            )
+    if not neighbours:
+        return
+    for pk in Appointment.objects.filter(neighbours).values_list("pk", flat=True):
+        bump_generation("detail", pk)
+
+
+def queryset_room_spans(queryset):
+    """Per-room datetime spans of a queryset, for invalidating bulk writes."""
+    rows = (
+        queryset.exclude(room_key="")
+        .order_by()
+        .values("room_key")
+        .annotate(low=Min("datetime"), high=Max("datetime"))
+    )
+    return [(row["room_key"], row["low"], row["high"]) for row in rows]
+
+
+def queryset_spans(queryset):
+    """Per-user datetime spans of a queryset, for invalidating bulk writes."""
+    rows = (
+        queryset.order_by()
+        .values("created_by_id")
+        .annotate(low=Min("datetime"), high=Max("datetime"))
+    )
+    return [(row["created_by_id"], row["low"], row["high"]) for row in rows]
+
+
+@receiver(post_save, sender=Appointment)
+@receiver(post_delete, sender=Appointment)
+def invalidate_appointment_caches(sender, instance, **kwargs):
+    if _bulk_write.get():
+        return
+    # The spans are captured now but bumped only after commit. A bump inside
+    # the transaction would let a concurrent reader cache the pre-commit
+    # rows under the new generation.
+    spans = _touched_spans(instance)
+    room_spans = _touched_room_spans(instance)
+    pk = instance.pk
+    loaded = getattr(instance, "_loaded_values", {})
+    # A series spans an open-ended range of tiles and detail pages, so they
+    # all carry the series generation instead.
+    series = bool(instance.recurrence or loaded.get("recurrence"))
+
+    def invalidate():
+        invalidate_spans(spans, [pk])
+        invalidate_room_spans(room_spans)
+        if series:
+            bump_generation("series")
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=AppointmentOccurrenceException)
+@receiver(post_delete, sender=AppointmentOccurrenceException)
+def invalidate_series_caches(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_generation("series"))
+
+
+@receiver(post_save, sender=AppointmentOccurrenceException)
+@receiver(post_delete, sender=AppointmentOccurrenceException)
+def record_exception_change(sender, instance, **kwargs):
+    """Log an exception edit as an update of its series in the change feed."""
+    if _bulk_write.get():
+        return
+    origin = kwargs.get("origin")
+    if isinstance(origin, Appointment) or getattr(origin, "model", None) is Appointment:
+        return  # Cascaded from deleting the series, which logs its own delete.
+    master = Appointment.objects.filter(pk=instance.appointment_id).first()
+    if master is None:
+        return
+    change = AppointmentChange.for_save(master, False)[0]
+    change.data["exception"] = {
+        "original_datetime": instance.original_datetime.isoformat(),
+        "datetime": instance.datetime.isoformat() if instance.datetime else None,
+        "cancelled": instance.cancelled,
+        "removed": kwargs.get("signal") is post_delete,
+    }
+    change.save()
+
+
+@receiver(post_delete, sender=Appointment)
+def record_appointment_delete(sender, instance, **kwargs):
+    # post_delete runs inside the deletion's transaction, so the log entry
+    # commits or rolls back together with the row.
+    if _bulk_write.get():
+        return
+    AppointmentChange.for_delete(instance).save()
+
+
+@receiver(post_save, sender=Appointment)
+@receiver(post_delete, sender=Appointment)
+def publish_live_card(sender, instance, **kwargs):
+    if _bulk_write.get():
+        return
+    loaded = getattr(instance, "_loaded_values", {})
+    previous = (loaded.get("created_by_id"), loaded.get("datetime")) if loaded else None
+    events = live.card_events(
+        instance, previous, removed=kwargs.get("signal") is post_delete
+    )
+    if instance.recurrence or loaded.get("recurrence"):
+        # The card above only covers the master's first day; every day the
+        # series recurs on, before or after the edit, has to reload.
+        versions = [(instance.created_by_id, instance.datetime, instance.recurrence)]
+        if loaded:
+            versions.append(
+                (loaded.get("created_by_id"), loaded.get("datetime"), loaded.get("recurrence"))
+            )
+        moved = []
+        if kwargs.get("signal") is not post_delete:
+            moved = [
+                (instance.created_by_id, dt)
+                for dt in instance.occurrence_exceptions.exclude(
+                    datetime=None
+                ).values_list("datetime", flat=True)
+            ]
+        events += live.series_events(versions, moved)
+    transaction.on_commit(lambda: live.publish(events))
+
+
+@receiver(post_save, sender=AppointmentOccurrenceException)
+@receiver(post_delete, sender=AppointmentOccurrenceException)
+def publish_live_exception(sender, instance, **kwargs):
+    """Reload the days an occurrence moved from and to."""
+    if _bulk_write.get():
+        return
+    user_id = (
+        Appointment.objects.filter(pk=instance.appointment_id)
+        .values_list("created_by_id", flat=True)
+        .first()
+    )
+    if user_id is None:
+        return
+    moved = [
+        (user_id, instance.original_datetime),
+        (user_id, instance.datetime),
+        (user_id, getattr(instance, "_previous_datetime", None)),
+    ]
+    events = live.series_events([], moved)
+    transaction.on_commit(lambda: live.publish(events))
+
+
+@receiver(pre_save, sender=AppointmentOccurrenceException)
+def remember_exception_datetime(sender, instance, **kwargs):
+    # An edited exception may move its occurrence away from a day whose
+    # streams then need to reload too.
+    if _bulk_write.get() or instance.pk is None:
+        return
+    instance._previous_datetime = (
+        AppointmentOccurrenceException.objects.filter(pk=instance.pk)
+        .values_list("datetime", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Appointment)
+@receiver(post_delete, sender=Appointment)
+def schedule_reminder(sender, instance, **kwargs):
+    if _bulk_write.get():
+        return
+    pk = instance.pk
+    due = None if kwargs.get("signal") is post_delete else instance.reminder_due_at
+    transaction.on_commit(lambda: reminders.notify(pk, due))
@@ -0,0 +1,78 @@
+// Bulk delete, reassign and date shift on the appointment list.
+//
+// The list view appends the `#appointment-bulk-actions` form and this script.
+// A checkbox is added to every row of the table that links to an appointment
+// detail page; submitting posts the checked pks (or `select_all=true`, which
+// applies the list's current filters from the query string) to the bulk
+// endpoint, then reloads the list.
+(function (global) {
+  "use strict";
+
+  function rowPk(element, detailPattern) {
+    const link = element.getAttribute("href") || element.getAttribute("hx-get") || "";
+    const match = detailPattern.exec(link);
+    return match ? match[1] : null;
+  }
+
+  function addCheckboxes(table, detailPattern) {
+    const seen = new Set();
+    table.querySelectorAll("[href], [hx-get]").forEach((element) => {
+      const pk = rowPk(element, detailPattern);
+      if (!pk || seen.has(pk)) return;
+      seen.add(pk);
+      const checkbox = document.createElement("input");
+      checkbox.type = "checkbox";
+      checkbox.className = "checkbox checkbox-sm appointment-bulk-select";
+      checkbox.value = pk;
+      // Keep a click on the checkbox from following the row's link.
+      checkbox.addEventListener("click", (event) => event.stopPropagation());
+      element.prepend(checkbox);
+    });
+  }
+
+  function submit(form, table) {
+    const data = new FormData(form);
+    if (!data.get("select_all")) {
+      table
+        .querySelectorAll(".appointment-bulk-select:checked")
+        .forEach((checkbox) => data.append("pks", checkbox.value));
+      if (!data.getAll("pks").length) return Promise.resolve("Nothing selected");
+    }
+    if (data.get("action") === "delete" && !global.confirm("Delete the selected appointments?")) {
+      return Promise.resolve("");
+    }
+    return fetch(form.dataset.bulkUrl, {
+      method: "POST",
+      body: data,
+      credentials: "same-origin",
+      headers: { "X-CSRFToken": data.get("csrfmiddlewaretoken") },
+    }).then((response) => {
+      if (!response.ok) return response.text();
+      global.location.reload();
+      return "";
+    });
+  }
+
+  function attach(form) {
+    const table = document.querySelector(form.dataset.target) || document;
+    // ``detail-url`` is the detail URL of pk 0; its pk segment becomes the capture.
+    const [prefix, suffix] = form.dataset.detailUrl.split("/0/");
+    const escape = (text) => text.replace(/[.*+?^${}()|[\]\\]/g, "\\$&");
+    const detailPattern = new RegExp(`${escape(prefix)}/(\\d+)/${escape(suffix)}(?:[?#].*)?$`);
+    addCheckboxes(table, detailPattern);
+
+    const status = form.querySelector("[data-bulk-status]");
+    form.addEventListener("submit", (event) => {
+      event.preventDefault();
+      submit(form, table).then((message) => {
+        if (status) status.textContent = message;
+      });
+    });
+  }
+
+  global.AppointmentBulkActions = { attach };
+
+  const script = document.currentScript;
+  const form = script && document.querySelector(script.dataset.form);
+  if (form) attach(form);
+})(window);
@@ -0,0 +1,116 @@
+// Month/week calendar grid over the per-day counts from the calendar view.
+//
+// The grid itself is one small JSON request; the appointments of a day are
+// only fetched (as the cards timeline fragment) when that day is expanded.
+(function (global) {
+  "use strict";
+
+  function badge(className, text) {
+    const span = document.createElement("span");
+    span.className = className;
+    span.textContent = text;
+    return span;
+  }
+
+  function render(container, url, options = {}) {
+    const params = new URLSearchParams();
+    if (options.view) params.set("view", options.view);
+    if (options.date) params.set("date", options.date);
+    if (options.createdBy) params.set("created_by", options.createdBy);
+
+    return fetch(`${url}?${params}`, { credentials: "same-origin" })
+      .then((response) => response.json())
+      .then((grid) => {
+        container.replaceChildren();
+        container.classList.add("appointment-calendar", `appointment-calendar-${grid.view}`);
+        for (const day of grid.days) {
+          const cell = document.createElement("div");
+          cell.className = "appointment-calendar-day";
+          if (!day.in_period) cell.classList.add("outside");
+          cell.dataset.date = day.date;
+
+          const header = document.createElement("button");
+          header.type = "button";
+          header.textContent = Number(day.date.slice(8));
+          cell.appendChild(header);
+          if (day.count) cell.appendChild(badge("count", day.count));
+          if (day.conflicts) cell.appendChild(badge("conflicts", day.conflicts));
+          if (day.room_conflicts) cell.appendChild(badge("room-conflicts", day.room_conflicts));
+
+          const body = document.createElement("div");
+          body.className = "appointment-calendar-cards";
+          body.hidden = true;
+          cell.appendChild(body);
+
+          header.addEventListener("click", () => {
+            body.hidden = !body.hidden;
+            if (body.hidden || body.dataset.loaded || !day.count) return;
+            body.dataset.loaded = "1";
+            fetch(day.url, { credentials: "same-origin", headers: { "HX-Request": "true" } })
+              .then((response) => response.text())
+              .then((html) => {
+                body.innerHTML = html;
+              });
+          });
+          container.appendChild(cell);
+        }
+        return grid;
+      });
+  }
+
+  function shift(date, view, step) {
+    const day = new Date(`${date}T00:00:00`);
+    if (view === "week") day.setDate(day.getDate() + 7 * step);
+    else day.setMonth(day.getMonth() + step, 1);
+    const pad = (value) => String(value).padStart(2, "0");
+    return `${day.getFullYear()}-${pad(day.getMonth() + 1)}-${pad(day.getDate())}`;
+  }
+
+  // Mount a grid with month/week and previous/next controls into `container`.
+  function attach(container, url, options = {}) {
+    const state = { view: options.view || "month", date: options.date || "", createdBy: options.createdBy };
+    const toolbar = document.createElement("div");
+    toolbar.className = "appointment-calendar-toolbar";
+    const title = document.createElement("span");
+    const grid = document.createElement("div");
+
+    const button = (text, onClick) => {
+      const element = document.createElement("button");
+      element.type = "button";
+      element.textContent = text;
+      element.addEventListener("click", onClick);
+      toolbar.appendChild(element);
+      return element;
+    };
+    const load = () =>
+      render(grid, url, state).then((result) => {
+        state.date = result.date;
+        title.textContent = state.view === "week" ? `Week of ${result.start}` : result.date.slice(0, 7);
+      });
+
+    button("‹", () => ((state.date = shift(state.date, state.view, -1)), load()));
+    button("Today", () => ((state.date = ""), load()));
+    button("›", () => ((state.date = shift(state.date, state.view, 1)), load()));
+    const toggle = button(state.view === "week" ? "Month" : "Week", () => {
+      state.view = state.view === "week" ? "month" : "week";
+      toggle.textContent = state.view === "week" ? "Month" : "Week";
+      load();
+    });
+    toolbar.appendChild(title);
+    container.replaceChildren(toolbar, grid);
+    return load();
+  }
+
+  global.AppointmentCalendar = { render, attach };
+
+  // <script src=".../calendar_grid.js" data-url="..." data-target="#...">
+  // mounts itself; the calendar page is served that way.
+  const script = document.currentScript;
+  if (script && script.dataset.url) {
+    attach(document.querySelector(script.dataset.target), script.dataset.url, {
+      view: script.dataset.view,
+      date: script.dataset.date,
+      createdBy: script.dataset.createdBy,
+    });
+  }
+})(window);
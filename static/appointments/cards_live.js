@@ -0,0 +1,79 @@
+// Live card updates for the day shown on the cards timeline.
+//
+// Each server event is re-dispatched on `document` as
+// `appointments:card-upsert`, `appointments:card-remove` or
+// `appointments:cards-resync` with the event payload in `detail`.
+//
+// The cards view appends this script with `data-stream-url`, `data-date`,
+// `data-refresh-url` and `data-target`, and it attaches itself: any event
+// re-fetches the cards fragment into the target (debounced), so the page is
+// only refreshed when that day's cards actually changed.
+(function (global) {
+  "use strict";
+
+  let current = null;
+
+  function subscribe(url, date) {
+    const params = new URLSearchParams();
+    if (date) params.set("date", date);
+    const source = new EventSource(`${url}?${params}`, { withCredentials: true });
+
+    const forward = (name) => (message) => {
+      document.dispatchEvent(new CustomEvent(name, { detail: JSON.parse(message.data) }));
+    };
+    source.addEventListener("upsert", forward("appointments:card-upsert"));
+    source.addEventListener("remove", forward("appointments:card-remove"));
+    source.addEventListener("resync", forward("appointments:cards-resync"));
+    return source;
+  }
+
+  function refresh(url, target) {
+    if (global.htmx && document.querySelector(target)) {
+      global.htmx.ajax("GET", url, { target, swap: "innerHTML" });
+    } else {
+      global.location.reload();
+    }
+  }
+
+  function attach({ streamUrl, date, refreshUrl, target, delay = 500 }) {
+    // A refreshed fragment re-runs this script, so replace the old stream.
+    detach();
+    let timer = null;
+    const schedule = () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => refresh(refreshUrl, target), delay);
+    };
+    const events = [
+      "appointments:card-upsert",
+      "appointments:card-remove",
+      "appointments:cards-resync",
+    ];
+    events.forEach((name) => document.addEventListener(name, schedule));
+    current = {
+      source: subscribe(streamUrl, date),
+      close() {
+        clearTimeout(timer);
+        events.forEach((name) => document.removeEventListener(name, schedule));
+        this.source.close();
+      },
+    };
+    return current;
+  }
+
+  function detach() {
+    if (current) current.close();
+    current = null;
+  }
+
+  global.AppointmentCardsLive = { subscribe, attach, detach };
+
+  const script = document.currentScript;
+  if (script && script.dataset.streamUrl) {
+    attach({
+      streamUrl: script.dataset.streamUrl,
+      date: script.dataset.date,
+      refreshUrl: script.dataset.refreshUrl || global.location.href,
+      target: script.dataset.target || "#app-layout",
+    });
+  }
+})(window);
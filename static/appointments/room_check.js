@@ -0,0 +1,65 @@
+// Room double-booking warning for the appointment create form.
+//
+// Whenever the form's `location` or `datetime` changes, the room check view
+// is asked which bookings the room already has around that time, and a
+// warning listing them is shown above the form. It never blocks the save.
+(function (global) {
+  "use strict";
+
+  function warning(conflicts) {
+    const box = document.createElement("div");
+    box.className =
+      "appointment-room-conflict-alert bg-warning rounded-box border border-base-300 mb-4 shadow-sm gap-4 p-4";
+    const message = document.createElement("p");
+    message.textContent = "⚠️ Warning: This room is already booked at that time!";
+    box.append(message);
+    for (const conflict of conflicts) {
+      const item = document.createElement("div");
+      item.className = "text-sm bg-black/5 border border-black/10 p-1 px-2 rounded-md w-fit";
+      const when = new Date(conflict.datetime).toLocaleString();
+      item.textContent = `${conflict.created_by} · ${conflict.location} · ${when}`;
+      box.append(item);
+    }
+    return box;
+  }
+
+  function attach(form, url, delay = 300) {
+    const location = form.querySelector('[name="location"]');
+    const datetime = form.querySelector('[name="datetime"]');
+    if (!location || !datetime) return;
+
+    let timer = null;
+    let shown = null;
+    const check = () => {
+      const params = new URLSearchParams({ location: location.value, datetime: datetime.value });
+      if (!location.value.trim() || !datetime.value) {
+        if (shown) shown.remove();
+        shown = null;
+        return;
+      }
+      fetch(`${url}?${params}`, { credentials: "same-origin" })
+        .then((response) => (response.ok ? response.json() : { conflicts: [] }))
+        .then(({ conflicts }) => {
+          if (shown) shown.remove();
+          shown = conflicts.length ? warning(conflicts) : null;
+          if (shown) form.prepend(shown);
+        });
+    };
+    const schedule = () => {
+      clearTimeout(timer);
+      timer = setTimeout(check, delay);
+    };
+    location.addEventListener("input", schedule);
+    datetime.addEventListener("change", schedule);
+  }
+
+  global.AppointmentRoomCheck = { attach };
+
+  const script = document.currentScript;
+  if (script && script.dataset.checkUrl) {
+    const form =
+      document.querySelector(script.dataset.form) ||
+      document.querySelector('[name="location"]')?.closest("form");
+    if (form) attach(form, script.dataset.checkUrl);
+  }
+})(window);
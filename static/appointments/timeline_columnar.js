@@ -0,0 +1,44 @@
+// Expands the columnar timeline payload (`?format=columnar`) back into the
+// per-point objects ApexCharts' rangeBar series expects.
+(function (global) {
+  "use strict";
+
+  function expand(payload) {
+    if (!payload || payload.format !== "columnar") return payload;
+
+    const points = new Array(payload.pk.length);
+    for (let i = 0; i < payload.pk.length; i++) {
+      const start = payload.start[i];
+      points[i] = {
+        x: payload.users[payload.user[i]],
+        y: [start, start + payload.duration],
+        url: payload.url_template.replace("{pk}", payload.pk[i]),
+        details: {
+          name: payload.names[payload.name[i]],
+          location: payload.locations[payload.location[i]],
+        },
+      };
+    }
+    return points;
+  }
+
+  // Fetch a columnar chart response and return ApexCharts series options.
+  async function fetchSeries(url, params) {
+    const query = new URLSearchParams(params || "");
+    query.set("format", "columnar");
+    const useMsgpack = Boolean(global.MessagePack);
+    const response = await fetch(`${url}?${query}`, {
+      credentials: "same-origin",
+      headers: { Accept: useMsgpack ? "application/msgpack" : "application/json" },
+    });
+    if (!response.ok) throw new Error(`Timeline request failed: ${response.status}`);
+
+    const payload = response.headers.get("Content-Type") === "application/msgpack"
+      ? global.MessagePack.decode(new Uint8Array(await response.arrayBuffer()))
+      : await response.json();
+    if (payload.series) return payload;
+    return { series: [{ name: "Appointments", data: expand(payload) }] };
+  }
+
+  global.AppointmentColumnar = { expand, fetchSeries };
+})(window);
@@ -0,0 +1,116 @@
+// Incremental tile fetching for the appointments timeline chart.
+//
+// The server serves one ISO week per request (`?tile=YYYY-Www`) with cache
+// validators; this helper keeps the tiles already loaded for the current
+// filter set and only requests the ones a pan or zoom newly exposes.
+//
+// Tiles are revalidated with their ETag; the server sends no Last-Modified.
+//
+// The timeline view appends this script (after timeline_columnar.js) with
+// `data-chart-id`, `data-url` and `data-params`. It then hooks the chart's
+// zoom and scroll events: each newly shown range is filled from columnar
+// tiles, expanded by `AppointmentColumnar.expand`, and only the tiles not
+// loaded yet are requested. The first render still comes from the chart's
+// own single request.
+(function (global) {
+  "use strict";
+
+  const DAY = 86400000;
+
+  function isoWeek(timestamp) {
+    const date = new Date(timestamp);
+    const weekday = (date.getDay() + 6) % 7;
+    const thursday = new Date(date.getFullYear(), date.getMonth(), date.getDate() - weekday + 3);
+    const week1 = new Date(thursday.getFullYear(), 0, 4);
+    const week = 1 + Math.round(((thursday - week1) / DAY - 3 + ((week1.getDay() + 6) % 7)) / 7);
+    return `${thursday.getFullYear()}-W${String(week).padStart(2, "0")}`;
+  }
+
+  // Tiles covering [min, max], padded by a week on each side so timezone
+  // differences between browser and server never leave a gap at the edges.
+  function tilesForRange(min, max) {
+    const tiles = [];
+    for (let ts = min - 7 * DAY; ts <= max + 7 * DAY; ts += DAY) {
+      const tile = isoWeek(ts);
+      if (!tiles.includes(tile)) tiles.push(tile);
+    }
+    return tiles;
+  }
+
+  class AppointmentTileCache {
+    constructor(url, params) {
+      this.url = url;
+      this.reset(params);
+    }
+
+    reset(params) {
+      this.params = new URLSearchParams(params || "");
+      this.params.delete("range_min");
+      this.params.delete("range_max");
+      this.tiles = new Map();
+    }
+
+    async fetchTile(tile) {
+      const params = new URLSearchParams(this.params);
+      params.set("tile", tile);
+      const response = await fetch(`${this.url}?${params}`, {
+        credentials: "same-origin",
+        headers: { Accept: "application/json" },
+      });
+      if (!response.ok) throw new Error(`Tile ${tile} failed: ${response.status}`);
+      const payload = await response.json();
+      if (global.AppointmentColumnar && payload.data && payload.data.format === "columnar") {
+        payload.data = global.AppointmentColumnar.expand(payload.data);
+      }
+      this.tiles.set(tile, payload);
+    }
+
+    // Resolve to ApexCharts rangeBar points for every tile touching the range.
+    async fetchRange(min, max) {
+      const tiles = tilesForRange(min, max);
+      const missing = tiles.filter((tile) => !this.tiles.has(tile));
+      await Promise.all(missing.map((tile) => this.fetchTile(tile)));
+      return tiles.flatMap((tile) => this.tiles.get(tile).data);
+    }
+  }
+
+  // Find the ApexCharts instance once the Chart component has rendered it.
+  function whenChart(id, callback, attempts = 50) {
+    const chart = global.ApexCharts && global.ApexCharts.getChartByID(id);
+    if (chart) return callback(chart);
+    if (attempts > 0) setTimeout(() => whenChart(id, callback, attempts - 1), 100);
+  }
+
+  function attach(chart, cache, delay = 150) {
+    let timer = null;
+    let latest = 0;
+    const load = (context, { xaxis }) => {
+      if (!xaxis || xaxis.min == null || xaxis.max == null) return;
+      clearTimeout(timer);
+      timer = setTimeout(() => {
+        const request = ++latest;
+        cache
+          .fetchRange(xaxis.min, xaxis.max)
+          .then((data) => {
+            // A later pan or zoom may have been answered first.
+            if (request === latest) {
+              chart.updateSeries([{ name: "Appointments", data }], false);
+            }
+          })
+          .catch((error) => console.error(error));
+      }, delay);
+    };
+    chart.updateOptions({ chart: { events: { zoomed: load, scrolled: load } } }, false, false);
+    return cache;
+  }
+
+  global.AppointmentTiles = { isoWeek, tilesForRange, AppointmentTileCache, attach };
+
+  const script = document.currentScript;
+  if (script && script.dataset.chartId) {
+    const params = new URLSearchParams(script.dataset.params || "");
+    params.set("format", "columnar");
+    const cache = new AppointmentTileCache(script.dataset.url, params);
+    whenChart(script.dataset.chartId, (chart) => attach(chart, cache));
+  }
+})(window);
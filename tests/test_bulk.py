@@ -0,0 +1,84 @@
+from django.urls import reverse
+
+from ..models import Appointment, AppointmentLetter, AppointmentOccurrenceException
+from .utils import AppointmentTestCase, at
+
+
+class BulkActionTests(AppointmentTestCase):
+    def post(self, data, user=None, query=""):
+        self.client.force_login(user or self.user)
+        return self.client.post(reverse("appointments:bulk") + query, data)
+
+    def test_unknown_action(self):
+        self.assertEqual(self.post({"action": "archive"}).status_code, 400)
+
+    def test_delete_is_scoped_to_the_user(self):
+        response = self.post(
+            {"action": "delete", "pks": [self.first.pk, self.foreign.pk]}
+        )
+        self.assertEqual(response.json()["count"], 1)
+        self.assertFalse(Appointment.objects.filter(pk=self.first.pk).exists())
+        self.assertTrue(Appointment.objects.filter(pk=self.foreign.pk).exists())
+
+    def test_shift(self):
+        response = self.post({"action": "shift", "days": "2", "pks": [self.first.pk]})
+        self.assertEqual(response.json()["count"], 1)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.datetime, at(2026, 3, 4, 9, 0))
+
+    def test_shift_reports_new_overlaps(self):
+        response = self.post({"action": "shift", "days": "0", "pks": [self.first.pk]})
+        self.assertIn([self.first.pk, self.second.pk], response.json()["overlaps"])
+
+    def test_delete_removes_series_exceptions(self):
+        response = self.post({"action": "delete", "pks": [self.series.pk]})
+        self.assertEqual(response.json()["count"], 1)
+        self.assertFalse(AppointmentOccurrenceException.objects.exists())
+
+    def test_delete_cascades_to_dependent_rows(self):
+        AppointmentLetter.objects.create(appointment=self.first, body=b"")
+        response = self.post({"action": "delete", "pks": [self.first.pk]})
+        self.assertEqual(response.json()["count"], 1)
+        self.assertFalse(AppointmentLetter.objects.exists())
+
+    def test_list_offers_the_bulk_actions(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("appointments:default"), {"sort": "name"})
+        self.assertContains(response, 'id="appointment-bulk-actions"')
+        self.assertContains(response, reverse("appointments:bulk") + "?sort=name")
+        self.assertNotContains(response, 'value="reassign"')
+
+    def test_shift_rejects_bad_days(self):
+        for days in ("x", "", "99999999999", "-5000"):
+            with self.subTest(days=days):
+                response = self.post(
+                    {"action": "shift", "days": days, "pks": [self.first.pk]}
+                )
+                self.assertEqual(response.status_code, 400)
+
+    def test_reassign_rejects_bad_user(self):
+        for created_by in ("", "abc", "999999"):
+            with self.subTest(created_by=created_by):
+                response = self.post(
+                    {"action": "reassign", "created_by": created_by, "pks": [self.first.pk]},
+                    user=self.admin,
+                )
+                self.assertEqual(response.status_code, 400)
+
+    def test_reassign_needs_admin(self):
+        data = {"action": "reassign", "created_by": self.other.pk, "pks": [self.first.pk]}
+        self.assertEqual(self.post(data).status_code, 403)
+        self.assertEqual(self.post(data, user=self.admin).json()["count"], 1)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.created_by_id, self.other.pk)
+
+    def test_select_all_targets_the_rows_a_windowed_list_shows(self):
+        response = self.post(
+            {"action": "delete", "select_all": "1"},
+            query="?date=2026-03-02&overlapping=true",
+        )
+        self.assertEqual(response.json()["count"], 2)
+        self.assertEqual(
+            set(Appointment.objects.values_list("pk", flat=True)),
+            {self.foreign.pk, self.series.pk},
+        )
@@ -0,0 +1,37 @@
+from django.test import RequestFactory
+from django.urls import reverse
+
+from ..views import AppointmentList
+from .utils import AppointmentTestCase
+
+
+class CalendarTests(AppointmentTestCase):
+    def day_counts(self, **params):
+        self.client.force_login(self.user)
+        days = self.client.get(
+            reverse("appointments:calendar"), dict(params, date="2026-03-02")
+        ).json()["days"]
+        return {
+            day["date"]: (day["count"], day["conflicts"], day["room_conflicts"])
+            for day in days
+        }
+
+    def test_counts_include_occurrences(self):
+        counts = self.day_counts()
+        self.assertEqual(counts["2026-02-23"], (1, 0, 0))
+        self.assertEqual(counts["2026-03-02"], (3, 3, 3))
+        self.assertEqual(counts["2026-03-09"], (0, 0, 0))
+        self.assertEqual(counts["2026-03-10"], (1, 0, 0))
+
+    def test_badges_match_the_list_filters(self):
+        counts = self.day_counts()["2026-03-02"]
+        for position, flag in ((1, "overlapping"), (2, "room_conflicts")):
+            with self.subTest(flag=flag):
+                params = {"date": "2026-03-02", flag: "true"}
+                request = RequestFactory().get(reverse("appointments:default"), params)
+                request.user = self.user
+                view = AppointmentList()
+                view.setup(request)
+                queryset, _ = view.get_filtered_queryset(request)
+                shown = view.with_occurrences(queryset.order_by("datetime"))
+                self.assertEqual(len(shown), counts[position])
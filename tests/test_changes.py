@@ -0,0 +1,34 @@
+from ..models import AppointmentChange, AppointmentOccurrenceException
+from .utils import AppointmentTestCase, at
+
+
+class ExceptionChangeTests(AppointmentTestCase):
+    def changes(self):
+        return list(
+            AppointmentChange.objects.filter(appointment_id=self.series.pk).values_list(
+                "operation", "data"
+            )
+        )
+
+    def test_exception_edits_update_the_series(self):
+        AppointmentChange.objects.all().delete()
+        exception = AppointmentOccurrenceException.objects.create(
+            appointment=self.series,
+            original_datetime=at(2026, 3, 16, 9, 20),
+            cancelled=True,
+        )
+        exception.delete()
+
+        (created_op, created), (removed_op, removed) = self.changes()
+        self.assertEqual([created_op, removed_op], [AppointmentChange.UPDATE] * 2)
+        self.assertTrue(created["exception"]["cancelled"])
+        self.assertFalse(created["exception"]["removed"])
+        self.assertTrue(removed["exception"]["removed"])
+        self.assertEqual(created["recurrence"], self.series.recurrence)
+
+    def test_deleting_the_series_logs_only_its_delete(self):
+        AppointmentChange.objects.all().delete()
+        self.series.delete()
+        self.assertEqual(
+            [operation for operation, _ in self.changes()], [AppointmentChange.DELETE]
+        )
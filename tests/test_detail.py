@@ -0,0 +1,35 @@
+from django.urls import reverse
+
+from ..models import Appointment
+from ..recurrence import load_exceptions
+from .utils import AppointmentTestCase, at
+
+
+class DetailTests(AppointmentTestCase):
+    def test_preloaded_rows_match_queries(self):
+        rows = list(Appointment.objects.select_related("created_by").order_by("datetime"))
+        load_exceptions(
+            [row for row in rows if row.recurrence], at(2026, 2, 1), at(2026, 5, 1)
+        )
+
+        def keys(appointments):
+            return [(a.pk, a.datetime) for a in appointments]
+
+        for expected in (self.first, self.second, self.foreign):
+            with self.subTest(name=expected.name):
+                appointment = next(row for row in rows if row.pk == expected.pk)
+                self.assertEqual(
+                    keys(appointment.get_room_conflicts(loaded=rows)),
+                    keys(appointment.get_room_conflicts()),
+                )
+                self.assertEqual(
+                    keys(appointment.get_overlapping_occurrences(loaded=rows)),
+                    keys(appointment.get_overlapping_occurrences()),
+                )
+
+    def test_detail_is_scoped(self):
+        self.client.force_login(self.user)
+        url = reverse("appointments:detail", kwargs={"pk": self.foreign.pk})
+        self.assertEqual(self.client.get(url).status_code, 404)
+        url = reverse("appointments:detail", kwargs={"pk": self.first.pk})
+        self.assertEqual(self.client.get(url).status_code, 200)
@@ -0,0 +1,24 @@
+import copy
+
+from django.test import SimpleTestCase
+
+from ..lazy import LazyEntry
+
+
+class LazyEntryTests(SimpleTestCase):
+    def setUp(self):
+        # Resolving this entry would raise ModuleNotFoundError.
+        self.entry = LazyEntry("appointments.Missing", "appointments_missing_module")
+
+    def test_dunder_probes_do_not_import(self):
+        self.assertFalse(hasattr(self.entry, "__wrapped__"))
+        self.assertFalse(hasattr(self.entry, "__html__"))
+        self.assertIn("unresolved", repr(self.entry))
+
+    def test_copy_does_not_recurse(self):
+        clone = copy.copy(self.entry)
+        self.assertEqual(clone.module, self.entry.module)
+
+    def test_other_attributes_resolve(self):
+        with self.assertRaises(ModuleNotFoundError):
+            self.entry.build
@@ -0,0 +1,40 @@
+from datetime import datetime, time, timedelta
+from unittest import mock
+
+from django.utils import timezone
+
+from .. import live
+from .utils import AppointmentTestCase, book
+
+
+class SeriesEventTests(AppointmentTestCase):
+    def setUp(self):
+        super().setUp()
+        today = timezone.localdate()
+        self.start = timezone.make_aware(datetime.combine(today, time(10)))
+        self.days = [(today + timedelta(weeks=i)).isoformat() for i in range(3)]
+
+    def resynced_days(self, events):
+        return sorted({channel.split(":")[2] for channel, _ in events})
+
+    def test_every_occurrence_day_resyncs(self):
+        events = live.series_events(
+            [(self.user.pk, self.start, "FREQ=WEEKLY;COUNT=3")]
+        )
+        self.assertEqual(self.resynced_days(events), self.days)
+        self.assertTrue(all(event == {"op": "resync"} for _, event in events))
+
+    def test_series_edit_publishes_old_and_new_days(self):
+        series = book(self.user, self.start, recurrence="FREQ=WEEKLY;COUNT=2")
+        series.datetime += timedelta(days=1)
+        with mock.patch.object(live, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                series.save()
+        published = [event for call in publish.call_args_list for event in call.args[0]]
+        shifted = [
+            (timezone.localdate() + timedelta(days=day)).isoformat() for day in (1, 8)
+        ]
+        self.assertEqual(
+            self.resynced_days([e for e in published if e[1]["op"] == "resync"]),
+            sorted(self.days[:2] + shifted),
+        )
@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+
+from django.test import SimpleTestCase
+
+from ..overlaps import sweep_overlaps
+
+T0 = datetime(2026, 3, 2, 9)
+
+
+def minutes(value):
+    return T0 + timedelta(minutes=value)
+
+
+class SweepOverlapsTests(SimpleTestCase):
+    def test_pairs_within_group_and_window(self):
+        rows = [
+            ("a", minutes(0), 1),
+            ("a", minutes(10), 2),
+            ("a", minutes(45), 3),
+            ("b", minutes(5), 4),
+            ("b", minutes(30), 5),
+        ]
+        self.assertEqual(list(sweep_overlaps(rows)), [(1, 2), (4, 5)])
+
+    def test_window_is_exclusive(self):
+        rows = [("a", minutes(0), 1), ("a", minutes(30), 2)]
+        self.assertEqual(list(sweep_overlaps(rows)), [])
+
+    def test_every_pair_of_a_cluster(self):
+        rows = [("a", minutes(0), 1), ("a", minutes(0), 2), ("a", minutes(29), 3)]
+        self.assertEqual(list(sweep_overlaps(rows)), [(1, 2), (1, 3), (2, 3)])
+
+    def test_groups_do_not_leak(self):
+        rows = [("a", minutes(0), 1), ("b", minutes(1), 2), ("c", minutes(2), 3)]
+        self.assertEqual(list(sweep_overlaps(rows)), [])
@@ -0,0 +1,94 @@
+from django.test import override_settings
+from django.urls import reverse
+
+from ..views import AppointmentList, AppointmentView
+from .utils import AppointmentTestCase
+
+
+@override_settings(APPOINTMENTS_ENFORCE_QUERY_BUDGETS=True)
+class QueryBudgetTests(AppointmentTestCase):
+    """Every instrumented view stays inside its budget on cold caches.
+
+    With enforcement on, a view over budget raises ``QueryBudgetExceeded``,
+    which the test client re-raises.
+    """
+
+    def get(self, name, params=None, user=None, kwargs=None, **headers):
+        self.client.force_login(user or self.user)
+        response = self.client.get(
+            reverse(f"appointments:{name}", kwargs=kwargs), params or {}, **headers
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.query_budget)
+        self.assertLessEqual(response.query_stats.count, response.query_budget)
+        return response
+
+    def test_list(self):
+        cases = [
+            {},
+            {"sort": "name"},
+            {"sort": "-datetime", "page": 1},
+            {"overlapping": "true"},
+            {"room_conflicts": "true"},
+            {"date": "2026-03-02"},
+            {"date": "2026-03-02", "overlapping": "true", "room_conflicts": "true"},
+        ]
+        for user in (self.user, self.admin):
+            for params in cases:
+                with self.subTest(user=user.pk, params=params):
+                    self.get("default", params, user=user)
+
+    def test_detail(self):
+        for pk in (self.first.pk, self.foreign.pk, self.series.pk):
+            with self.subTest(pk=pk):
+                self.get("detail", user=self.admin, kwargs={"pk": pk})
+
+    def test_detail_fragment_cache(self):
+        kwargs = {"pk": self.first.pk}
+        cold = self.get("detail", kwargs=kwargs, HTTP_HX_REQUEST="true")
+        warm = self.get("detail", kwargs=kwargs, HTTP_HX_REQUEST="true")
+        self.assertEqual(warm.content, cold.content)
+        self.assertLess(warm.query_stats.count, cold.query_stats.count)
+
+    def test_detail_budget_does_not_depend_on_the_data(self):
+        response = self.get("detail", kwargs={"pk": self.first.pk})
+        self.assertEqual(response.query_budget, AppointmentView.query_budget + 1)
+
+        self.series.delete()
+        response = self.get("detail", kwargs={"pk": self.first.pk})
+        self.assertEqual(response.query_budget, AppointmentView.query_budget + 1)
+
+    def test_list_allowance_follows_the_request(self):
+        budget = AppointmentList.query_budget
+        self.assertEqual(self.get("default").query_budget, budget)
+        day = {"date": "2026-03-02"}
+        self.assertEqual(self.get("default", day).query_budget, budget + 1)
+        filtered = dict(day, overlapping="true", room_conflicts="true")
+        self.assertEqual(self.get("default", filtered).query_budget, budget + 3)
+
+    def test_cards(self):
+        for day in ("2026-03-02", "2026-03-10", "2026-04-01"):
+            with self.subTest(day=day):
+                self.get("cards", {"date": day})
+
+    def test_timeline(self):
+        window = {
+            "range_min": "2026-03-01T00:00:00",
+            "range_max": "2026-03-08T00:00:00",
+        }
+        self.get("timeline", user=self.admin)
+        self.get("timeline", window)
+        self.get("timeline", dict(window, overlapping="true"))
+        self.get("timeline", dict(window, format="columnar"))
+        self.get("timeline", {"tile": "2026-W10"})
+        self.get("timeline", {"tile": "2026-W10", "format": "columnar"}, user=self.admin)
+
+    def test_calendar(self):
+        for params in ({"date": "2026-03-02"}, {"date": "2026-03-02", "view": "week"}):
+            with self.subTest(params=params):
+                self.get("calendar", params)
+                self.get("calendar", params, user=self.admin)
+
+    def test_selection_table(self):
+        self.get("select")
+        self.get("select", user=self.admin)
@@ -0,0 +1,106 @@
+from datetime import datetime
+
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import reverse
+
+from ..recurrence import occurrences_between, parse_rule
+from ..views import AppointmentList
+from .utils import AppointmentTestCase, at
+
+
+def between(value, start, low, high):
+    return list(occurrences_between(start, parse_rule(value), low, high))
+
+
+class RuleTests(SimpleTestCase):
+    def test_parse(self):
+        rule = parse_rule("RRULE:FREQ=WEEKLY;BYDAY=WE,MO;COUNT=4")
+        self.assertEqual(
+            (rule.freq, rule.interval, rule.count, rule.byday), ("WEEKLY", 1, 4, (0, 2))
+        )
+
+    def test_rejects_invalid_rules(self):
+        for value in (
+            "",
+            "FREQ=YEARLY",
+            "FREQ=DAILY;BYDAY=MO",
+            "FREQ=DAILY;COUNT=2;UNTIL=20260101",
+            "FREQ=DAILY;INTERVAL=0",
+            "FREQ=DAILY;FREQ=DAILY",
+            "FREQ=WEEKLY;BYDAY=XX",
+            "FREQ=DAILY;BYMONTH=1",
+        ):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_rule(value)
+
+    def test_weekly_count(self):
+        self.assertEqual(
+            between(
+                "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=4",
+                datetime(2026, 3, 2, 9),
+                datetime(2026, 3, 1),
+                datetime(2026, 4, 1),
+            ),
+            [datetime(2026, 3, day, 9) for day in (2, 4, 9, 11)],
+        )
+
+    def test_monthly_skips_short_months(self):
+        self.assertEqual(
+            between(
+                "FREQ=MONTHLY;COUNT=3",
+                datetime(2026, 1, 31, 10),
+                datetime(2026, 1, 1),
+                datetime(2027, 1, 1),
+            ),
+            [datetime(2026, month, 31, 10) for month in (1, 3, 5)],
+        )
+
+    def test_daily_window_after_start(self):
+        self.assertEqual(
+            between(
+                "FREQ=DAILY;INTERVAL=2",
+                datetime(2026, 3, 1, 8),
+                datetime(2026, 3, 10),
+                datetime(2026, 3, 15),
+            ),
+            [datetime(2026, 3, 11, 8), datetime(2026, 3, 13, 8)],
+        )
+
+
+class OccurrenceWindowTests(AppointmentTestCase):
+    def shown(self, user, **params):
+        request = RequestFactory().get(reverse("appointments:default"), params)
+        request.user = user
+        view = AppointmentList()
+        view.setup(request)
+        queryset, _ = view.get_filtered_queryset(request)
+        return [
+            (appointment.name, appointment.datetime)
+            for appointment in view.with_occurrences(queryset.order_by("datetime"))
+        ]
+
+    def test_day_merges_occurrences(self):
+        self.assertEqual(
+            self.shown(self.user, date="2026-03-02"),
+            [
+                ("First", at(2026, 3, 2, 9, 0)),
+                ("Second", at(2026, 3, 2, 9, 10)),
+                ("Weekly", at(2026, 3, 2, 9, 20)),
+            ],
+        )
+
+    def test_moved_occurrence(self):
+        self.assertEqual(self.shown(self.user, date="2026-03-09"), [])
+        self.assertEqual(
+            self.shown(self.user, date="2026-03-10"),
+            [("Weekly", at(2026, 3, 10, 9, 20))],
+        )
+
+    def test_conflict_filters_count_occurrences(self):
+        overlapping = self.shown(self.user, date="2026-03-02", overlapping="true")
+        self.assertEqual([name for name, _ in overlapping], ["First", "Second", "Weekly"])
+        in_room = self.shown(self.admin, date="2026-03-02", room_conflicts="true")
+        self.assertEqual(
+            [name for name, _ in in_room], ["First", "Second", "Foreign", "Weekly"]
+        )
+        self.assertEqual(self.shown(self.user, date="2026-03-16", overlapping="true"), [])
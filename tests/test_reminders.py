@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ..models import Appointment
+from ..reminders import LocalTransport, ReminderScheduler
+from .utils import AppointmentTestCase
+
+
+class ReminderTests(AppointmentTestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        self.transport = LocalTransport()
+        self.scheduler = ReminderScheduler(transport=self.transport)
+
+    def due(self, appointment, starts_in):
+        Appointment.objects.filter(pk=appointment.pk).update(
+            phone_e164="+15555550100",
+            datetime=self.now + starts_in,
+            reminder_due_at=self.now - timedelta(minutes=1),
+        )
+
+    def test_sends_due_reminders(self):
+        self.due(self.first, timedelta(minutes=30))
+        self.assertEqual(self.scheduler.send([self.first.pk], self.now), 1)
+        self.first.refresh_from_db()
+        self.assertIsNone(self.first.reminder_due_at)
+        self.assertEqual(self.first.reminder_sent_at, self.now)
+
+    def test_clears_reminders_of_started_appointments(self):
+        self.due(self.first, -timedelta(minutes=5))
+        self.assertEqual(self.scheduler.send([self.first.pk], self.now), 0)
+        self.assertEqual(self.transport.sent, [])
+        self.first.refresh_from_db()
+        self.assertIsNone(self.first.reminder_due_at)
+        self.assertIsNone(self.first.reminder_sent_at)
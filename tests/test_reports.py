@@ -0,0 +1,68 @@
+from datetime import date
+from unittest import skipIf
+
+from django.urls import reverse
+
+from .. import reports
+from ..models import Appointment
+from .utils import AppointmentTestCase, at, book
+
+
+@skipIf(reports.np is None, "the reports require NumPy")
+class ReportTests(AppointmentTestCase):
+    def build(self, start=date(2026, 3, 2), end=date(2026, 3, 9)):
+        return reports.build_report(Appointment.objects.all(), start, end)
+
+    def rows(self, report, kind):
+        return {row["key"]: row for row in report["rows"] if row["kind"] == kind}
+
+    def test_staff_and_room_rows(self):
+        report = self.build()
+        self.assertEqual(report["appointments"], 4)  # With the 09:20 occurrence.
+
+        staff = sorted(
+            (row["appointments"], row["conflicts"], row["booked_hours"])
+            for row in self.rows(report, "staff").values()
+        )
+        self.assertEqual(staff, [(1, 0, 0.5), (3, 3, 0.83)])
+
+        room = self.rows(report, "room")["Room 101"]
+        self.assertEqual(room["appointments"], 4)
+        self.assertEqual(room["conflicts"], 4)
+        self.assertEqual(room["booked_hours"], 0.83)
+
+    def test_series_count_per_occurrence(self):
+        report = self.build(date(2026, 2, 23), date(2026, 3, 23))
+        self.assertEqual(report["appointments"], 7)  # 3 rows, 4 occurrences.
+        self.assertEqual(report["weekday_histogram"]["Mon"], 6)
+        self.assertEqual(report["weekday_histogram"]["Tue"], 1)  # Moved from 9 March.
+
+    def test_shared_and_missing_rooms_are_not_rooms(self):
+        book(self.user, at(2026, 3, 3, 9, 0), location="Main Hall")
+        book(self.other, at(2026, 3, 3, 9, 5), location="main hall")
+        book(self.other, at(2026, 3, 4, 9, 0), location="-")
+        report = self.build()
+
+        self.assertEqual(report["appointments"], 7)
+        self.assertEqual(set(self.rows(report, "room")), {"Room 101"})
+        staff = sorted(
+            row["appointments"] for row in self.rows(report, "staff").values()
+        )
+        self.assertEqual(staff, [3, 4])
+
+    def test_histograms(self):
+        report = self.build()
+        self.assertEqual(report["hour_histogram"][9], 4)
+        self.assertEqual(report["weekday_histogram"]["Mon"], 4)
+
+    def test_view_is_admin_only(self):
+        url = reverse("appointments:reports")
+        params = {"start": "2026-03-02", "end": "2026-03-09"}
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url, params).status_code, 403)
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(url, params).json()["appointments"], 4)
+        self.assertEqual(
+            self.client.get(url, {"start": "2026-03-09", "end": "2026-03-02"}).status_code,
+            400,
+        )
@@ -0,0 +1,26 @@
+from django.urls import reverse
+
+from .utils import AppointmentTestCase
+
+
+class RoomCheckTests(AppointmentTestCase):
+    def check(self, **params):
+        self.client.force_login(self.user)
+        return self.client.get(reverse("appointments:room_check"), params)
+
+    def test_lists_bookings_of_every_user(self):
+        response = self.check(location="room 101", datetime="2026-03-02T09:05")
+        creators = [conflict["created_by"] for conflict in response.json()["conflicts"]]
+        self.assertEqual(len(creators), 4)  # Including the weekly occurrence.
+        self.assertIn(str(self.other), creators)
+
+    def test_shared_rooms_and_bad_input(self):
+        response = self.check(location="Main Hall", datetime="2026-03-02T09:05")
+        self.assertEqual(response.json()["conflicts"], [])
+        self.assertEqual(self.check(location="Room 101").status_code, 400)
+        self.assertEqual(self.check(location="Room 101", datetime="soon").status_code, 400)
+
+    def test_create_form_loads_the_warning(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("appointments:create"))
+        self.assertContains(response, "appointments/room_check.js")
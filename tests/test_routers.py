@@ -0,0 +1,20 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from ..routers import _read_alias, aon_primary, on_primary
+
+
+class PrimaryFillTests(SimpleTestCase):
+    def test_fills_read_from_the_primary(self):
+        token = _read_alias.set("replica")
+        try:
+            self.assertIsNone(on_primary(_read_alias.get)())
+
+            async def read():
+                return _read_alias.get()
+
+            self.assertIsNone(asyncio.run(aon_primary(read)()))
+            self.assertEqual(_read_alias.get(), "replica")
+        finally:
+            _read_alias.reset(token)
@@ -0,0 +1,29 @@
+from django.urls import reverse
+
+from .utils import AppointmentTestCase
+
+
+class TimelineTests(AppointmentTestCase):
+    def test_page_loads_tiles_on_zoom(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("appointments:timeline"))
+        self.assertContains(response, "appointments/timeline_tiles.js")
+        self.assertContains(response, 'data-chart-id="appointment-timeline"')
+        self.assertContains(response, "appointments/timeline_columnar.js")
+
+    def test_tiles_are_revalidated_by_etag(self):
+        self.client.force_login(self.user)
+        url = reverse("appointments:timeline")
+        response = self.client.get(url, {"tile": "2026-W10"})
+        self.assertTrue(response.has_header("ETag"))
+        response = self.client.get(
+            url, {"tile": "2026-W10"}, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_columnar_tiles(self):
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("appointments:timeline"), {"tile": "2026-W10", "format": "columnar"}
+        )
+        self.assertEqual(response.json()["data"]["format"], "columnar")
@@ -0,0 +1,20 @@
+from django.urls import reverse
+
+from .utils import AppointmentTestCase
+
+
+class TypeaheadTests(AppointmentTestCase):
+    def lookup(self, **params):
+        self.client.force_login(self.user)
+        return self.client.get(reverse("appointments:select"), params)
+
+    def test_prefix_match(self):
+        results = self.lookup(typeahead="fir").json()["results"]
+        self.assertEqual([row[0] for row in results], [self.first.pk])
+
+    def test_limit_is_clamped(self):
+        for limit in ("-1", "0"):
+            with self.subTest(limit=limit):
+                response = self.lookup(typeahead="", limit=limit)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()["results"]), 1)
@@ -0,0 +1,53 @@
+"""Shared fixtures for the appointment tests."""
+
+from datetime import datetime
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from ..management.commands._perf import create_users
+from ..models import Appointment, AppointmentOccurrenceException
+
+
+def at(*args):
+    """Aware local datetime, e.g. ``at(2026, 3, 2, 9)``."""
+    return timezone.make_aware(datetime(*args))
+
+
+def book(user, when, name="Meeting", location="Room 101", **fields):
+    return Appointment.objects.create(
+        created_by=user, name=name, location=location, datetime=when, **fields
+    )
+
+
+class AppointmentTestCase(TestCase):
+    """A small week of data around Monday 2 March 2026.
+
+    ``user`` has two overlapping bookings in Room 101 at 09:00 and 09:10, and
+    a weekly Monday series at 09:20 in the same room starting 23 February,
+    whose 9 March occurrence moved to 10 March. ``other`` books Room 101 at
+    09:15 on 2 March.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.other = create_users(2, prefix="test")
+        cls.admin = create_users(1, prefix="test-admin", is_superuser=True)[0]
+        cls.first = book(cls.user, at(2026, 3, 2, 9, 0), name="First")
+        cls.second = book(cls.user, at(2026, 3, 2, 9, 10), name="Second")
+        cls.foreign = book(cls.other, at(2026, 3, 2, 9, 15), name="Foreign")
+        cls.series = book(
+            cls.user,
+            at(2026, 2, 23, 9, 20),
+            name="Weekly",
+            recurrence="FREQ=WEEKLY;BYDAY=MO;COUNT=6",
+        )
+        AppointmentOccurrenceException.objects.create(
+            appointment=cls.series,
+            original_datetime=at(2026, 3, 9, 9, 20),
+            datetime=at(2026, 3, 10, 9, 20),
+        )
+
+    def setUp(self):
+        cache.clear()
@@ -0,0 +1,27 @@
+"""Fixed ISO-week tiles for incremental timeline fetching."""
+
+import re
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+TILE_RE = re.compile(r"^(\d{4})-W(\d{2})$")
+
+
+def parse_tile(value):
+    """Return the ``(start, end)`` aware datetimes of an ``YYYY-Www`` tile."""
+    match = TILE_RE.match(value or "")
+    if not match:
+        raise ValueError(f"Invalid tile {value!r}")
+    monday = datetime.fromisocalendar(int(match[1]), int(match[2]), 1).date()
+    start = timezone.make_aware(datetime.combine(monday, time.min))
+    end = timezone.make_aware(datetime.combine(monday + timedelta(days=7), time.min))
+    return start, end
+
+
+def tile_for(dt):
+    """Return the tile containing ``dt`` (interpreted in local time)."""
+    if timezone.is_aware(dt):
+        dt = timezone.localtime(dt)
+    year, week, _ = dt.isocalendar()
+    return f"{year}-W{week:02d}"
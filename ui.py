@@ -65,6 +65,11 @@ class AppointmentMenu(Component):
                     title="Appointments Timeline",
                     url=reverse_lazy("appointments:cards"),
                 ),
+                MenuItem(
+                    uid="appointment-menu-calendar",
+                    title="Appointments Calendar",
+                    url=reverse_lazy("appointments:calendar_page"),
+                ),
                 MenuItem(
                     uid="appointment-menu-create",
                     title="Create Appointment",
@@ -150,6 +155,11 @@ class AppointmentFilter(Component):
                     key="overlapping",
                     label="Overlaps",
                 ),
+                CheckboxInput(
+                    uid="appointment-filter-room-conflicts",
+                    key="room_conflicts",
+                    label="Room conflicts",
+                ),
                 Row(
                     uid="appointment-filter-actions",
                     classes="flex gap-2",
@@ -205,6 +215,12 @@ class AppointmentFormFields(Component):
                         ),
                     ],
                 ),
+                TextInput(
+                    uid="appointment-form-recurrence",
+                    key="recurrence",
+                    label="Repeats (e.g. FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10)",
+                    required=False,
+                ),
                 TextareaInput(
                     uid="appointment-form-remarks",
                     key="remarks",
@@ -273,7 +289,41 @@ class AppointmentUpdateForm(Component):
                     subtitle="Update appointment details",
                     classes="@container",
                     children=[
-                        UIRegistry.get("appointments.AppointmentFormFields")().build()
+                        ShowIf(
+                            uid="appointment-update-room-conflict-alert",
+                            key="room_conflicts",
+                            render_cond=lambda c, kwargs: bool(
+                                kwargs.get("room_conflicts")
+                            ),
+                            children=[
+                                Column(
+                                    classes="bg-warning rounded-box border border-base-300 mb-4 shadow-sm gap-4 p-4",
+                                    children=[
+                                        TextField(
+                                            uid="appointment-update-room-conflict-msg",
+                                            static_value="⚠️ Warning: This room is double-booked!",
+                                        ),
+                                        ListField(
+                                            uid="appointment-update-room-conflict-list",
+                                            key="room_conflicts",
+                                            children=[
+                                                Column(
+                                                    classes="text-sm bg-black/5 border border-black/10 p-1 px-2 rounded-md w-fit",
+                                                    children=[
+                                                        TextField(
+                                                            key="created_by",
+                                                            classes="font-bold",
+                                                        ),
+                                                        DateTimeField(key="datetime"),
+                                                    ],
+                                                )
+                                            ],
+                                        ),
+                                    ],
+                                )
+                            ],
+                        ),
+                        UIRegistry.get("appointments.AppointmentFormFields")().build(),
                     ],
                 )
             ],
@@ -335,7 +385,7 @@ class AppointmentTable(Component):
                             children=[
                                 TextField(
                                     uid="appointment-col-phone-field",
-                                    key="phone",
+                                    key="phone_display",
                                 )
                             ],
                         ),
@@ -436,6 +486,42 @@ class AppointmentDetail(Component):
                                         )
                                     ],
                                 ),
+                                ShowIf(
+                                    uid="appointment-detail-room-conflict-alert",
+                                    key="room_conflicts",
+                                    render_cond=lambda c, kwargs: bool(
+                                        kwargs.get("room_conflicts")
+                                    ),
+                                    children=[
+                                        Column(
+                                            classes="bg-warning rounded-box border border-base-300 mb-4 shadow-sm gap-4 p-4",
+                                            children=[
+                                                TextField(
+                                                    uid="room-conflict-warning-msg",
+                                                    static_value="⚠️ Warning: This room is double-booked!",
+                                                ),
+                                                ListField(
+                                                    uid="appointment-detail-room-conflict-list",
+                                                    key="room_conflicts",
+                                                    children=[
+                                                        Column(
+                                                            classes="text-sm bg-black/5 border border-black/10 p-1 px-2 rounded-md w-fit",
+                                                            children=[
+                                                                TextField(
+                                                                    key="created_by",
+                                                                    classes="font-bold",
+                                                                ),
+                                                                DateTimeField(
+                                                                    key="datetime"
+                                                                ),
+                                                            ],
+                                                        )
+                                                    ],
+                                                ),
+                                            ],
+                                        )
+                                    ],
+                                ),
                                 TitleField(
                                     uid="appointment-detail-name",
                                     key="name",
@@ -451,7 +537,7 @@ class AppointmentDetail(Component):
                                     children=[
                                         TextField(
                                             uid="appointment-detail-phone",
-                                            key="phone",
+                                            key="phone_display",
                                         )
                                     ],
                                 ),
@@ -466,6 +552,17 @@ class AppointmentDetail(Component):
                                         )
                                     ],
                                 ),
+                                InlineLabel(
+                                    uid="appointment-detail-recurrence-label",
+                                    title="Repeats",
+                                    classes="mt-2",
+                                    children=[
+                                        TextField(
+                                            uid="appointment-detail-recurrence-field",
+                                            key="recurrence",
+                                        )
+                                    ],
+                                ),
                                 InlineLabel(
                                     uid="appointment-detail-created-by-label",
                                     title="Created By",
@@ -573,7 +670,7 @@ class AppointmentSelectionTable(Component):
                             children=[
                                 TextField(
                                     uid="appointment-sel-phone-field",
-                                    key="phone",
+                                    key="phone_display",
                                 )
                             ],
                         ),
@@ -681,7 +778,7 @@ class AppointmentCardTimeline(Component):
                                     children=[
                                         TextField(
                                             uid="appointment-card-phone-field",
-                                            key="phone",
+                                            key="phone_display",
                                         )
                                     ],
                                 ),
@@ -719,6 +816,9 @@ class AppointmentTimeline(Component):
                     )().build(),
                     options={
                         "chart": {
+                            # Looked up by timeline_tiles.js to load tiles on
+                            # zoom and scroll.
+                            "id": "appointment-timeline",
                             "zoom": {
                                 "enabled": True,
                                 "type": "x",
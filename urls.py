@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.urls import path
 from lariv.registry import ViewRegistry
-from . import views  # noqa: F401 - ensures views are registered
+from . import live, views  # noqa: F401 - ensures views are registered
 
 AppointmentList = ViewRegistry.get("appointments.AppointmentList")
 AppointmentView = ViewRegistry.get("appointments.AppointmentView")
@@ -8,19 +9,48 @@ AppointmentCreate = ViewRegistry.get("appointments.AppointmentCreate")
 AppointmentUpdate = ViewRegistry.get("appointments.AppointmentUpdate")
 AppointmentDelete = ViewRegistry.get("appointments.AppointmentDelete")
 AppointmentSelectionTable = ViewRegistry.get("appointments.AppointmentSelectionTable")
+AppointmentBulkAction = ViewRegistry.get("appointments.AppointmentBulkAction")
+AppointmentChanges = ViewRegistry.get("appointments.AppointmentChanges")
+AppointmentCardStream = ViewRegistry.get("appointments.AppointmentCardStream")
+AppointmentPhoneLookup = ViewRegistry.get("appointments.AppointmentPhoneLookup")
+AppointmentRoomCheck = ViewRegistry.get("appointments.AppointmentRoomCheck")
+AppointmentReport = ViewRegistry.get("appointments.AppointmentReport")
+AppointmentCalendar = ViewRegistry.get("appointments.AppointmentCalendar")
+AppointmentCalendarPage = ViewRegistry.get("appointments.AppointmentCalendarPage")
 
 AppointmentTimeline = ViewRegistry.get("appointments.AppointmentTimeline")
 AppointmentCardTimeline = ViewRegistry.get("appointments.AppointmentCardTimeline")
 
+if getattr(settings, "APPOINTMENTS_ASYNC_VIEWS", False):
+    AppointmentList = ViewRegistry.get("appointments.AppointmentListAsync")
+    AppointmentTimeline = ViewRegistry.get("appointments.AppointmentTimelineAsync")
+    AppointmentCardTimeline = ViewRegistry.get(
+        "appointments.AppointmentCardTimelineAsync"
+    )
+
 app_name = "appointments"
 
 urlpatterns = [
     path("", AppointmentList.as_view(), name="default"),
     path("timeline/", AppointmentTimeline.as_view(), name="timeline"),
     path("cards/", AppointmentCardTimeline.as_view(), name="cards"),
+    path("calendar/", AppointmentCalendar.as_view(), name="calendar"),
+    path("calendar/page/", AppointmentCalendarPage.as_view(), name="calendar_page"),
     path("create/", AppointmentCreate.as_view(), name="create"),
     path("<int:pk>/", AppointmentView.as_view(), name="detail"),
     path("<int:pk>/update/", AppointmentUpdate.as_view(), name="update"),
     path("<int:pk>/delete/", AppointmentDelete.as_view(), name="delete"),
     path("select/", AppointmentSelectionTable.as_view(), name="select"),
+    path("bulk/", AppointmentBulkAction.as_view(), name="bulk"),
+    path("changes/", AppointmentChanges.as_view(), name="changes"),
+    path("phone/", AppointmentPhoneLookup.as_view(), name="phone_lookup"),
+    path("room-check/", AppointmentRoomCheck.as_view(), name="room_check"),
+    path("reports/", AppointmentReport.as_view(), name="reports"),
 ]
+
+if live.streams_enabled():
+    # Each open stream holds a WSGI worker thread, so streams follow the
+    # async views unless APPOINTMENTS_CARD_STREAMS says otherwise.
+    urlpatterns.append(
+        path("cards/stream/", AppointmentCardStream.as_view(), name="cards_stream")
+    )
@@ -1,6 +1,8 @@
 from django.urls import reverse, reverse_lazy
-from datetime import date
+from datetime import date, timedelta
 from django.core.exceptions import PermissionDenied
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.views import View
 from lariv.mixins import (
     ListViewMixin,
     DetailViewMixin,
@@ -11,76 +13,377 @@ from lariv.mixins import (
     apply_filters,
 )
 from lariv.registry import ViewRegistry
-from .models import Appointment
+from . import live, reminders
+from .async_views import AsyncDataMixin, apaginate
+from .coalesce import CoalescedReadMixin, acoalesced, coalesced, scope_for
+from .instrumentation import QueryBudgetMixin, ensure_rendered
+from .models import (
+    DEFAULT_SORT,
+    OVERLAP_WINDOW,
+    SORTABLE_FIELDS,
+    Appointment,
+    AppointmentChange,
+    is_admin,
+    room_key_for,
+)
+from .recurrence import OccurrenceWindowMixin, merge_by_datetime
+from .routers import PrimaryStickyMixin, ReplicaReadMixin, aon_primary, on_primary
 
 
 
 @ViewRegistry.register("appointments.AppointmentList")
-class AppointmentList(ListViewMixin):
+class AppointmentList(
+    QueryBudgetMixin, ReplicaReadMixin, OccurrenceWindowMixin, ListViewMixin
+):
     model = Appointment
     component = "appointments.AppointmentTable"
     key = "appointments"
+    query_budget = 5
 
-    def prepare_data(self, request, **kwargs):
+    def get_query_budget(self):
+        return self.query_budget + self.get_window_allowance()
+
+    def get_scope_queryset(self):
+        return self.get_queryset().for_user(self.request.user)
+
+    def get_filtered_queryset(self, request):
+        """Return the scoped, filtered queryset and the requested page number.
+
+        With a ``date`` filter the queryset holds that day's concrete rows and
+        the day's recurring occurrences are added by ``with_occurrences``.
+        """
         from django.db.models import Exists, OuterRef
-        from django.core.paginator import Paginator
+        from .recurrence import day_window
 
-        queryset = self.get_queryset()
+        queryset = self.get_scope_queryset().select_related("created_by")
         get_params = request.GET.dict()
-        if not (
-            self.request.user.is_superuser
-            or self.request.user.role in ["totschool_admin"]
-        ):
-            queryset = queryset.filter(created_by=self.request.user)
 
+        window = None
         date_value = get_params.pop("date", None)
         if date_value:
-            from django.db.models import Q
-            queryset = queryset.filter(datetime__date=date_value)
+            try:
+                window = day_window(date_value)
+            except ValueError:
+                queryset = queryset.filter(datetime__date=date_value)
 
         page_number = get_params.pop("page", 1)
-        sort = get_params.pop("sort", None)
-        if sort is not None:
-            queryset = queryset.order_by(sort)
+        queryset = queryset.order_by(*self.get_sort_ordering(get_params.pop("sort", None)))
 
         # Handle overlapping appointments filter
-        show_overlapping = get_params.pop("overlapping", None)
-        if show_overlapping in ("true", "True", "1", True):
-            from datetime import timedelta
+        show_overlapping = get_params.pop("overlapping", None) in ("true", "True", "1", True)
+        if show_overlapping and window is None:
             overlapping_subquery = Appointment.objects.filter(
                 created_by=OuterRef("created_by"),
-                datetime__gt=OuterRef("datetime") - timedelta(minutes=30),
-                datetime__lt=OuterRef("datetime") + timedelta(minutes=30),
+                datetime__gt=OuterRef("datetime") - OVERLAP_WINDOW,
+                datetime__lt=OuterRef("datetime") + OVERLAP_WINDOW,
             ).exclude(pk=OuterRef("pk"))
             queryset = queryset.annotate(
                 has_overlap=Exists(overlapping_subquery)
             ).filter(has_overlap=True)
 
+        show_room_conflicts = get_params.pop("room_conflicts", None) in ("true", "True", "1", True)
+        if show_room_conflicts and window is None:
+            from .models import shared_rooms
+            room_subquery = Appointment.objects.filter(
+                room_key=OuterRef("room_key"),
+                datetime__gt=OuterRef("datetime") - OVERLAP_WINDOW,
+                datetime__lt=OuterRef("datetime") + OVERLAP_WINDOW,
+            ).exclude(pk=OuterRef("pk"))
+            queryset = (
+                queryset.exclude(room_key="")
+                .exclude(room_key__in=shared_rooms())
+                .annotate(has_room_conflict=Exists(room_subquery))
+                .filter(has_room_conflict=True)
+            )
+
         queryset = apply_filters(queryset, get_params, self.model)
 
+        if window is not None:
+            queryset = self.window_queryset(
+                queryset,
+                *window,
+                overlapping=show_overlapping,
+                room_conflicts=show_room_conflicts,
+            )
+
+        return queryset, page_number
+
+    def get_sort_ordering(self, sort):
+        """``order_by`` arguments for a ``sort`` key.
+
+        Only ``SORTABLE_FIELDS`` are accepted, each backed by an index ending
+        in ``id``; anything else falls back to ``DEFAULT_SORT``, so a request
+        can never ask for an unindexed sort of the whole filtered set.
+        """
+        if (sort or "").lstrip("-") not in SORTABLE_FIELDS:
+            sort = DEFAULT_SORT
+        prefix = "-" if sort.startswith("-") else ""
+        return [prefix + SORTABLE_FIELDS[sort.lstrip("-")], prefix + "pk"]
+
+    def get_page_items(self, appointments):
+        """Merge a windowed day's occurrences, keeping the requested order."""
+        items = self.with_occurrences(appointments)
+        field, _ = self.get_sort_ordering(self.request.GET.get("sort"))
+        items.sort(
+            key=lambda appt: (getattr(appt, field.lstrip("-")) or "", appt.pk),
+            reverse=field.startswith("-"),
+        )
+        return items
+
+    def prepare_data(self, request, **kwargs):
+        from django.core.paginator import Paginator
+
+        queryset, page_number = self.get_filtered_queryset(request)
+        if self.occurrence_window is not None:
+            # A single day is small, so it is materialized and paginated in memory.
+            queryset = self.get_page_items(queryset.order_by("datetime"))
+
         paginator = Paginator(queryset, self.get_paginate_by(request))
         page = paginator.page(page_number)
 
         return {self.get_key(): page}
 
+    async def aprepare_data(self, request, **kwargs):
+        from django.core.paginator import Paginator
+        from asgiref.sync import sync_to_async
+
+        queryset, page_number = self.get_filtered_queryset(request)
+        if self.occurrence_window is not None:
+            items = await sync_to_async(self.get_page_items)(
+                [appt async for appt in queryset.order_by("datetime").aiterator()]
+            )
+            page = Paginator(items, self.get_paginate_by(request)).page(page_number)
+        else:
+            page = await apaginate(queryset, self.get_paginate_by(request), page_number)
+
+        return {self.get_key(): page}
+
+    def get(self, request, *args, **kwargs):
+        # The bulk actions toolbar posts the checked rows, or the current
+        # filters with ``select_all``, to ``AppointmentBulkAction``.
+        response = ensure_rendered(super().get(request, *args, **kwargs))
+        return self.append_bulk_actions(request, response)
+
+    def append_bulk_actions(self, request, response):
+        from django.template.loader import render_to_string
+
+        if response.status_code != 200 or not response.get(
+            "Content-Type", ""
+        ).startswith("text/html"):
+            return response
+        query = request.GET.urlencode()
+        response.content += render_to_string(
+            "p_totschool_appointment_tracker/bulk_actions.html",
+            {
+                "bulk_url": reverse("appointments:bulk") + (f"?{query}" if query else ""),
+                "detail_url": reverse("appointments:detail", kwargs={"pk": 0}),
+                "can_reassign": is_admin(request.user),
+            },
+            request=request,
+        ).encode(response.charset)
+        if response.has_header("Content-Length"):
+            response["Content-Length"] = str(len(response.content))
+        return response
+
 
 @ViewRegistry.register("appointments.AppointmentView")
-class AppointmentView(DetailViewMixin):
+class AppointmentView(QueryBudgetMixin, DetailViewMixin):
     model = Appointment
     component = "appointments.AppointmentDetail"
     key = "appointment"
+    query_budget = 3
+    # The exceptions of the series near the appointment, whether or not any
+    # turn out to be there, so the budget does not depend on the data.
+    series_allowance = 1
+
+    def get_query_budget(self):
+        return self.query_budget + self.series_allowance
+
+    def get_queryset(self):
+        return super().get_queryset().for_user(self.request.user)
+
+    def get_object(self, queryset=None):
+        """Load the appointment, its user, its overlaps and its room
+        conflicts in one query.
+
+        The target row is matched through the (possibly scoped) view queryset;
+        its same-user and same-room neighbours inside the overlap window, and
+        the series masters of either that may recur there, are selected with
+        correlated subqueries on that row, so no second round-trip is needed.
+        Only when a series is among them are its exceptions loaded, in one
+        more query.
+        """
+        from datetime import timedelta
+        from django.db.models import Q, Subquery
+        from django.http import Http404
+        from .models import shared_rooms
+        from .recurrence import load_exceptions, series_filter
+
+        if queryset is None:
+            queryset = self.get_queryset()
+        pk = self.kwargs.get("pk")
+        target = queryset.filter(pk=pk)
+        target_datetime = Subquery(target.values("datetime")[:1])
+        low = target_datetime - OVERLAP_WINDOW
+        high = target_datetime + OVERLAP_WINDOW
+        neighbours = Q(datetime__gte=low, datetime__lte=high) | series_filter(
+            low, high + timedelta(microseconds=1)
+        )
+
+        rows = list(
+            Appointment.objects.select_related("created_by")
+            .filter(
+                Q(pk__in=target.values("pk"))
+                | (Q(created_by=Subquery(target.values("created_by")[:1])) & neighbours)
+                | (
+                    Q(room_key=Subquery(target.values("room_key")[:1]))
+                    & ~Q(room_key="")
+                    & ~Q(room_key__in=shared_rooms())
+                    & neighbours
+                )
+            )
+            .order_by("datetime")
+        )
+
+        appointment = next((row for row in rows if row.pk == int(pk)), None)
+        if appointment is None:
+            raise Http404("No appointment found matching the query")
+        load_exceptions(
+            [row for row in rows if row.recurrence],
+            appointment.datetime - OVERLAP_WINDOW,
+            appointment.datetime + OVERLAP_WINDOW + timedelta(microseconds=1),
+        )
+
+        self.overlapping_appointments = [
+            row
+            for row in rows
+            if row.pk != appointment.pk
+            and not row.recurrence
+            and row.created_by_id == appointment.created_by_id
+            and abs(row.datetime - appointment.datetime) <= OVERLAP_WINDOW
+        ]
+        occurrences = appointment.get_overlapping_occurrences(loaded=rows)
+        if occurrences:
+            self.overlapping_appointments = merge_by_datetime(
+                self.overlapping_appointments, occurrences
+            )
+        self.room_conflicts = appointment.get_room_conflicts(loaded=rows)
+        return appointment
 
     def prepare_data(self, request, **kwargs):
         data = super().prepare_data(request, **kwargs)
         appointment = data[self.get_key()]
-        overlapping = appointment.get_overlapping_appointments()
-        if overlapping.exists():
+        overlapping = getattr(self, "overlapping_appointments", None)
+        if overlapping is None:
+            overlapping = merge_by_datetime(
+                appointment.get_overlapping_appointments().order_by("datetime"),
+                appointment.get_overlapping_occurrences(),
+            )
+        if overlapping:
             data["overlapping_appointments"] = overlapping
+        room_conflicts = getattr(self, "room_conflicts", None)
+        if room_conflicts is None:
+            room_conflicts = appointment.get_room_conflicts()
+        if room_conflicts:
+            data["room_conflicts"] = room_conflicts
         return data
 
+    def get(self, request, *args, **kwargs):
+        """Serve HTMX fragment requests from a per-object render cache.
+
+        Entries are keyed on the appointment's detail generation, which is
+        bumped when the appointment or any neighbour in its overlap window is
+        written, so a cached fragment never shows stale overlaps.
+        """
+        from django.conf import settings
+        from django.core.cache import cache
+        from django.http import HttpResponse
+        from .caching import get_generation
+
+        if not request.headers.get("HX-Request"):
+            return super().get(request, *args, **kwargs)
+
+        pk = self.kwargs.get("pk")
+        cache_key = ":".join(
+            [
+                "appointments:detail",
+                str(pk),
+                str(get_generation("detail", pk)),
+                str(get_generation("series")),
+                str(request.user.pk),
+                request.headers.get("HX-Target", ""),
+            ]
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            content, headers = cached
+            response = HttpResponse(content)
+            for header, value in headers:
+                response[header] = value
+            return response
+
+        response = ensure_rendered(super().get(request, *args, **kwargs))
+        if response.status_code == 200 and not response.streaming:
+            headers = [
+                (header, value)
+                for header, value in response.items()
+                if header not in ("Content-Length", "Server-Timing", "Set-Cookie")
+            ]
+            cache.set(
+                cache_key,
+                (response.content, headers),
+                getattr(settings, "APPOINTMENTS_DETAIL_CACHE_TIMEOUT", 600),
+            )
+        return response
+
+
+class RoomConflictValidationMixin:
+    """Room double-bookings on create and update.
+
+    Conflicts are surfaced, not enforced: the detail page and the edit form
+    warn about them. Deployments that want hard rejection set
+    ``APPOINTMENTS_BLOCK_ROOM_CONFLICTS``; even then only a change of
+    location or time is checked, so an existing double booking can still be
+    edited.
+    """
+
+    def validate_room(self, cleaned_data, errors, instance=None):
+        from datetime import datetime
+        from django.conf import settings
+        from django.utils import timezone
+
+        if not getattr(settings, "APPOINTMENTS_BLOCK_ROOM_CONFLICTS", False):
+            return errors
+        location = cleaned_data.get("location")
+        start = cleaned_data.get("datetime")
+        if errors or not location or not isinstance(start, datetime):
+            return errors
+        if instance is not None and instance.pk and (
+            room_key_for(location) == instance.room_key and start == instance.datetime
+        ):
+            return errors
+
+        candidate = Appointment(
+            pk=instance.pk if instance is not None else None,
+            location=location,
+            datetime=start,
+        )
+        conflicts = candidate.get_room_conflicts()
+        if conflicts:
+            other = conflicts[0]
+            when = timezone.localtime(other.datetime) if timezone.is_aware(other.datetime) else other.datetime
+            errors = errors or {}
+            errors["location"] = (
+                f"{other.location} is already booked at {when:%H:%M on %d %b} "
+                f"by {other.created_by}."
+            )
+        return errors
+
 
 @ViewRegistry.register("appointments.AppointmentCreate")
-class AppointmentCreate(PostFormViewMixin):
+class AppointmentCreate(
+    QueryBudgetMixin, PrimaryStickyMixin, RoomConflictValidationMixin, PostFormViewMixin
+):
     model = Appointment
     component = "appointments.AppointmentCreateForm"
     key = "appointment"
@@ -88,25 +391,61 @@ class AppointmentCreate(PostFormViewMixin):
     def validate(self, data, inputs, instance=None):
         data["created_by"] = self.request.user.id
         cleaned_data, errors = super().validate(data, inputs, instance)
+        errors = self.validate_room(cleaned_data, errors, instance)
 
         return cleaned_data, errors
 
+    def get(self, request, *args, **kwargs):
+        # The form warns about room double-bookings as location and time are
+        # filled in, without blocking the save (see AppointmentRoomCheck).
+        from django.template.loader import render_to_string
+
+        response = ensure_rendered(super().get(request, *args, **kwargs))
+        if response.status_code != 200 or not response.get(
+            "Content-Type", ""
+        ).startswith("text/html"):
+            return response
+        response.content += render_to_string(
+            "p_totschool_appointment_tracker/room_check.html",
+            {"check_url": reverse("appointments:room_check")},
+        ).encode(response.charset)
+        if response.has_header("Content-Length"):
+            response["Content-Length"] = str(len(response.content))
+        return response
+
     def get_success_url(self, obj):
         return reverse("appointments:detail", kwargs={"pk": obj.pk})
 
 
 @ViewRegistry.register("appointments.AppointmentUpdate")
-class AppointmentUpdate(PostFormViewMixin):
+class AppointmentUpdate(
+    QueryBudgetMixin, PrimaryStickyMixin, RoomConflictValidationMixin, PostFormViewMixin
+):
     model = Appointment
     component = "appointments.AppointmentUpdateForm"
     key = "appointment"
 
+    def get_queryset(self):
+        return super().get_queryset().for_user(self.request.user)
+
+    def prepare_data(self, request, **kwargs):
+        data = super().prepare_data(request, **kwargs)
+        appointment = data.get(self.get_key())
+        if appointment is not None and appointment.pk:
+            room_conflicts = appointment.get_room_conflicts()
+            if room_conflicts:
+                data["room_conflicts"] = room_conflicts
+        return data
+
     def validate(self, data, inputs, instance=None):
-        if not (self.request.user.is_superuser or instance.created_by is not self.request.user):
+        if instance is None or not (
+            is_admin(self.request.user) or instance.created_by_id == self.request.user.pk
+        ):
             raise PermissionDenied("You cannot perform this action")
 
         data["created_by"] = self.request.user.id
         cleaned_data, errors = super().validate(data, inputs, instance)
+        errors = self.validate_room(cleaned_data, errors, instance)
 
         return cleaned_data, errors
 
@@ -115,43 +454,533 @@ class AppointmentUpdate(PostFormViewMixin):
 
 
 @ViewRegistry.register("appointments.AppointmentDelete")
-class AppointmentDelete(DeleteViewMixin):
+class AppointmentDelete(QueryBudgetMixin, PrimaryStickyMixin, DeleteViewMixin):
     model = Appointment
     component = "appointments.AppointmentDeleteForm"
     key = "appointment"
     success_url = reverse_lazy("appointments:default")
 
     def get_queryset(self):
-        if not (self.request.user.is_superuser or self.request.user.role in ["totschool_admin"]):
-            return super().get_queryset().filter(created_by=self.request.user)
-        return super().get_queryset()
+        return super().get_queryset().for_user(self.request.user)
+
+
+@ViewRegistry.register("appointments.AppointmentBulkAction")
+class AppointmentBulkAction(LoginRequiredMixin, PrimaryStickyMixin, View):
+    """Apply delete, reassign or date-shift to many appointments at once.
+
+    POST ``action`` plus either ``pks`` or ``select_all=true``; with
+    ``select_all`` the list filters in the query string pick the rows, exactly
+    as ``AppointmentList`` would. Each action is a single UPDATE/DELETE under
+    the same scoping as ``AppointmentDelete``, followed by one ordered sweep
+    that reports any overlaps the change produced.
+    """
+
+    http_method_names = ["post"]
+    actions = ("delete", "reassign", "shift")
+
+    def get_queryset(self):
+        return Appointment.objects.for_user(self.request.user)
+
+    def get_target_queryset(self, request):
+        queryset = self.get_queryset()
+        if request.POST.get("select_all") in ("true", "True", "1"):
+            list_view = AppointmentList()
+            list_view.setup(request)
+            filtered, _ = list_view.get_filtered_queryset(request)
+            if list_view.occurrence_window is not None:
+                # With a date window the overlap and room-conflict filters
+                # run in memory, so target exactly the stored rows the list
+                # shows. Occurrences are never targeted; like the SQL path,
+                # only concrete rows are.
+                shown = list_view.with_occurrences(filtered.order_by("datetime"))
+                pks = [
+                    appt.pk for appt in shown if not getattr(appt, "is_occurrence", False)
+                ]
+                return queryset.filter(pk__in=pks)
+            return queryset.filter(pk__in=filtered.values("pk"))
+
+        pks = [pk for pk in request.POST.getlist("pks") if pk.isdigit()]
+        return queryset.filter(pk__in=pks)
+
+    def post(self, request, *args, **kwargs):
+        from django.conf import settings
+        from django.db import transaction
+        from django.db.models import F
+        from django.http import HttpResponseBadRequest, JsonResponse
+        from datetime import timedelta
+        from users.models import User
+        from .caching import bump_generation
+        from .models import AppointmentOccurrenceException
+        from .signals import (
+            bulk_write,
+            invalidate_room_spans,
+            invalidate_spans,
+            queryset_room_spans,
+            queryset_spans,
+        )
+
+        action = request.POST.get("action")
+        if action not in self.actions:
+            return HttpResponseBadRequest("Unknown bulk action")
+
+        changes = {}
+        if action == "reassign":
+            if not is_admin(request.user):
+                raise PermissionDenied("You cannot perform this action")
+            created_by = request.POST.get("created_by", "")
+            target_user = (
+                User.objects.filter(pk=created_by).first() if created_by.isdigit() else None
+            )
+            if target_user is None:
+                return HttpResponseBadRequest("Unknown user")
+            changes["created_by"] = target_user
+        elif action == "shift":
+            max_days = getattr(settings, "APPOINTMENTS_BULK_SHIFT_MAX_DAYS", 3660)
+            try:
+                days = int(request.POST.get("days", ""))
+            except ValueError:
+                return HttpResponseBadRequest("days must be an integer")
+            if abs(days) > max_days:
+                # Also keeps the shifted datetimes inside what the database
+                # and timedelta can represent.
+                return HttpResponseBadRequest(
+                    f"days must be between -{max_days} and {max_days}"
+                )
+            shift = timedelta(days=days)
+            changes["datetime"] = F("datetime") + shift
+            changes["recurrence_end"] = F("recurrence_end") + shift
+            changes["reminder_due_at"] = reminders.shifted_due(shift)
+            changes["reminder_sent_at"] = None
+
+        queryset = self.get_target_queryset(request)
+        with transaction.atomic(), bulk_write():
+            spans = queryset_spans(queryset)
+            room_spans = queryset_room_spans(queryset)
+            rows = list(queryset.values_list("pk", "created_by_id", "recurrence"))
+            owners = {pk: owner for pk, owner, _ in rows}
+            series = [pk for pk, _, recurrence in rows if recurrence]
+            pks = list(owners)
+            if action == "delete":
+                count = self.delete_in_batches(pks)
+                AppointmentChange.objects.bulk_create(
+                    AppointmentChange(
+                        appointment_id=pk, owner_id=owner, operation=AppointmentChange.DELETE
+                    )
+                    for pk, owner in owners.items()
+                )
+                pks = []
+            else:
+                updated = Appointment.objects.filter(pk__in=pks)
+                count = updated.update(**changes)
+                if action == "shift" and series:
+                    # No per-exception change rows: each master gets its
+                    # update row below, which covers its moved exceptions.
+                    AppointmentOccurrenceException.objects.filter(
+                        appointment__in=series
+                    ).update(
+                        original_datetime=F("original_datetime") + shift,
+                        datetime=F("datetime") + shift,
+                    )
+                spans += queryset_spans(updated)
+                room_spans += queryset_room_spans(updated)
+                AppointmentChange.objects.bulk_create(
+                    change
+                    for appointment in updated.iterator()
+                    for change in AppointmentChange.for_save(
+                        appointment, False, owners[appointment.pk]
+                    )
+                )
+            overlaps = self.find_overlaps(pks, spans)
+            room_conflicts = self.find_room_conflicts(pks, room_spans)
+
+        resync = live.resync_events(spans)
+
+        def invalidate():
+            invalidate_spans(spans, pks)
+            invalidate_room_spans(room_spans)
+            if series:
+                bump_generation("series")
+            if action == "shift":
+                reminders.wake()
+            live.publish(resync)
+
+        transaction.on_commit(invalidate)
+        response = JsonResponse(
+            {
+                "action": action,
+                "count": count,
+                "overlaps": overlaps,
+                "room_conflicts": room_conflicts,
+            }
+        )
+        if request.headers.get("HX-Request"):
+            response["HX-Refresh"] = "true"
+        return response
+
+    def delete_in_batches(self, pks, batch_size=1000):
+        """Delete appointments ``pks`` in pk batches; returns how many went.
+
+        Each batch goes through Django's deletion collector, so every model
+        pointing at an appointment (exceptions, letters, and tables of other
+        apps such as generated letters) is cascaded or protected as its
+        foreign key says. The per-row signal receivers of this app stand down
+        under ``bulk_write``; the caller invalidates once on commit.
+        """
+        count = 0
+        for start in range(0, len(pks), batch_size):
+            batch = pks[start:start + batch_size]
+            _, deleted = Appointment.objects.filter(pk__in=batch).delete()
+            count += deleted.get(Appointment._meta.label, 0)
+        return count
+
+    def find_room_conflicts(self, pks, room_spans):
+        """Pairs involving ``pks`` booked in the same room, from one ordered
+        scan of the ``(room_key, datetime)`` index."""
+        from django.db.models import Q
+        from .models import shared_rooms
+        from .overlaps import sweep_overlaps
+
+        room_spans = [span for span in room_spans if span[0] not in shared_rooms()]
+        if not pks or not room_spans:
+            return []
+        pks = set(pks)
+        scan = Q()
+        for room_key, low, high in room_spans:
+            scan |= Q(
+                room_key=room_key,
+                datetime__gt=low - OVERLAP_WINDOW,
+                datetime__lt=high + OVERLAP_WINDOW,
+            )
+        rows = (
+            Appointment.objects.filter(scan)
+            .order_by("room_key", "datetime")
+            .values_list("room_key", "datetime", "pk")
+        )
+        return [
+            [a, b] for a, b in sweep_overlaps(rows.iterator()) if a in pks or b in pks
+        ]
+
+    def find_overlaps(self, pks, spans):
+        """Overlapping pairs involving ``pks``, from one ordered range scan."""
+        from django.db.models import Q
+        from .overlaps import sweep_overlaps
+        from .recurrence import expand_series, series_in_window
+
+        if not pks:
+            return []
+        pks = set(pks)
+        scan = Q()
+        for user_id, low, high in spans:
+            scan |= Q(
+                created_by_id=user_id,
+                datetime__gt=low - OVERLAP_WINDOW,
+                datetime__lt=high + OVERLAP_WINDOW,
+            )
+        rows = list(
+            Appointment.objects.filter(scan, recurrence="").values_list(
+                "created_by_id", "datetime", "pk"
+            )
+        )
+        low = min(span[1] for span in spans) - OVERLAP_WINDOW
+        high = max(span[2] for span in spans) + OVERLAP_WINDOW
+        masters = series_in_window(
+            Appointment.objects.filter(created_by_id__in={span[0] for span in spans}),
+            low,
+            high,
+        )
+        rows += [
+            (occurrence.created_by_id, occurrence.datetime, occurrence.pk)
+            for occurrence in expand_series(masters, low, high)
+        ]
+        rows.sort(key=lambda row: (row[0], row[1]))
+        pairs = {
+            (a, b) for a, b in sweep_overlaps(rows) if a != b and (a in pks or b in pks)
+        }
+        return [[a, b] for a, b in sorted(pairs)]
+
+
+@ViewRegistry.register("appointments.AppointmentChanges")
+class AppointmentChanges(LoginRequiredMixin, View):
+    """Delta-sync feed: changes after ``cursor``, oldest first, in bounded pages.
+
+    Consumers store the returned ``cursor`` and pass it back to receive only
+    what changed since, so a sync costs O(changes) rather than a full read.
+
+    Ids are allocated at insert but concurrent transactions commit out of
+    order, so a consumer that saw id N+1 could skip a later-committing N.
+    Only rows older than ``APPOINTMENTS_CHANGES_SAFETY_LAG`` seconds are
+    served; writes to appointments must commit within that lag.
+    """
+
+    http_method_names = ["get"]
+
+    def get(self, request, *args, **kwargs):
+        from datetime import timedelta
+        from django.conf import settings
+        from django.http import HttpResponseBadRequest, JsonResponse
+        from django.utils import timezone
+
+        max_limit = getattr(settings, "APPOINTMENTS_CHANGES_PAGE_SIZE", 500)
+        try:
+            cursor = int(request.GET.get("cursor", 0))
+            limit = max(1, min(int(request.GET.get("limit", max_limit)), max_limit))
+        except ValueError:
+            return HttpResponseBadRequest("cursor and limit must be integers")
+
+        settled = timezone.now() - timedelta(
+            seconds=getattr(settings, "APPOINTMENTS_CHANGES_SAFETY_LAG", 5)
+        )
+        queryset = AppointmentChange.objects.for_user(request.user).filter(
+            id__gt=cursor, changed_at__lt=settled
+        )
+
+        rows = list(
+            queryset.order_by("id").values_list(
+                "id", "operation", "appointment_id", "changed_at", "data"
+            )[: limit + 1]
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return JsonResponse(
+            {
+                "changes": [
+                    {
+                        "seq": seq,
+                        "op": operation,
+                        "id": appointment_id,
+                        "at": changed_at.isoformat(),
+                        "data": data,
+                    }
+                    for seq, operation, appointment_id, changed_at, data in rows
+                ],
+                "cursor": rows[-1][0] if rows else cursor,
+                "has_more": has_more,
+            }
+        )
+
+
+@ViewRegistry.register("appointments.AppointmentRoomCheck")
+class AppointmentRoomCheck(LoginRequiredMixin, View):
+    """Bookings a ``location`` would clash with at ``datetime``, as JSON.
+
+    Backs the create form's room warning. Like the detail page it only
+    informs: saving is blocked solely under ``APPOINTMENTS_BLOCK_ROOM_CONFLICTS``.
+    """
+
+    http_method_names = ["get"]
+
+    def get(self, request, *args, **kwargs):
+        from django.conf import settings
+        from django.http import HttpResponseBadRequest, JsonResponse
+        from django.utils import timezone
+        from django.utils.dateparse import parse_datetime
+
+        location = request.GET.get("location", "").strip()
+        try:
+            start = parse_datetime(request.GET.get("datetime", ""))
+        except ValueError:
+            start = None
+        if not location or start is None:
+            return HttpResponseBadRequest("location and datetime are required")
+        if settings.USE_TZ and timezone.is_naive(start):
+            start = timezone.make_aware(start)
+
+        conflicts = Appointment(location=location, datetime=start).get_room_conflicts()
+        return JsonResponse(
+            {
+                "conflicts": [
+                    {
+                        "created_by": str(other.created_by),
+                        "location": other.location,
+                        "datetime": other.datetime.isoformat(),
+                    }
+                    for other in conflicts
+                ]
+            }
+        )
+
+
+@ViewRegistry.register("appointments.AppointmentPhoneLookup")
+class AppointmentPhoneLookup(LoginRequiredMixin, View):
+    """Find appointments by caller phone number, most recent first.
+
+    The number is normalized to E.164 and matched on the indexed
+    ``phone_e164`` key, so any input format finds the same rows.
+    """
+
+    http_method_names = ["get"]
+
+    def get(self, request, *args, **kwargs):
+        from django.conf import settings
+        from django.http import HttpResponseBadRequest, JsonResponse
+        from .phones import normalize_phone
+
+        phone = normalize_phone(request.GET.get("phone", ""))
+        if not phone:
+            return HttpResponseBadRequest("Invalid phone number")
+        limit = getattr(settings, "APPOINTMENTS_PHONE_LOOKUP_LIMIT", 20)
+
+        queryset = Appointment.objects.for_user(request.user).filter(phone_e164=phone)
+        rows = queryset.order_by("-datetime").values_list(
+            "pk", "name", "location", "datetime"
+        )[:limit]
+
+        return JsonResponse(
+            {
+                "phone": phone,
+                "results": [
+                    {
+                        "pk": pk,
+                        "name": name,
+                        "location": location,
+                        "datetime": dt.isoformat(),
+                        "url": reverse("appointments:detail", kwargs={"pk": pk}),
+                    }
+                    for pk, name, location, dt in rows
+                ],
+            }
+        )
+
+
+@ViewRegistry.register("appointments.AppointmentReport")
+class AppointmentReport(ReplicaReadMixin, LoginRequiredMixin, View):
+    """Room and staff utilization and conflict density per week, for admins.
+
+    ``start`` and ``end`` (``YYYY-MM-DD``) default to the current school
+    year. ``format=csv`` downloads the per-week rows as CSV. The report scans
+    a whole year and is never cached, so it reads from the replica.
+    """
+
+    http_method_names = ["get"]
+
+    def get(self, request, *args, **kwargs):
+        import csv
+        from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
+        from . import reports
+
+        if not is_admin(request.user):
+            raise PermissionDenied("You cannot perform this action")
+        if reports.np is None:
+            return HttpResponse("The utilization report requires NumPy", status=501)
+
+        start, end = reports.school_year()
+        try:
+            start = date.fromisoformat(request.GET.get("start") or start.isoformat())
+            end = date.fromisoformat(request.GET.get("end") or end.isoformat())
+        except ValueError:
+            return HttpResponseBadRequest("start and end must be YYYY-MM-DD dates")
+        if end <= start:
+            return HttpResponseBadRequest("end must be after start")
+
+        report = reports.build_report(
+            Appointment.objects.for_user(request.user), start, end
+        )
+        if request.GET.get("format") != "csv":
+            return JsonResponse(report)
+
+        response = HttpResponse(content_type="text/csv")
+        response["Content-Disposition"] = (
+            f'attachment; filename="appointment-utilization-{start}-{end}.csv"'
+        )
+        writer = csv.DictWriter(response, fieldnames=reports.CSV_COLUMNS)
+        writer.writeheader()
+        writer.writerows(report["rows"])
+        return response
 
 
 @ViewRegistry.register("appointments.AppointmentSelectionTable")
-class AppointmentSelectionTableView(SelectionTableViewMixin):
+class AppointmentSelectionTableView(QueryBudgetMixin, SelectionTableViewMixin):
     model = Appointment
     component = "appointments.AppointmentSelectionTable"
     key = "appointments"
+    query_budget = 4
     title = "Select Appointment"
 
+    def get_queryset(self):
+        return super().get_queryset().for_user(self.request.user)
+
+    def get(self, request, *args, **kwargs):
+        if "typeahead" in request.GET:
+            return self.get_typeahead_response(request)
+        return super().get(request, *args, **kwargs)
+
+    def get_typeahead_response(self, request):
+        """Return up to ``limit`` ``[pk, name, datetime]`` rows for a prefix.
+
+        The prefix match is served by the ``varchar_pattern_ops`` index on
+        ``name_normalized`` (a plain btree cannot serve ``LIKE`` under a
+        non-C collation); without a prefix the ``-datetime`` order walks the
+        datetime index. Results are cached per user for a few seconds to
+        absorb keystroke bursts.
+        """
+        import hashlib
+        from django.conf import settings
+        from django.core.cache import cache
+        from django.http import JsonResponse
+        from .models import normalize_text
+
+        prefix = normalize_text(request.GET.get("typeahead"))
+        max_limit = getattr(settings, "APPOINTMENTS_TYPEAHEAD_LIMIT", 10)
+        try:
+            limit = max(1, min(int(request.GET.get("limit", max_limit)), max_limit))
+        except ValueError:
+            limit = max_limit
+
+        cache_key = "appointments:typeahead:{}:{}:{}".format(
+            request.user.pk, limit, hashlib.sha1(prefix.encode()).hexdigest()
+        )
+        results = cache.get(cache_key)
+        if results is None:
+            queryset = self.get_queryset()
+            if prefix:
+                queryset = queryset.filter(
+                    name_normalized__startswith=prefix
+                ).order_by("name_normalized", "-datetime")
+            else:
+                queryset = queryset.order_by("-datetime")
+            results = [
+                [pk, name, dt.isoformat()]
+                for pk, name, dt in queryset.values_list("pk", "name", "datetime")[:limit]
+            ]
+            cache.set(
+                cache_key,
+                results,
+                getattr(settings, "APPOINTMENTS_TYPEAHEAD_CACHE_TIMEOUT", 30),
+            )
+
+        return JsonResponse({"results": results})
+
 
 @ViewRegistry.register("appointments.AppointmentCardTimeline")
-class AppointmentCardTimeline(ListViewMixin):
+class AppointmentCardTimeline(
+    QueryBudgetMixin,
+    ReplicaReadMixin,
+    CoalescedReadMixin,
+    OccurrenceWindowMixin,
+    ListViewMixin,
+):
     model = Appointment
     component = "appointments.AppointmentCardTimeline"
     key = "appointments"
+    query_budget = 3
     paginate_by = None  # No pagination for timeline
 
-    def prepare_data(self, request, **kwargs):
+    def get_query_budget(self):
+        return self.query_budget + self.get_window_allowance()
 
-        queryset = self.get_queryset()
+    def get_scope_queryset(self):
+        return self.get_queryset().for_user(self.request.user)
 
-        if not (
-            self.request.user.is_superuser
-            or self.request.user.role in ["totschool_admin"]
-        ):
-            queryset = queryset.filter(created_by=self.request.user)
+    def get_filtered_queryset(self, request):
+        """Return the day's scoped, ordered queryset and the date shown.
+
+        The queryset holds the day's concrete rows; recurring occurrences on
+        that day are added by ``with_occurrences``.
+        """
+        from .recurrence import day_window
 
+        queryset = self.get_scope_queryset()
         get_params = request.GET.dict()
 
         # Get date filter, default to today
@@ -159,72 +988,383 @@ class AppointmentCardTimeline(ListViewMixin):
         if not date_value:
             date_value = date.today().isoformat()
 
-        queryset = queryset.filter(datetime__date=date_value)
-
         # Order by start time
         queryset = queryset.order_by("datetime")
 
         queryset = apply_filters(queryset, get_params, self.model)
 
+        try:
+            queryset = self.window_queryset(queryset, *day_window(date_value))
+        except ValueError:
+            queryset = queryset.filter(datetime__date=date_value)
+
+        return queryset, date_value
+
+    def get_data_key_parts(self, request):
+        # The default date is resolved so the key rolls over at midnight.
+        # Entries are invalidated per scope and day, so a write only drops
+        # the days it touches and warmed days (see warming.py) stay valid.
+        day = request.GET.get("date") or date.today().isoformat()
+        return ("cards", day), {
+            "exclude": ("date",),
+            "generation": ("cards", self.get_cache_scope(), day),
+        }
+
+    def get_data_key(self, request):
+        args, kwargs = self.get_data_key_parts(request)
+        return self.get_coalesce_key(*args, **kwargs)
+
+    async def aget_data_key(self, request):
+        args, kwargs = self.get_data_key_parts(request)
+        return await self.aget_coalesce_key(*args, **kwargs)
+
+    def get_data_timeout(self):
+        from django.conf import settings
+
+        # Writes drop the entries they touch; the TTL only bounds how long a
+        # missed invalidation can show. Twelve hours keeps a nightly warm-up
+        # valid through the morning.
+        return getattr(settings, "APPOINTMENTS_CARDS_CACHE_TIMEOUT", 12 * 3600)
+
+    def get(self, request, *args, **kwargs):
+        # Pages subscribe to the day's live updates instead of reloading.
+        response = ensure_rendered(super().get(request, *args, **kwargs))
+        day = request.GET.get("date") or date.today().isoformat()
+        return live.append_stream_script(request, response, day)
+
+    def build_data(self, request):
+        queryset, date_value = self.get_filtered_queryset(request)
+
         return {
-            self.get_key(): list(queryset),
+            self.get_key(): self.with_occurrences(queryset),
             "date": date_value,
         }
 
+    async def abuild_data(self, request):
+        queryset, date_value = self.get_filtered_queryset(request)
+
+        return {
+            self.get_key(): await self.awith_occurrences(
+                [appt async for appt in queryset.aiterator()]
+            ),
+            "date": date_value,
+        }
+
+    def prepare_data(self, request, **kwargs):
+        # Entries live for hours, so they are filled from the primary.
+        return coalesced(
+            self.get_data_key(request),
+            on_primary(lambda: self.build_data(request)),
+            timeout=self.get_data_timeout(),
+        )
+
+    async def aprepare_data(self, request, **kwargs):
+        return await acoalesced(
+            await self.aget_data_key(request),
+            aon_primary(lambda: self.abuild_data(request)),
+            timeout=self.get_data_timeout(),
+        )
+
+
+@ViewRegistry.register("appointments.AppointmentCardStream")
+class AppointmentCardStream(View):
+    """Server-sent events with the card changes for one day and scope.
+
+    Streams subscribe to the broker channel for ``date`` (default today) and
+    the user's scope, and receive ``upsert``/``remove`` events as appointments
+    change, or ``resync`` when they should reload the day.
+
+    Routed when ``live.streams_enabled``: with the async views, or when
+    ``APPOINTMENTS_CARD_STREAMS`` turns it on for a sync deployment.
+    Each stream ends after ``APPOINTMENTS_CARD_STREAM_MAX_AGE`` seconds and
+    the browser reconnects, so no connection is held indefinitely.
+    """
+
+    http_method_names = ["get"]
+    keepalive = 15
+
+    async def get(self, request, *args, **kwargs):
+        from django.http import (
+            HttpResponseBadRequest,
+            HttpResponseForbidden,
+            StreamingHttpResponse,
+        )
+
+        user = await request.auser()
+        if not user.is_authenticated:
+            return HttpResponseForbidden()
+
+        date_value = request.GET.get("date") or date.today().isoformat()
+        try:
+            day = date.fromisoformat(date_value)
+        except ValueError:
+            return HttpResponseBadRequest("Invalid date")
+        scope = scope_for(user)
+
+        response = StreamingHttpResponse(
+            self.stream(live.channel_name(day.isoformat(), scope)),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, channel):
+        import asyncio
+        import json
+        from django.conf import settings
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + getattr(settings, "APPOINTMENTS_CARD_STREAM_MAX_AGE", 300)
+        broker = live.get_broker()
+        subscription = broker.subscribe(channel)
+        try:
+            yield "retry: 5000\n\n"
+            while loop.time() < deadline:
+                timeout = min(self.keepalive, max(deadline - loop.time(), 0))
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['op']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            broker.unsubscribe(channel, subscription)
+
+
+@ViewRegistry.register("appointments.AppointmentCalendar")
+class AppointmentCalendar(QueryBudgetMixin, ReplicaReadMixin, LoginRequiredMixin, View):
+    """Month or week grid of per-day appointment counts and conflict badges.
+
+    ``view`` is ``month`` (default) or ``week`` and ``date`` any day inside
+    the period. All counts come from one GROUP BY over the grid's range;
+    a day's appointments are only loaded when it is expanded, from the
+    ``url`` given for that day (the cards timeline).
+    """
+
+    http_method_names = ["get"]
+    query_budget = 4
+    # The exceptions of the series in the grid and around it.
+    series_allowance = 1
+
+    def get_query_budget(self):
+        return self.query_budget + self.series_allowance
+
+    def get_grid_range(self, view, anchor):
+        """``(first, last)`` days shown: whole Monday-Sunday weeks."""
+        from calendar import monthrange
+
+        if view == "week":
+            first = anchor - timedelta(days=anchor.weekday())
+            return first, first + timedelta(days=6)
+        start = anchor.replace(day=1)
+        end = anchor.replace(day=monthrange(anchor.year, anchor.month)[1])
+        return (
+            start - timedelta(days=start.weekday()),
+            end + timedelta(days=6 - end.weekday()),
+        )
+
+    def get_day_counts(self, queryset, first, last):
+        """``{day: [count, conflicts, room_conflicts]}`` for the grid.
+
+        Conflicts come from the same candidates and sweeps as the list's
+        ``overlapping`` and ``room_conflicts`` filters, occurrences included,
+        so a day's badge matches the rows those filters show for it.
+        """
+        from .models import shared_rooms
+        from .recurrence import (
+            conflict_candidates,
+            conflict_keys,
+            day_window,
+            expand_series,
+            load_exceptions,
+        )
+
+        start, end = day_window(first)[0], day_window(last)[1]
+        scoped = conflict_candidates(queryset, start, end)
+        # Rooms are shared by everyone, so every user's bookings count.
+        rooms = conflict_candidates(
+            Appointment.objects.exclude(room_key__in=shared_rooms()), start, end
+        )
+        load_exceptions(
+            scoped[1] + rooms[1], start - OVERLAP_WINDOW, end + OVERLAP_WINDOW
+        )
+        overlapping = conflict_keys(scoped, start, end)
+        room_taken = conflict_keys(rooms, start, end, group="room_key")
+
+        rows, masters = scoped
+        counts = {}
+        for appointment in rows + expand_series(masters, start, end):
+            if not start <= appointment.datetime < end:
+                continue  # A neighbour just outside the grid.
+            key = (appointment.pk, appointment.datetime)
+            day = counts.setdefault(live.local_day(appointment.datetime), [0, 0, 0])
+            day[0] += 1
+            day[1] += key in overlapping
+            day[2] += key in room_taken
+        return counts
+
+    def get(self, request, *args, **kwargs):
+        from datetime import datetime, time
+        from django.conf import settings
+        from django.core.cache import cache
+        from django.http import HttpResponseBadRequest, JsonResponse
+        from .caching import get_generation
+        from .tiles import tile_for
+
+        view = request.GET.get("view", "month")
+        if view not in ("month", "week"):
+            return HttpResponseBadRequest("view must be month or week")
+        try:
+            anchor = date.fromisoformat(request.GET.get("date") or date.today().isoformat())
+        except ValueError:
+            return HttpResponseBadRequest("Invalid date")
+        first, last = self.get_grid_range(view, anchor)
+
+        queryset = Appointment.objects.for_user(request.user)
+        scope = scope_for(request.user)
+        created_by = request.GET.get("created_by")
+        if scope == "all" and created_by and created_by.isdigit():
+            queryset = queryset.filter(created_by_id=created_by)
+            scope = f"user-{created_by}"
+
+        # Each week of the grid is an ISO-week tile, so the grid's cache
+        # entry goes stale exactly when one of its tiles does.
+        weeks = [first + timedelta(weeks=i) for i in range((last - first).days // 7 + 1)]
+        generations = ".".join(
+            str(get_generation("tile", tile_for(datetime.combine(week, time.min))))
+            for week in weeks
+        )
+        cache_key = "appointments:calendar:{}:{}:{}:{}.{}".format(
+            scope, first, last, generations, get_generation("series")
+        )
+        counts = cache.get(cache_key)
+        if counts is None:
+            # Kept for an hour under the tiles' generations, so read from the
+            # primary (see routers.on_primary).
+            counts = on_primary(self.get_day_counts)(queryset, first, last)
+            cache.set(
+                cache_key, counts, getattr(settings, "APPOINTMENTS_TILE_CACHE_TIMEOUT", 3600)
+            )
+
+        cards_url = reverse("appointments:cards")
+        days = []
+        day = first
+        while day <= last:
+            count, conflicts, room_conflicts = counts.get(day, (0, 0, 0))
+            days.append(
+                {
+                    "date": day.isoformat(),
+                    "in_period": view == "week" or day.month == anchor.month,
+                    "count": count,
+                    "conflicts": conflicts,
+                    "room_conflicts": room_conflicts,
+                    "url": f"{cards_url}?date={day.isoformat()}",
+                }
+            )
+            day += timedelta(days=1)
+
+        return JsonResponse(
+            {
+                "view": view,
+                "date": anchor.isoformat(),
+                "start": first.isoformat(),
+                "end": last.isoformat(),
+                "days": days,
+            }
+        )
+
+
+@ViewRegistry.register("appointments.AppointmentCalendarPage")
+class AppointmentCalendarPage(LoginRequiredMixin, View):
+    """Page that mounts calendar_grid.js over ``AppointmentCalendar``.
+
+    It runs no queries: the grid is fetched by the script, so ``view``,
+    ``date`` and ``created_by`` are only passed through as its defaults.
+    """
+
+    http_method_names = ["get"]
+
+    def get(self, request, *args, **kwargs):
+        from django.shortcuts import render
+
+        view = request.GET.get("view")
+        return render(
+            request,
+            "p_totschool_appointment_tracker/calendar.html",
+            {
+                "view": view if view in ("month", "week") else "month",
+                "date": request.GET.get("date", ""),
+                "created_by": request.GET.get("created_by", ""),
+            },
+        )
+
 
 @ViewRegistry.register("appointments.AppointmentTimeline")
-class AppointmentTimeline(ChartViewMixin):
+class AppointmentTimeline(
+    QueryBudgetMixin,
+    ReplicaReadMixin,
+    CoalescedReadMixin,
+    OccurrenceWindowMixin,
+    ChartViewMixin,
+):
     model = Appointment
     component = "appointments.AppointmentTimeline"
     key = "appointments"
+    query_budget = 3
 
-    def get_chart_data(self, request, **kwargs):
-        from datetime import datetime
+    def get_query_budget(self):
+        return self.query_budget + self.get_window_allowance()
 
-        queryset = self.get_queryset()
+    def get_scope_queryset(self):
+        return self.get_queryset().for_user(self.request.user)
+
+    def get_filtered_queryset(self, request, window=None):
+        """Return the ordered chart queryset, or None when no filters apply.
+
+        ``window`` is an optional ``(start, end)`` pair that replaces the
+        buffered ``range_min``/``range_max`` range, as used by tile requests.
+        When the shown range is bounded, recurring series are expanded inside
+        it by ``with_occurrences``.
+        """
+        from datetime import datetime, timedelta
+        from .recurrence import day_window
 
+        queryset = self.get_scope_queryset().select_related("created_by")
 
         # Apply filters just like ListViewMixin does
         get_params = request.GET.dict()
+        get_params.pop("tile", None)
+        get_params.pop("format", None)
 
         # Handle range-based filtering (from chart zoom/pan)
         range_min = get_params.pop("range_min", None)
         range_max = get_params.pop("range_max", None)
+        if window is not None:
+            range_min = range_max = None
 
         # Handle many-to-many created_by filter (multiple values)
         created_by_values = request.GET.getlist("appointment-filter-created-by_values")
 
         # Check if any filters are provided
-        has_filters = bool(range_min and range_max) or bool(created_by_values) or any(v for v in get_params.values())
+        has_filters = window is not None or bool(range_min and range_max) or bool(created_by_values) or any(v for v in get_params.values())
 
-        if not (
-            self.request.user.is_superuser
-            or self.request.user.role in ["totschool_admin"]
-        ):
-            queryset = queryset.filter(created_by=self.request.user)
+        if not is_admin(self.request.user):
             has_filters = True
 
         if not has_filters:
-            return {
-                "series": [{"name": "Appointments", "data": []}],
-                "noData": {"text": "Please apply filters to view appointments"}
-            }
+            return None
 
         if range_min and range_max:
             # Parse ISO format datetime strings (from chart zoom/pan)
             try:
-                from datetime import timedelta
-
                 min_dt = datetime.fromisoformat(range_min.replace("Z", "+00:00"))
                 max_dt = datetime.fromisoformat(range_max.replace("Z", "+00:00"))
 
                 # Add 25% buffer on each side so user can zoom out if no/little data visible
                 range_duration = max_dt - min_dt
                 buffer = range_duration * 0.25
-                min_dt = min_dt - buffer
-                max_dt = max_dt + buffer
-
-                queryset = queryset.filter(datetime__gte=min_dt, datetime__lte=max_dt)
+                window = (min_dt - buffer, max_dt + buffer + timedelta(microseconds=1))
             except ValueError:
                 pass
 
@@ -236,6 +1376,11 @@ class AppointmentTimeline(ChartViewMixin):
             queryset = queryset.filter(datetime__date__gte=start_date)
         if end_date:
             queryset = queryset.filter(datetime__date__lte=end_date)
+        if window is None and start_date and end_date:
+            try:
+                window = (day_window(start_date)[0], day_window(end_date)[1])
+            except ValueError:
+                pass
 
         # Handle many-to-many created_by filter (multiple values)
         if created_by_values:
@@ -244,41 +1389,54 @@ class AppointmentTimeline(ChartViewMixin):
             get_params.pop("appointment-filter-created-by_values", None)
 
         # Handle overlapping appointments filter
-        show_overlapping = get_params.pop("overlapping", None)
-        if show_overlapping in ("true", "True", "1", True):
+        show_overlapping = get_params.pop("overlapping", None) in ("true", "True", "1", True)
+        if show_overlapping and window is None:
             # Get IDs of appointments that have overlaps
             from django.db.models import Exists, OuterRef
-            from datetime import timedelta
             overlapping_subquery = Appointment.objects.filter(
                 created_by=OuterRef("created_by"),
-                datetime__gt=OuterRef("datetime") - timedelta(minutes=30),
-                datetime__lt=OuterRef("datetime") + timedelta(minutes=30),
+                datetime__gt=OuterRef("datetime") - OVERLAP_WINDOW,
+                datetime__lt=OuterRef("datetime") + OVERLAP_WINDOW,
             ).exclude(pk=OuterRef("pk"))
             queryset = queryset.annotate(
                 has_overlap=Exists(overlapping_subquery)
             ).filter(has_overlap=True)
 
         queryset = apply_filters(queryset, get_params, self.model)
-        
+
+        if window is not None:
+            queryset = self.window_queryset(
+                queryset, *window, overlapping=show_overlapping
+            )
+
         # Order by start time
         queryset = queryset.order_by("datetime")
 
-        # ApexCharts Timeline uses { x: "Name", y: [start_timestamp, end_timestamp] }
-        data = []
+        return queryset
+
+    def get_chart_point(self, appt):
         from datetime import timedelta
-        for appt in queryset:
-            data.append({
-                "x": str(appt.created_by) if appt.created_by else "Unknown",
-                "y": [
-                    int(appt.datetime.timestamp() * 1000), 
-                    int((appt.datetime + timedelta(minutes=30)).timestamp() * 1000)
-                ],
-                "url": reverse("appointments:detail", kwargs={"pk": appt.pk}),
-                "details": {
-                    "name": appt.name,
-                    "location": appt.location
-                }
-            })
+
+        # ApexCharts Timeline uses { x: "Name", y: [start_timestamp, end_timestamp] }
+        return {
+            "x": str(appt.created_by) if appt.created_by else "Unknown",
+            "y": [
+                int(appt.datetime.timestamp() * 1000),
+                int((appt.datetime + timedelta(minutes=30)).timestamp() * 1000)
+            ],
+            "url": reverse("appointments:detail", kwargs={"pk": appt.pk}),
+            "details": {
+                "name": appt.name,
+                "location": appt.location
+            }
+        }
+
+    def get_chart_series(self, data):
+        if data is None:
+            return {
+                "series": [{"name": "Appointments", "data": []}],
+                "noData": {"text": "Please apply filters to view appointments"}
+            }
 
         return {
             "series": [
@@ -288,3 +1446,178 @@ class AppointmentTimeline(ChartViewMixin):
                 }
             ]
         }
+
+    def build_chart_data(self, request):
+        queryset = self.get_filtered_queryset(request)
+        if queryset is None:
+            return self.get_chart_series(None)
+
+        return self.get_chart_series(
+            [self.get_chart_point(appt) for appt in self.with_occurrences(queryset)]
+        )
+
+    def get_chart_data(self, request, **kwargs):
+        return coalesced(
+            self.get_coalesce_key("chart"), lambda: self.build_chart_data(request)
+        )
+
+    def get_window_rows(self, queryset):
+        """The queryset, or a list with occurrences when a window is shown."""
+        if self.occurrence_window is None:
+            return queryset
+        return self.with_occurrences(queryset)
+
+    def get(self, request, *args, **kwargs):
+        if "tile" in request.GET:
+            return self.get_tile_response(request)
+        if request.GET.get("format") == "columnar":
+            return self.get_columnar_response(request)
+        response = ensure_rendered(super().get(request, *args, **kwargs))
+        return self.append_tile_script(request, response)
+
+    def append_tile_script(self, request, response):
+        """Load zoomed and scrolled ranges of an HTML chart page from tiles."""
+        from django.template.loader import render_to_string
+
+        if response.status_code != 200 or not response.get(
+            "Content-Type", ""
+        ).startswith("text/html"):
+            return response
+        response.content += render_to_string(
+            "p_totschool_appointment_tracker/timeline_tiles.html",
+            {
+                "chart_id": "appointment-timeline",
+                "url": reverse("appointments:timeline"),
+                "params": request.GET.urlencode(),
+            },
+        ).encode(response.charset)
+        if response.has_header("Content-Length"):
+            response["Content-Length"] = str(len(response.content))
+        return response
+
+    def get_columnar_response(self, request):
+        from .payloads import columnar_timeline, encode_payload
+
+        def build():
+            queryset = self.get_filtered_queryset(request)
+            if queryset is None:
+                return self.get_chart_series(None)
+            return columnar_timeline(self.get_window_rows(queryset))
+
+        return encode_payload(
+            request, coalesced(self.get_coalesce_key("columnar"), build)
+        )
+
+    def get_tile_response(self, request):
+        """Serve one ISO-week tile of chart points with cache validators.
+
+        Tiles are cached per scope, filter set and tile generation; the
+        generation is bumped whenever an appointment in that week changes.
+        """
+        from django.conf import settings
+        from django.http import HttpResponseBadRequest, HttpResponseNotModified
+        from django.utils import timezone
+        from django.utils.cache import patch_cache_control, patch_vary_headers
+        from .caching import get_generation, params_hash
+        from .payloads import columnar_timeline, encode_payload
+        from .tiles import parse_tile
+
+        tile = request.GET["tile"]
+        try:
+            start, end = parse_tile(tile)
+        except ValueError:
+            return HttpResponseBadRequest("Invalid tile")
+
+        scope = self.get_cache_scope()
+        filters = params_hash(request.GET, exclude=("tile", "range_min", "range_max"))
+        generation = "{}.{}".format(
+            get_generation("tile", tile), get_generation("series")
+        )
+        etag = f'"{tile}-{scope}-{filters}-{generation}"'
+
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        else:
+            cache_key = f"appointments:tile:{tile}:{scope}:{filters}:{generation}"
+
+            def build():
+                queryset = self.get_filtered_queryset(request, window=(start, end))
+                if request.GET.get("format") == "columnar":
+                    data = columnar_timeline(self.get_window_rows(queryset))
+                else:
+                    data = [
+                        self.get_chart_point(appt)
+                        for appt in self.with_occurrences(queryset)
+                    ]
+                return {
+                    "tile": tile,
+                    "start": int(start.timestamp() * 1000),
+                    "end": int(end.timestamp() * 1000),
+                    "data": data,
+                }
+
+            # Concurrent misses on the same tile share one computation, read
+            # from the primary since the tile is kept for an hour.
+            payload = coalesced(
+                cache_key,
+                on_primary(build),
+                timeout=getattr(settings, "APPOINTMENTS_TILE_CACHE_TIMEOUT", 3600),
+            )
+            response = encode_payload(request, payload)
+
+        response["ETag"] = etag
+        if end <= timezone.now():
+            # Closed weeks rarely change, so browsers may reuse them for a while.
+            max_age = getattr(settings, "APPOINTMENTS_TILE_MAX_AGE", 3600)
+            patch_cache_control(response, private=True, max_age=max_age)
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ["Cookie"])
+        return response
+
+    async def abuild_chart_data(self, request):
+        queryset = self.get_filtered_queryset(request)
+        if queryset is None:
+            return self.get_chart_series(None)
+
+        appointments = await self.awith_occurrences(
+            [appt async for appt in queryset.aiterator()]
+        )
+        return self.get_chart_series(
+            [self.get_chart_point(appt) for appt in appointments]
+        )
+
+    async def aget_chart_data(self, request, **kwargs):
+        return await acoalesced(
+            await self.aget_coalesce_key("chart"),
+            lambda: self.abuild_chart_data(request),
+        )
+
+
+# Async variants, served instead of the sync views when
+# APPOINTMENTS_ASYNC_VIEWS is enabled on an ASGI deployment.
+@ViewRegistry.register("appointments.AppointmentListAsync")
+class AppointmentListAsync(AsyncDataMixin, AppointmentList):
+    pass
+
+
+@ViewRegistry.register("appointments.AppointmentCardTimelineAsync")
+class AppointmentCardTimelineAsync(AsyncDataMixin, AppointmentCardTimeline):
+    pass
+
+
+@ViewRegistry.register("appointments.AppointmentTimelineAsync")
+class AppointmentTimelineAsync(AsyncDataMixin, AppointmentTimeline):
+    async_data_method = "aget_chart_data"
+
+    async def get(self, request, *args, **kwargs):
+        from asgiref.sync import sync_to_async
+
+        if "tile" in request.GET or request.GET.get("format") == "columnar":
+            # Tile and columnar responses bypass the component render and are
+            # served by the sync path, which handles both.
+            request.user = await request.auser()
+            return await sync_to_async(AppointmentTimeline.get)(
+                self, request, *args, **kwargs
+            )
+        return await super().get(request, *args, **kwargs)
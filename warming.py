@@ -0,0 +1,59 @@
+"""Pre-computes the card timeline data for the days people open first.
+
+The cards page defaults to today, so each user's first visit of the day
+used to pay for the cold queries. ``warm_cards`` fills the card data cache
+for every active user's scope, and for the admin scope, in the off-hours.
+It is run by the ``warm_card_cache`` command. Card entries are keyed per
+scope and day, so writes only drop the days they touch and the rest of the
+warmed entries stay valid until they expire.
+"""
+
+from datetime import date, timedelta
+
+from django.db.models import Q
+from django.test import RequestFactory
+
+
+def warm_days(days=2, today=None):
+    """``days`` consecutive ``YYYY-MM-DD`` days starting at ``today``.
+
+    Uses ``date.today()``, like the cards view's default date, so the warmed
+    entries are the ones a request without ``date`` looks up.
+    """
+    today = today or date.today()
+    return [(today + timedelta(days=i)).isoformat() for i in range(days)]
+
+
+def warm_cards(days, users=None):
+    """Cache the card data of ``days`` for each user scope and the admin scope.
+
+    ``users`` is a queryset, by default all active users. Returns the number
+    of ``(scope, day)`` entries warmed; entries already cached are kept.
+    """
+    from users.models import User
+    from .coalesce import scope_for
+    from .views import AppointmentCardTimeline
+
+    if users is None:
+        users = User.objects.filter(is_active=True).order_by("pk")
+    admins = Q(is_superuser=True) | Q(role__in=["totschool_admin"])
+
+    # Every admin shares the "all" scope, so one of them stands in for it.
+    scopes = {}
+    for user in users.exclude(admins).iterator():
+        scopes[scope_for(user)] = user
+    admin = users.filter(admins).first()
+    if admin is not None:
+        scopes[scope_for(admin)] = admin
+
+    factory = RequestFactory()
+    warmed = 0
+    for user in scopes.values():
+        for day in days:
+            request = factory.get("/", {"date": day})
+            request.user = user
+            view = AppointmentCardTimeline()
+            view.setup(request)
+            view.prepare_data(request)
+            warmed += 1
+    return warmed